@@ -0,0 +1,78 @@
+"""Headless auto-downloader: python -m app.backend [--once]
+
+Runs the automatic checks without the window, tray icon or notifications, so
+it can be started by systemd, cron or a login script on an always-on machine.
+Only backend modules are imported; Tk, PIL, pystray and plyer are never loaded.
+"""
+import argparse
+import logging
+import signal
+import sys
+from concurrent.futures import wait
+from datetime import datetime
+
+from app.backend.config import init_app_dirs, load_settings, load_channel_list
+from app.backend.logger import setup_logger
+from app.backend.auto_check import AutoCheckScheduler, check_interval, DEFAULT_AUTO_CHECK_SCHEDULE
+from app.backend.downloader import download_video, queue_resumable_downloads
+from app.backend.scheduler import get_scheduler
+
+
+def _log_notification(title, message, on_click=None):
+    logging.info(f"{title}: {message}")
+
+
+def _resume_download(item):
+    logging.info(f"Resuming interrupted download of {item['url']} into {item['folder']}")
+    return download_video(item["url"], item["folder"], item["quality"], protect=item.get("protect", False))
+
+
+def _resume_partial_downloads(settings):
+    """Queue interrupted downloads as background work; returns their futures."""
+    return queue_resumable_downloads(get_scheduler(), _resume_download, settings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.backend", description="YoutubeWeekly headless auto-downloader")
+    parser.add_argument("--once", action="store_true",
+                        help="run one automatic check, wait for its downloads and exit (for cron)")
+    parser.add_argument("--log-folder", help="folder for log files (default: log_folder from settings.json)")
+    args = parser.parse_args(argv)
+
+    init_app_dirs()
+    settings, warnings = load_settings()
+    setup_logger(args.log_folder or settings.get("log_folder", "data/logs"))
+    for warning in warnings:
+        logging.warning(warning)
+    if not settings.get("enable_auto_download", False):
+        logging.warning("enable_auto_download is off in settings.json; no videos will be downloaded.")
+
+    checks = AutoCheckScheduler(load_channel_list(), _log_notification)
+    resumed = _resume_partial_downloads(settings)
+
+    if args.once:
+        interval = check_interval(settings.get("auto_check_schedule") or DEFAULT_AUTO_CHECK_SCHEDULE, datetime.now())
+        results = checks.run_once(interval)
+        wait(resumed)
+        # A channel that could not be reached counts as failed, so cron and systemd see it
+        failed = [key for key, status in results.items() if status in ("error", "unreachable")]
+        for future in resumed:
+            if future.cancelled():
+                logging.info("A resumed download was cancelled before it finished.")
+            elif future.exception() is not None or future.result():
+                failed.append(future)
+        return 1 if failed else 0
+
+    # systemd stops services with SIGTERM; finish the current check and exit cleanly
+    signal.signal(signal.SIGTERM, lambda signum, frame: checks.stop())
+    logging.info("Headless auto-downloader started.")
+    try:
+        checks.run_forever()
+    except KeyboardInterrupt:
+        pass
+    logging.info("Headless auto-downloader stopped.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
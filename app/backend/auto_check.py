@@ -0,0 +1,111 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from app.backend.config import load_settings
+from app.backend.auto_downloader import run_automatic_checks, get_current_sabbath_date
+
+# How often to check, first matching rule wins. "end" (HH:MM) limits a rule to earlier in the day.
+DEFAULT_AUTO_CHECK_SCHEDULE = [
+    {"day": "saturday", "end": "12:00", "every_minutes": 10},
+    {"day": "friday", "every_minutes": 30},
+    {"day": "saturday", "every_minutes": 30},
+]
+
+# On days without a rule the thread still wakes up this often, so it notices the day change
+IDLE_WAKE_MINUTES = 60
+
+# Longest a channel whose video was not found is left alone between lookups
+MAX_BACKOFF_MINUTES = 240
+
+_WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+
+def check_interval(schedule, now):
+    """Return the minutes between checks at `now`, or None if no rule applies."""
+    day = _WEEKDAYS[now.weekday()]
+    for rule in schedule:
+        if str(rule.get("day", "")).lower() != day:
+            continue
+        try:
+            if "end" in rule and now.strftime("%H:%M") >= datetime.strptime(rule["end"], "%H:%M").strftime("%H:%M"):
+                continue
+            return max(1, int(rule["every_minutes"]))
+        except (KeyError, TypeError, ValueError):
+            logging.warning(f"Ignoring invalid auto_check_schedule entry: {rule}")
+    return None
+
+
+class AutoCheckScheduler:
+    """Re-runs run_automatic_checks on the auto_check_schedule for as long as the app runs.
+
+    Channels whose video was not found yet, or that could not be reached, are
+    looked up again with an exponential backoff (one interval, then two, four,
+    ...), capped at MAX_BACKOFF_MINUTES. Channels already marked "downloaded" are skipped by
+    run_automatic_checks from its log, without any network access.
+    """
+
+    def __init__(self, channels, send_notification_callback, progress_hook=None,
+                 show_window_callback=None, status_callback=None, clock=datetime.now):
+        self._channels = channels
+        self._send_notification = send_notification_callback
+        self._progress_hook = progress_hook
+        self._show_window = show_window_callback
+        self._status_callback = status_callback
+        self._clock = clock
+        self._stop = threading.Event()
+        self._thread = None
+        # channel_key -> (consecutive not-found runs, earliest next lookup)
+        self._backoff = {}
+        self._sabbath = None
+
+    def start(self):
+        """Run the checks in a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run_forever, name="auto-check", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def should_check(self, channel_key):
+        _, not_before = self._backoff.get(channel_key, (0, None))
+        return not_before is None or self._clock() >= not_before
+
+    def run_once(self, interval_minutes=None):
+        """Run one check now; returns run_automatic_checks' {channel_key: status}."""
+        sabbath = get_current_sabbath_date()
+        # A new week starts with a clean slate and announces itself again
+        announce = sabbath != self._sabbath
+        if announce:
+            self._sabbath = sabbath
+            self._backoff = {}
+
+        settings, _ = load_settings()
+        results = run_automatic_checks(
+            settings, self._channels, self._send_notification,
+            progress_hook=self._progress_hook, show_window_callback=self._show_window,
+            status_callback=self._status_callback, should_check=self.should_check, announce=announce
+        ) or {}
+
+        interval = interval_minutes or IDLE_WAKE_MINUTES
+        for channel_key, status in results.items():
+            if status in ("not_found", "unreachable"):
+                failures = self._backoff.get(channel_key, (0, None))[0] + 1
+                delay = min(interval * 2 ** (failures - 1), MAX_BACKOFF_MINUTES)
+                # Shave a little off so the lookup happens on the wake-up that reaches the delay
+                self._backoff[channel_key] = (failures, self._clock() + timedelta(minutes=delay) - timedelta(seconds=30))
+            else:
+                self._backoff.pop(channel_key, None)
+        return results
+
+    def run_forever(self):
+        """Run the checks on the calling thread until stop() is called."""
+        while not self._stop.is_set():
+            settings, _ = load_settings()
+            interval = check_interval(settings.get("auto_check_schedule") or DEFAULT_AUTO_CHECK_SCHEDULE, self._clock())
+            try:
+                self.run_once(interval)
+            except Exception as e:
+                logging.error(f"Automatic check failed: {e}")
+            self._stop.wait((interval or IDLE_WAKE_MINUTES) * 60)
@@ -1,11 +1,19 @@
 import json
 import os
+import threading
+from concurrent.futures import CancelledError, as_completed
 from datetime import datetime, timedelta
 
-from app.backend.config import load_settings, save_settings, load_channels, CONFIG_DIR
-from app.backend.downloader import find_video_url, download_video, get_next_saturday, format_romanian_date, delete_old_videos
+from app.backend.config import load_settings, update_settings, load_channels, CONFIG_DIR
+from app.backend.downloader import (
+    find_video_url, download_video, get_next_saturday, format_romanian_date, open_download_session
+)
+from app.backend.retention import apply_retention
+from app.backend.scheduler import get_scheduler, PRIORITY_BACKGROUND
+from app.backend.channel_cache import DEFAULT_CACHE_TTL_MINUTES
 
 AUTO_DOWNLOAD_LOG_FILE = os.path.join(CONFIG_DIR, "auto_download_log.json")
+DEFAULT_MAX_PARALLEL_CHANNELS = 2
 
 def load_auto_download_log():
     try:
@@ -18,6 +26,15 @@ def save_auto_download_log(log_data):
     with open(AUTO_DOWNLOAD_LOG_FILE, "w", encoding="utf-8") as f:
         json.dump(log_data, f, indent=2)
 
+def _channel_progress_hook(progress_hook, channel_key):
+    """Wrap progress_hook so every yt-dlp event is tagged with its channel."""
+    if progress_hook is None:
+        return None
+
+    def hook(d):
+        progress_hook(dict(d, channel=channel_key))
+    return hook
+
 def get_current_sabbath_date():
     today = datetime.now().date()
     # Calculate days until next Saturday (Saturday is weekday 5)
@@ -31,10 +48,19 @@ def get_current_sabbath_date():
 
 def run_automatic_checks(initial_settings, channels, send_notification_callback,
                          progress_hook=None, show_window_callback=None,
-                         status_callback=None, reset_progress_callback=None):
+                         status_callback=None, reset_progress_callback=None,
+                         should_check=None, announce=True):
+    """Download this Sabbath's video for every channel that does not have it yet.
+
+    Returns {channel_key: status} for the channels looked up in this run
+    ("downloaded", "not_found", "unreachable", "error" or "cancelled"). should_check(channel_key)
+    can hold a channel back until a later run. With announce=False (repeat runs of
+    the periodic check) the start notification is skipped and the summary is only
+    sent if something other than "not found" or "unreachable" happened.
+    """
     settings, _ = load_settings() # Reload settings to get the latest values
     if not settings.get("enable_auto_download", False):
-        return
+        return {}
 
     current_sabbath_date = get_current_sabbath_date()
     auto_download_log = load_auto_download_log()
@@ -77,61 +103,142 @@ def run_automatic_checks(initial_settings, channels, send_notification_callback,
 
     today = datetime.now().date()
     day_of_week = today.weekday() # Monday is 0, Sunday is 6
+    statuses = {}
 
     # Perform checks only on Friday (4) and Saturday (5)
     if day_of_week == 4 or day_of_week == 5:
+        scheduler = get_scheduler()
+        # Channels the user is already downloading from the window stay pending for the next check
         channels_to_process = [
             ch for ch in channels
             if ch.get("folder", ch["name"]) != "others" and
-               auto_download_log.get(current_sabbath_date, {}).get(ch.get("folder", ch["name"])) != "downloaded"
+               auto_download_log.get(current_sabbath_date, {}).get(ch.get("folder", ch["name"])) != "downloaded" and
+               not scheduler.is_active(ch.get("folder", ch["name"])) and
+               (should_check is None or should_check(ch.get("folder", ch["name"])))
         ]
 
         if not channels_to_process:
-            return
+            return {}
 
-        initial_message = "Starting automatic download for: " + ", ".join([ch["name"] for ch in channels_to_process])
-        send_notification_callback("Auto Download Started", initial_message)
+        if announce:
+            initial_message = "Starting automatic download for: " + ", ".join([ch["name"] for ch in channels_to_process])
+            send_notification_callback("Auto Download Started", initial_message)
 
         download_results = {}
+        log_lock = threading.Lock()
 
-        for channel_data in channels_to_process:
+        def channel_folder(channel_data):
             channel_key = channel_data.get("folder", channel_data["name"])
-            channel_name = channel_data.get("name", channel_key)
-            channel_url = channel_data["url"]
-            date_format = channel_data.get("date_format", "%d.%m.%Y")
-            folder = os.path.join(settings.get("video_folder", "data/videos"), channel_data.get("folder", channel_key))
+            return os.path.join(settings.get("video_folder", "data/videos"), channel_key)
+
+        def record_result(channel_data, status, result):
+            # Persist each channel's status as soon as it is known
+            channel_key = channel_data.get("folder", channel_data["name"])
+            with log_lock:
+                auto_download_log[current_sabbath_date][channel_key] = status
+                statuses[channel_key] = status
+                download_results[channel_data["name"]] = result
+                save_auto_download_log(auto_download_log)
 
+        def resolve_channel(channel_data):
+            """Look up the channel's video; returns (video_url, session, match_info)."""
+            date_format = channel_data.get("date_format", "%d.%m.%Y")
             expected_date_str = datetime.strptime(current_sabbath_date, "%Y-%m-%d").strftime(date_format)
-            video_url, match_info = find_video_url(channel_url, expected_date_str, date_format=date_format)
+            channel_key = channel_data.get("folder", channel_data["name"])
+            # One yt-dlp session per channel run, shared by the lookup and the download
+            session = open_download_session(
+                channel_folder(channel_data), settings.get("default_quality", "1080p"),
+                _channel_progress_hook(progress_hook, channel_key)
+            )
+            try:
+                video_url, match_info = find_video_url(channel_data["url"], expected_date_str, date_format=date_format,
+                                              cache_ttl_minutes=settings.get("channel_cache_ttl_minutes", DEFAULT_CACHE_TTL_MINUTES),
+                                              session=session)
+            except BaseException:
+                session.close()
+                raise
+            if not video_url:
+                session.close()
+            return video_url, session, match_info
 
+        def download_channel(channel_data, video_url, session):
+            channel_key = channel_data.get("folder", channel_data["name"])
+            channel_name = channel_data.get("name", channel_key)
+            folder = channel_folder(channel_data)
+            hook = _channel_progress_hook(progress_hook, channel_key)
+            error = None
+            try:
+                # Reset progress tracking and update status for this channel
+                if reset_progress_callback:
+                    reset_progress_callback()
+                if status_callback:
+                    status_callback(f"Auto downloading {channel_name}...")
+
+                os.makedirs(folder, exist_ok=True)
+                quality = settings.get("default_quality", "1080p")
+
+                # Each channel reports progress through its own tagged hook
+                error = download_video(video_url, folder, quality, protect=settings.get("keep_old_videos", False),
+                                       progress_hook=hook, session=session)
+
+                if error:
+                    record_result(channel_data, "error", f"Failed: {error}")
+                else:
+                    record_result(channel_data, "downloaded", "Success")
+                    apply_retention(folder, settings)
+
+            except Exception as e:
+                error = e
+                record_result(channel_data, "error", f"Failed: {e}")
+            finally:
+                session.close()
+                if error and hook:
+                    # Lets the GUI close this channel's progress row
+                    hook({"status": "error"})
+
+        # Lookups run concurrently; each download is queued as soon as its URL is
+        # known. Background work waits behind anything the user starts by hand,
+        # and all downloads share the scheduler's max_parallel_channels limit.
+        # Its keys are ("auto", folder), so cancelling a channel in the window
+        # does not cancel the automatic check's work for that channel.
+        scheduler.set_max_downloads(settings.get("max_parallel_channels", DEFAULT_MAX_PARALLEL_CHANNELS))
+
+        def submit(stage, fn, channel_data, *args):
+            return stage(fn, channel_data, *args, key=("auto", channel_data.get("folder", channel_data["name"])),
+                         label=channel_data["name"], priority=PRIORITY_BACKGROUND)
+
+        lookups = {submit(scheduler.resolve, resolve_channel, ch): ch for ch in channels_to_process}
+        downloads = {}
+        for future in as_completed(lookups):
+            channel_data = lookups[future]
+            try:
+                video_url, session, match_info = future.result()
+            except CancelledError:
+                record_result(channel_data, "cancelled", "Cancelled")
+                continue
+            except Exception as e:
+                # resolve_channel has already closed its session
+                record_result(channel_data, "error", f"Failed: {e}")
+                continue
             if video_url:
-                try:
-                    # Reset progress tracking and update status for this channel
-                    if reset_progress_callback:
-                        reset_progress_callback()
-                    if status_callback:
-                        status_callback(f"Auto downloading {channel_name}...")
-                    
-                    os.makedirs(folder, exist_ok=True)
-                    delete_old_videos(folder, settings.get("keep_old_videos", False))
-                    quality = settings.get("default_quality", "1080p")
-                    
-                    # Call download_video with progress_hook
-                    error = download_video(video_url, folder, quality, protect=settings.get("keep_old_videos", False), progress_hook=progress_hook)
-                    
-                    if error:
-                        auto_download_log[current_sabbath_date][channel_key] = "error"
-                        download_results[channel_name] = f"Failed: {error}"
-                    else:
-                        auto_download_log[current_sabbath_date][channel_key] = "downloaded"
-                        download_results[channel_name] = "Success"
-                        
-                except Exception as e:
-                    auto_download_log[current_sabbath_date][channel_key] = "error"
-                    download_results[channel_name] = f"Failed: {e}"
+                downloads[submit(scheduler.download, download_channel, channel_data, video_url, session)] = (channel_data, session)
+            elif match_info and match_info["type"] == "unreachable":
+                record_result(channel_data, "unreachable", f"Unreachable: {match_info['reason']}")
             else:
-                auto_download_log[current_sabbath_date][channel_key] = "not_found"
-                download_results[channel_name] = "Not Found"
+                record_result(channel_data, "not_found", "Not Found")
+        for future, (channel_data, session) in downloads.items():
+            try:
+                future.result()
+            except CancelledError:
+                # Dropped from the queue, so download_channel never closed the session
+                session.close()
+                record_result(channel_data, "cancelled", "Cancelled")
+            except Exception as e:
+                session.close()
+                record_result(channel_data, "error", f"Failed: {e}")
+
+        # Keep the summary in channel order regardless of completion order
+        download_results = {ch["name"]: download_results[ch["name"]] for ch in channels_to_process}
 
         # Update status after all downloads complete
         if status_callback:
@@ -157,9 +264,12 @@ def run_automatic_checks(initial_settings, channels, send_notification_callback,
             summary_title = "Auto Download Failed"
             summary_message = "\n".join(summary_items)
 
-        send_notification_callback(summary_title, summary_message, on_click=show_window_callback)
+        if announce or any(status not in ("not_found", "unreachable") for status in statuses.values()):
+            send_notification_callback(summary_title, summary_message, on_click=show_window_callback)
 
     # Save the updated log and settings
     save_auto_download_log(auto_download_log)
     settings["last_sabbath_checked"] = current_sabbath_date
-    save_settings(settings)
\ No newline at end of file
+    # Only this key: settings may have been edited in the window while the run was going
+    update_settings(last_sabbath_checked=current_sabbath_date)
+    return statuses
\ No newline at end of file
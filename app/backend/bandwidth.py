@@ -0,0 +1,140 @@
+import logging
+import threading
+import time
+from datetime import datetime
+
+from app.backend.config import load_settings
+
+
+class TokenBucket:
+    """Shared byte budget refilled at `rate` bytes per second.
+
+    consume() never refuses: it takes the bytes and, if that overdraws the
+    bucket, sleeps the calling thread until the debt is paid off. With several
+    threads drawing on one bucket their combined throughput stays at `rate`.
+    """
+
+    def __init__(self, rate):
+        self._lock = threading.Lock()
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+
+    def consume(self, nbytes):
+        with self._lock:
+            now = time.monotonic()
+            # Allow at most one second of burst after an idle period
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= nbytes
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+def _minutes(hhmm):
+    hours, minutes = hhmm.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def limit_for_time(settings, now=None):
+    """Return the background speed limit in bytes/second at `now`, or None for unlimited.
+
+    The first entry of "background_speed_windows" whose start/end ("HH:MM")
+    contains the time wins; a window may wrap past midnight. Outside every
+    window "background_speed_limit_kb_s" applies. Limits are in kilobytes per
+    second; 0 means unlimited.
+    """
+    now = now or datetime.now()
+    minute = now.hour * 60 + now.minute
+    limit_kb_s = settings.get("background_speed_limit_kb_s", 0)
+    for window in settings.get("background_speed_windows") or []:
+        try:
+            start, end = _minutes(window["start"]), _minutes(window["end"])
+        except (KeyError, ValueError, AttributeError):
+            logging.warning(f"Ignoring invalid background_speed_windows entry: {window}")
+            continue
+        inside = start <= minute < end if start <= end else (minute >= start or minute < end)
+        if inside:
+            limit_kb_s = window.get("limit_kb_s", 0)
+            break
+    try:
+        limit = float(limit_kb_s) * 1024
+    except (TypeError, ValueError):
+        return None
+    return limit if limit > 0 else None
+
+
+class BackgroundTransfer:
+    """Progress hook that charges one download's bytes to the shared budget.
+
+    yt-dlp calls progress hooks from the thread that reads the stream, so the
+    bucket's sleep holds back the transfer itself.
+    """
+
+    def __init__(self, manager):
+        self._manager = manager
+        self._seen = {}
+
+    def __call__(self, d):
+        if d.get("status") != "downloading" or d.get("downloaded_bytes") is None:
+            return
+        # Streams of a merged format report separately; track each one's byte count
+        key = (d.get("info_dict") or {}).get("format_id") or d.get("filename")
+        delta = d["downloaded_bytes"] - self._seen.get(key, 0)
+        self._seen[key] = d["downloaded_bytes"]
+        if delta > 0:
+            self._manager.consume(delta)
+
+
+class BandwidthManager:
+    """Caps the combined speed of all background downloads.
+
+    Background downloads (automatic checks, resumed downloads) draw from one
+    token bucket whose rate follows limit_for_time(), so the cap holds however
+    many run at once and whatever is not used by one is left to the others;
+    there is no fixed per-download share. Downloads started by hand never
+    enter it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bucket = None
+        self._settings = {}
+        self._settings_checked = 0
+
+    def _limit(self):
+        # Settings and the time window are re-read at most once a minute
+        now = time.monotonic()
+        if now - self._settings_checked > 60:
+            self._settings, _ = load_settings()
+            self._settings_checked = now
+        return limit_for_time(self._settings)
+
+    def transfer(self):
+        """Return the BackgroundTransfer hook for one background download."""
+        return BackgroundTransfer(self)
+
+    def consume(self, nbytes):
+        with self._lock:
+            limit = self._limit()
+            if not limit:
+                return
+            if self._bucket is None:
+                self._bucket = TokenBucket(limit)
+            self._bucket.rate = limit
+            bucket = self._bucket
+        bucket.consume(nbytes)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_bandwidth_manager():
+    """Return the process-wide BandwidthManager, creating it on first use."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = BandwidthManager()
+        return _manager
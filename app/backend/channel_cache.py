@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from app.backend.config import CONFIG_DIR
+
+CHANNEL_CACHE_DIR = os.path.join(CONFIG_DIR, "channel_cache")
+DEFAULT_CACHE_TTL_MINUTES = 30
+
+# Days after which a listing is read again from scratch instead of merged with
+# newer uploads, so videos deleted or made private since then drop out of it
+FULL_REFRESH_DAYS = 7
+
+_cache_lock = threading.Lock()
+
+
+def _cache_path(channel_url):
+    digest = hashlib.sha1(channel_url.encode("utf-8")).hexdigest()
+    return os.path.join(CHANNEL_CACHE_DIR, f"{digest}.json")
+
+
+def slim_entry(entry):
+    """Keep only the fields needed for date matching from a flat playlist entry."""
+    return {
+        "id": entry.get("id"),
+        "title": entry.get("title", ""),
+        "upload_date": entry.get("upload_date"),
+    }
+
+
+def load_channel_cache(channel_url):
+    """Return the cached listing for channel_url, or None if there is none.
+
+    The cache is a dict: {"url": ..., "fetched_at": <epoch seconds>, "refreshed_at":
+    <epoch seconds>, "complete": bool, "entries": [...]} with entries ordered newest
+    first, as on the channel's /videos tab. "complete" is True when the listing
+    covers the whole channel; "refreshed_at" is when it was last read from scratch.
+    """
+    with _cache_lock:
+        try:
+            with open(_cache_path(channel_url), "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+    if cache.get("url") != channel_url or not isinstance(cache.get("entries"), list):
+        return None
+    return cache
+
+
+def _write(path, cache):
+    # Callers must hold _cache_lock
+    os.makedirs(CHANNEL_CACHE_DIR, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(temp_path, path)
+
+
+def save_channel_cache(channel_url, entries, complete=False, refreshed_at=None):
+    """Store a listing; refreshed_at is kept from the listing it was merged into (now if read from scratch)."""
+    now = time.time()
+    cache = {"url": channel_url, "fetched_at": now, "refreshed_at": refreshed_at or now,
+             "complete": complete, "entries": entries}
+    with _cache_lock:
+        _write(_cache_path(channel_url), cache)
+    return cache
+
+
+def evict_video(video_id):
+    """Drop video_id from every cached listing, e.g. after YouTube reported it unavailable."""
+    with _cache_lock:
+        try:
+            names = [n for n in os.listdir(CHANNEL_CACHE_DIR) if n.endswith(".json")]
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(CHANNEL_CACHE_DIR, name)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    cache = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            entries = cache.get("entries")
+            if not isinstance(entries, list) or not any(e.get("id") == video_id for e in entries):
+                continue
+            cache["entries"] = [e for e in entries if e.get("id") != video_id]
+            try:
+                _write(path, cache)
+            except OSError:
+                continue
+
+
+def is_fresh(cache, ttl_minutes=DEFAULT_CACHE_TTL_MINUTES):
+    return cache is not None and time.time() - cache.get("fetched_at", 0) < ttl_minutes * 60
+
+
+def needs_full_refresh(cache, days=FULL_REFRESH_DAYS):
+    """True if the listing is old enough to be read again from scratch rather than merged."""
+    return cache is not None and time.time() - cache.get("refreshed_at", 0) >= days * 24 * 3600
@@ -1,12 +1,18 @@
+import atexit
+import copy
 import json
+import logging
 import os
 import platform
 import sys
 import shutil
 import threading
 
-# Lock for thread-safe access to SETTINGS_FILE
-settings_lock = threading.Lock()
+# Lock for thread-safe access to SETTINGS_FILE; reentrant because update_settings() holds it around a store read and save
+settings_lock = threading.RLock()
+
+# Seconds a deferred save waits for further changes before writing settings.json
+SETTINGS_WRITE_DELAY = 1.0
 
 __version__ = "1.0.4"
 
@@ -22,31 +28,51 @@ APP_DATA_DIR = get_app_data_dir()
 CONFIG_DIR = os.path.join(APP_DATA_DIR, 'config')
 UPDATE_DIR = os.path.join(APP_DATA_DIR, 'updates')
 
-if not os.path.exists(CONFIG_DIR):
-    os.makedirs(CONFIG_DIR)
+SETTINGS_FILE = os.path.join(CONFIG_DIR, 'settings.json')
+CHANNELS_FILE = os.path.join(CONFIG_DIR, 'channels.json')
+AUTO_DOWNLOAD_LOG_FILE = os.path.join(CONFIG_DIR, "auto_download_log.json")
 
-if getattr(sys, 'frozen', False):
-    # Running in a PyInstaller bundle
-    default_config_src = os.path.join(sys._MEIPASS, 'config')
-else:
+_app_dirs_lock = threading.Lock()
+_app_dirs_ready = False
+
+def get_default_config_dir():
+    """Folder holding the config files shipped with the app."""
+    if getattr(sys, 'frozen', False):
+        # Running in a PyInstaller bundle
+        return os.path.join(sys._MEIPASS, 'config')
     # Running in a normal Python environment
-    default_config_src = os.path.join(os.path.dirname(__file__), '../../config')
+    return os.path.join(os.path.dirname(__file__), '../../config')
 
-# Ensure all default config files exist in the app data directory
-for item in os.listdir(default_config_src):
-    s = os.path.join(default_config_src, item)
-    d = os.path.join(CONFIG_DIR, item)
-    if os.path.isfile(s) and not os.path.exists(d):
-        shutil.copy2(s, d)
+def init_app_dirs():
+    """Create CONFIG_DIR and fill in any missing default config files.
 
-SETTINGS_FILE = os.path.join(CONFIG_DIR, 'settings.json')
-CHANNELS_FILE = os.path.join(CONFIG_DIR, 'channels.json')
-AUTO_DOWNLOAD_LOG_FILE = os.path.join(CONFIG_DIR, "auto_download_log.json")
+    Importing this module touches no files; this runs on the first call to
+    load_settings(), save_settings() or load_channels() (or earlier, from the
+    entry points). Later calls return at once. Returns CONFIG_DIR.
+    """
+    global _app_dirs_ready
+    if _app_dirs_ready:
+        return CONFIG_DIR
+    with _app_dirs_lock:
+        if _app_dirs_ready:
+            return CONFIG_DIR
+        os.makedirs(CONFIG_DIR, exist_ok=True)
+
+        # Ensure all default config files exist in the app data directory
+        default_config_src = get_default_config_dir()
+        for item in os.listdir(default_config_src):
+            s = os.path.join(default_config_src, item)
+            d = os.path.join(CONFIG_DIR, item)
+            if os.path.isfile(s) and not os.path.exists(d):
+                shutil.copy2(s, d)
 
-# Create an empty auto_download_log.json if it doesn't exist
-if not os.path.exists(AUTO_DOWNLOAD_LOG_FILE):
-    with open(AUTO_DOWNLOAD_LOG_FILE, 'w', encoding='utf-8') as f:
-        json.dump({}, f)
+        # Create an empty auto_download_log.json if it doesn't exist
+        if not os.path.exists(AUTO_DOWNLOAD_LOG_FILE):
+            with open(AUTO_DOWNLOAD_LOG_FILE, 'w', encoding='utf-8') as f:
+                json.dump({}, f)
+
+        _app_dirs_ready = True
+    return CONFIG_DIR
 
 def get_base_path():
     """ Get absolute path to base directory, works for dev and for PyInstaller """
@@ -56,16 +82,16 @@ def get_base_path():
     else:
         return os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-def get_default_executable_paths():
+def get_bundled_executable_paths():
+    """Where the executables shipped with the app live on this platform (not checked for existence)."""
     if getattr(sys, 'frozen', False):
         # Running in a PyInstaller bundle
         base_path = os.path.join(sys._MEIPASS, 'app')
     else:
         # Running in a normal Python environment
         base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..')) # This should be YoutubeWeekly/app
-    mpv_path = ""
-    ffmpeg_path = ""
-    warnings = []
+    mpv_candidate = ""
+    ffmpeg_candidate = ""
 
     system = platform.system()
     if system == "Windows":
@@ -82,32 +108,169 @@ def get_default_executable_paths():
         # Assuming a 64-bit Linux for now, adjust if 32-bit is needed
         mpv_candidate = "/usr/bin/mpv" # Placeholder, as you didn't provide a bundled Linux mpv
         ffmpeg_candidate = os.path.join(base_path, "tools", "ffmpeg_linux", "ffmpeg-7.0.2-amd64-static", "ffmpeg")
-    
-    # Validate mpv path
-    if os.path.exists(mpv_candidate) and os.access(mpv_candidate, os.X_OK):
-        mpv_path = mpv_candidate
-    else:
-        warnings.append(f"Warning: Default MPV executable not found or not executable at '{mpv_candidate}'. Please configure MPV path in settings.")
 
-    # Validate ffmpeg path
-    if os.path.exists(ffmpeg_candidate) and os.access(ffmpeg_candidate, os.X_OK):
-        ffmpeg_path = ffmpeg_candidate
-    else:
-        warnings.append(f"Warning: Default FFmpeg executable not found or not executable at '{ffmpeg_candidate}'. Please configure FFmpeg path in settings.")
+    return {"mpv": mpv_candidate, "ffmpeg": ffmpeg_candidate}
+
+def get_default_executable_paths(settings=None):
+    """Resolve mpv and ffmpeg: the paths set in `settings` first, then the bundled copies, then PATH.
+
+    Lookups are cached by app.backend.executables, so this is cheap to call on every load_settings().
+    """
+    from app.backend.executables import resolve_executable
+
+    settings = settings or {}
+    bundled = get_bundled_executable_paths()
+    mpv_path, _ = resolve_executable("mpv", settings.get("mpv_path"))
+    ffmpeg_path, _ = resolve_executable("ffmpeg", settings.get("ffmpeg_path"))
+    warnings = []
+
+    if not mpv_path:
+        warnings.append(f"Warning: MPV executable not found in settings, at '{bundled['mpv']}' or on PATH. Please configure MPV path in settings.")
+    if not ffmpeg_path:
+        warnings.append(f"Warning: FFmpeg executable not found in settings, at '{bundled['ffmpeg']}' or on PATH. Please configure FFmpeg path in settings.")
 
     return {"mpv_path": mpv_path, "ffmpeg_path": ffmpeg_path}, warnings
 
-def load_settings():
-    with settings_lock:
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class SettingsStore:
+    """Process-wide in-memory copy of settings.json.
+
+    Reads are served from memory; the file is parsed again only when its
+    modification time or size changes (edited by hand or by another process).
+    save() updates memory and notifies subscribers at once, then writes the
+    file atomically (temp file + rename). With defer=True the write waits
+    SETTINGS_WRITE_DELAY seconds for further saves, so a burst of window
+    geometry saves becomes one write. flush() writes anything pending; it runs
+    at exit and when the app quits.
+
+    Subscribers are called as callback(settings) on the thread that made the
+    change and must not modify the dict they are given.
+    """
+
+    def __init__(self, write_delay=SETTINGS_WRITE_DELAY):
+        self._write_delay = write_delay
+        self._data = None
+        self._path = None
+        self._stamp = None
+        self._dirty = False
+        self._timer = None
+        self._subscribers = []
+
+    def get(self):
+        """Return a copy of the settings as stored in settings.json."""
+        changed = False
+        with settings_lock:
+            path = SETTINGS_FILE
+            if path != self._path:
+                # SETTINGS_FILE was pointed elsewhere (tests, dry runs); write out the old file first
+                self._write_pending()
+                self._data = None
+            stamp = _file_stamp(path)
+            if self._data is None or (stamp != self._stamp and not self._dirty):
+                changed = self._data is not None
+                self._data = self._read(path)
+                self._path, self._stamp = path, stamp
+            settings = copy.deepcopy(self._data)
+        if changed:
+            self._notify(settings)
+        return settings
+
+    def save(self, settings, defer=False):
+        with settings_lock:
+            if SETTINGS_FILE != self._path:
+                self._write_pending()
+                self._path = SETTINGS_FILE
+            self._data = copy.deepcopy(settings)
+            self._dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if defer:
+                self._timer = threading.Timer(self._write_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+            else:
+                self._write_pending()
+        self._notify(copy.deepcopy(settings))
+
+    def flush(self):
+        """Write a deferred save now, if there is one."""
+        with settings_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._write_pending()
+
+    def subscribe(self, callback):
+        with settings_lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with settings_lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    @staticmethod
+    def _read(path):
         try:
-            with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
-                settings = json.load(f)
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
-            settings = {}
+            return {}
+
+    def _write_pending(self):
+        # Callers must hold settings_lock
+        if not self._dirty:
+            return
+        init_app_dirs()
+        tmp_path = f"{self._path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, indent=2)
+            os.replace(tmp_path, self._path)
+        except OSError as e:
+            logging.error(f"Could not save settings to {self._path}: {e}")
+            return
+        self._stamp = _file_stamp(self._path)
+        self._dirty = False
+
+    def _notify(self, settings):
+        with settings_lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(settings)
+            except Exception as e:
+                logging.error(f"Settings subscriber {callback!r} failed: {e}")
+
+
+_settings_store = None
+
 
-    default_paths, warnings = get_default_executable_paths()
+def get_settings_store():
+    """Return the process-wide SettingsStore, creating it on first use."""
+    global _settings_store
+    with settings_lock:
+        if _settings_store is None:
+            _settings_store = SettingsStore()
+            atexit.register(_settings_store.flush)
+        return _settings_store
+
+
+def load_settings():
+    init_app_dirs()
+    settings = get_settings_store().get()
 
-    # Always use the bundled executables
+    default_paths, warnings = get_default_executable_paths(settings)
+
+    # A path set in the Settings window wins, as long as it still points at an executable
     settings["mpv_path"] = default_paths["mpv_path"]
     settings["ffmpeg_path"] = default_paths["ffmpeg_path"]
 
@@ -125,22 +288,44 @@ def load_settings():
 
 
 def load_channels():
+    init_app_dirs()
     with open(CHANNELS_FILE, 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def save_settings(settings):
+def load_channel_list():
+    """Return channels.json as a list of {"name", "url", "date_format", "folder"} dicts."""
+    return [
+        {
+            "name": ch_data.get("name", key),
+            "url": ch_data["url"],
+            "date_format": ch_data.get("date_format", "%d.%m.%Y"),
+            "folder": ch_data.get("folder", key)
+        }
+        for key, ch_data in load_channels().items()
+    ]
+
+def save_settings(settings, defer=False):
+    """Save settings; with defer=True the file write is batched with later saves (see SettingsStore)."""
+    get_settings_store().save(settings, defer=defer)
+
+def update_settings(**changes):
+    """Set `changes` on the settings as currently stored and save them; returns False if nothing changed.
+
+    The read and the save happen under settings_lock, so edits saved by
+    another thread (e.g. the Settings window) in the meantime are kept.
+    """
+    store = get_settings_store()
     with settings_lock:
-        with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(settings, f, indent=2)
+        settings = store.get()
+        if all(settings.get(key) == value for key, value in changes.items()):
+            return False
+        settings.update(changes)
+        store.save(settings)
+    return True
 
 def load_default_settings():
-    if getattr(sys, 'frozen', False):
-        # Running in a PyInstaller bundle
-        default_settings_path = os.path.join(sys._MEIPASS, 'config', 'settings.json')
-    else:
-        # Running in a normal Python environment
-        default_settings_path = os.path.join(os.path.dirname(__file__), '../../config', 'settings.json')
-    
+    default_settings_path = os.path.join(get_default_config_dir(), 'settings.json')
+
     try:
         with open(default_settings_path, 'r', encoding='utf-8') as f:
             return json.load(f)
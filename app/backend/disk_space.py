@@ -0,0 +1,143 @@
+import logging
+import shutil
+
+from app.backend.retention import apply_retention
+
+# Space left free on the drive after a download, in MB
+DEFAULT_MIN_FREE_SPACE_MB = 500
+
+# Qualities tried, in order, when the chosen one does not fit on the drive
+DEFAULT_QUALITY_FALLBACK = ["max", "4k", "2k", "1080p", "720p", "480p"]
+
+# A merge keeps the separate video and audio files on disk until the merged file is written
+MERGE_SPACE_FACTOR = 2.0
+
+
+def estimate_size(info):
+    """Return the expected download size in bytes of a format-selected info dict, or None if unknown.
+
+    Uses "filesize", or "filesize_approx" when YouTube only gives an estimate,
+    of each stream in "requested_formats" (or of the single format).
+    """
+    streams = info.get("requested_formats") or [info]
+    sizes = [stream.get("filesize") or stream.get("filesize_approx") for stream in streams]
+    if not any(sizes):
+        return None
+    return sum(size for size in sizes if size)
+
+
+def required_space(info, min_free_mb=DEFAULT_MIN_FREE_SPACE_MB):
+    """Return the free bytes a download needs, including the reserve, or None if its size is unknown."""
+    size = estimate_size(info)
+    if size is None:
+        return None
+    if len(info.get("requested_formats") or []) > 1:
+        size *= MERGE_SPACE_FACTOR
+    return int(size + min_free_mb * 1024 * 1024)
+
+
+def free_space(video_folder):
+    return shutil.disk_usage(video_folder).free
+
+
+def select_formats(selector, formats):
+    """Run a selector from YoutubeDL.build_format_selector() over formats; returns the picked format dicts.
+
+    Builds the same context YoutubeDL.process_video_result() passes to it.
+    """
+    return list(selector({
+        "formats": formats,
+        "has_merged_format": any("none" not in (f.get("acodec"), f.get("vcodec")) for f in formats),
+        "incomplete_formats": (all(f.get("vcodec") == "none" for f in formats)
+                               or all(f.get("acodec") == "none" for f in formats)),
+    }))
+
+
+def _mb(nbytes):
+    return f"{nbytes / 1024 ** 2:.0f} MB"
+
+
+class DiskSpaceGuard:
+    """Admission check between yt-dlp's format selection and the transfer.
+
+    While active, YoutubeDL.process_info() first compares the selected
+    formats' size with the free space in video_folder. If it does not fit,
+    the folder's retention policy is applied, then each lower quality of the
+    fallback ladder is tried. If nothing fits, a DownloadError is raised
+    before any byte is fetched, so no .part files are left behind.
+    Downloads whose size YouTube does not report are let through.
+    """
+
+    def __init__(self, ydl, video_folder, quality_pref, settings, quality_formats):
+        self._ydl = ydl
+        self._video_folder = video_folder
+        self._quality_pref = quality_pref
+        self._settings = settings
+        self._quality_formats = quality_formats
+        self._min_free_mb = float(settings.get("min_free_space_mb", DEFAULT_MIN_FREE_SPACE_MB))
+        self.quality = quality_pref
+
+    def __enter__(self):
+        ydl = self._ydl
+        self._saved = vars(ydl).get("process_info")
+        self._process_info = ydl.process_info
+        ydl.process_info = self._admit_then_process
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._saved is not None:
+            self._ydl.process_info = self._saved
+        else:
+            vars(self._ydl).pop("process_info", None)
+
+    def _admit_then_process(self, info_dict, *args, **kwargs):
+        return self._process_info(self.admit(info_dict), *args, **kwargs)
+
+    def _fallbacks(self):
+        ladder = self._settings.get("quality_fallback_ladder") or DEFAULT_QUALITY_FALLBACK
+        if self._quality_pref not in ladder:
+            return []
+        return [quality for quality in ladder[ladder.index(self._quality_pref) + 1:] if quality in self._quality_formats]
+
+    def _select(self, info_dict, quality):
+        """Return the format `quality` would pick from info_dict (merged formats included), or None."""
+        try:
+            selector = self._ydl.build_format_selector(self._quality_formats[quality])
+            selected = select_formats(selector, info_dict.get("formats") or [])
+        except Exception as e:
+            logging.warning(f"Could not evaluate {quality} formats: {e}")
+            return None
+        return selected[0] if selected else None
+
+    def admit(self, info_dict):
+        """Return info_dict, switched in place to a lower quality if needed; raises if nothing fits."""
+        needed = required_space(info_dict, self._min_free_mb)
+        if needed is None:
+            logging.info("Download size unknown; skipping the disk space check.")
+            return info_dict
+        free = free_space(self._video_folder)
+        if free >= needed:
+            return info_dict
+
+        logging.warning(f"Not enough disk space for {info_dict.get('title')}: about {_mb(needed)} needed, {_mb(free)} free.")
+        report = apply_retention(self._video_folder, self._settings)
+        if report["freed_bytes"]:
+            free = free_space(self._video_folder)
+            if free >= needed:
+                return info_dict
+
+        for quality in self._fallbacks():
+            selected = self._select(info_dict, quality)
+            candidate_needed = required_space(selected, self._min_free_mb) if selected else None
+            if candidate_needed is not None and free >= candidate_needed:
+                logging.warning(f"Downloading {quality} instead of {self._quality_pref} to fit in {_mb(free)}.")
+                self.quality = quality
+                # In place: yt-dlp keeps this dict in requested_downloads, where the final filepath is read
+                info_dict.pop("requested_formats", None)
+                info_dict.update(selected)
+                return info_dict
+
+        import yt_dlp
+        raise yt_dlp.utils.DownloadError(
+            f"Not enough disk space in {self._video_folder}: about {_mb(needed)} needed, {_mb(free)} free"
+        )
@@ -0,0 +1,236 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from urllib.parse import urlparse, parse_qs
+
+from app.backend.config import CONFIG_DIR
+
+DOWNLOAD_ARCHIVE_DIR = os.path.join(CONFIG_DIR, "download_archive")
+
+_archive_lock = threading.Lock()
+# archive path -> (archive file mtime, archive dict); avoids re-reading the JSON per lookup
+_loaded = {}
+
+_VIDEO_PATH_RE = re.compile(r"/(?:shorts|live|embed|v)/([\w-]+)")
+
+
+def video_id_from_url(video_url):
+    """Return the YouTube video ID in video_url, or None if it has none."""
+    parsed = urlparse(video_url)
+    if parsed.hostname and parsed.hostname.endswith("youtu.be"):
+        return parsed.path.strip("/").split("/")[0] or None
+    ids = parse_qs(parsed.query).get("v")
+    if ids:
+        return ids[0]
+    match = _VIDEO_PATH_RE.search(parsed.path)
+    return match.group(1) if match else None
+
+
+def _folder_key(video_folder):
+    return os.path.normcase(os.path.abspath(video_folder))
+
+
+def _archive_path(video_folder):
+    digest = hashlib.sha1(_folder_key(video_folder).encode("utf-8")).hexdigest()
+    return os.path.join(DOWNLOAD_ARCHIVE_DIR, f"{digest}.json")
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _load(video_folder):
+    """Return the folder's archive dict. Callers must hold _archive_lock.
+
+    The archive is {"folder": ..., "videos": {video_id: {"filename": ...,
+    "size": ..., "downloaded_at": ...}}, "pending": {video_id: {"url": ...,
+    "quality": ..., "protect": ..., "attempts": ..., "stem": ...}}}.
+    """
+    path = _archive_path(video_folder)
+    mtime = _mtime(path)
+    cached = _loaded.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    archive = None
+    if mtime is not None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                archive = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            archive = None
+    if not isinstance(archive, dict) or not isinstance(archive.get("videos"), dict):
+        archive = {"folder": _folder_key(video_folder), "videos": {}}
+    archive.setdefault("pending", {})
+    _loaded[path] = (mtime, archive)
+    return archive
+
+
+def _save(video_folder, archive):
+    """Write the archive atomically. Callers must hold _archive_lock."""
+    path = _archive_path(video_folder)
+    try:
+        os.makedirs(DOWNLOAD_ARCHIVE_DIR, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(archive, f, indent=2)
+        os.replace(temp_path, path)
+    except OSError as e:
+        logging.warning(f"Could not save download archive for {video_folder}: {e}")
+    _loaded[path] = (_mtime(path), archive)
+
+
+def _find_renamed(video_folder, size):
+    """Return the name of a file in video_folder with exactly `size` bytes, if any."""
+    try:
+        with os.scandir(video_folder) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.stat().st_size == size:
+                    return entry.name
+    except OSError:
+        pass
+    return None
+
+
+def find_archived(video_folder, video_id):
+    """Return the file name recorded for video_id in video_folder, or None.
+
+    The common case is one dict lookup plus one stat of the recorded file. If
+    the file was renamed it is found again by its size and the entry updated;
+    if it was deleted the entry is dropped so the video can be downloaded again.
+    """
+    with _archive_lock:
+        archive = _load(video_folder)
+        entry = archive["videos"].get(video_id)
+        if not entry:
+            return None
+        if os.path.isfile(os.path.join(video_folder, entry["filename"])):
+            return entry["filename"]
+
+        renamed = _find_renamed(video_folder, entry["size"]) if entry.get("size") else None
+        if renamed:
+            entry["filename"] = renamed
+        else:
+            del archive["videos"][video_id]
+        _save(video_folder, archive)
+        return renamed
+
+
+def record_download(video_folder, video_id, filename, duration=None):
+    """Record that video_id was downloaded into video_folder as filename (duration in seconds, if known)."""
+    path = os.path.join(video_folder, filename)
+    size = os.path.getsize(path) if os.path.isfile(path) else None
+    with _archive_lock:
+        archive = _load(video_folder)
+        archive["videos"][video_id] = {"filename": filename, "size": size, "downloaded_at": time.time()}
+        if duration:
+            archive["videos"][video_id]["duration"] = duration
+        archive["pending"].pop(video_id, None)
+        _save(video_folder, archive)
+
+
+def archived_video_ids(video_folder):
+    """Return {filename: video_id} for the archived videos whose file is in video_folder.
+
+    Renamed files are found again by their size, as in find_archived(); entries
+    whose file is gone are left for find_archived() to drop.
+    """
+    try:
+        with os.scandir(video_folder) as entries:
+            sizes = {entry.name: entry.stat().st_size for entry in entries if entry.is_file()}
+    except OSError:
+        return {}
+    with _archive_lock:
+        archive = _load(video_folder)
+        recorded = {entry["filename"] for entry in archive["videos"].values()}
+        by_size = {}
+        for name, size in sizes.items():
+            if name not in recorded:
+                by_size.setdefault(size, name)
+        ids = {}
+        renamed = False
+        for video_id, entry in archive["videos"].items():
+            if entry["filename"] not in sizes:
+                name = by_size.get(entry.get("size")) if entry.get("size") else None
+                if not name:
+                    continue
+                entry["filename"] = name
+                del by_size[entry["size"]]
+                renamed = True
+            ids[entry["filename"]] = video_id
+        if renamed:
+            _save(video_folder, archive)
+        return ids
+
+
+def archived_durations(video_folder):
+    """Return {filename: duration in seconds} for the videos archived in video_folder."""
+    with _archive_lock:
+        videos = _load(video_folder)["videos"]
+        return {entry["filename"]: entry["duration"] for entry in videos.values() if entry.get("duration")}
+
+
+def record_pending(video_folder, video_id, video_url, quality_pref, protect=False):
+    """Remember a download that has started, so it can be resumed if interrupted."""
+    with _archive_lock:
+        archive = _load(video_folder)
+        previous = archive["pending"].get(video_id) or {}
+        archive["pending"][video_id] = {
+            "url": video_url,
+            "quality": quality_pref,
+            "protect": protect,
+            "attempts": previous.get("attempts", 0) + 1,
+        }
+        _save(video_folder, archive)
+
+
+def record_pending_stem(video_folder, video_id, stem):
+    """Store the output file name (without extension) of a pending download once yt-dlp has chosen it."""
+    with _archive_lock:
+        archive = _load(video_folder)
+        item = archive["pending"].get(video_id)
+        if item is not None and item.get("stem") != stem:
+            item["stem"] = stem
+            _save(video_folder, archive)
+
+
+def clear_pending(video_folder, video_id):
+    with _archive_lock:
+        archive = _load(video_folder)
+        if archive["pending"].pop(video_id, None) is not None:
+            _save(video_folder, archive)
+
+
+def pending_downloads():
+    """Return every unfinished download recorded in any folder's archive.
+
+    Each item is a dict with "folder", "video_id", "url", "quality",
+    "protect" and "attempts", plus "stem" once the output name is known.
+    """
+    try:
+        names = [n for n in os.listdir(DOWNLOAD_ARCHIVE_DIR) if n.endswith(".json")]
+    except OSError:
+        return []
+
+    pending = []
+    with _archive_lock:
+        for name in names:
+            path = os.path.join(DOWNLOAD_ARCHIVE_DIR, name)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    archive = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            if not isinstance(archive, dict) or not archive.get("folder"):
+                continue
+            for video_id, item in (archive.get("pending") or {}).items():
+                pending.append(dict(item, folder=archive["folder"], video_id=video_id))
+    return pending
+
@@ -0,0 +1,103 @@
+import threading
+import time
+
+
+class DownloadJob:
+    """Progress of one download, as last reported by its yt-dlp progress hook."""
+
+    def __init__(self, key):
+        self.key = key
+        self.status = "downloading"
+        self.downloaded_bytes = 0
+        self.total_bytes = None
+        self.speed = None
+        self.eta = None
+        self.started_at = time.monotonic()
+
+    @property
+    def active(self):
+        return self.status == "downloading"
+
+    @property
+    def percent(self):
+        if not self.total_bytes:
+            return None
+        return min(100.0, self.downloaded_bytes / self.total_bytes * 100)
+
+    def copy(self):
+        job = DownloadJob.__new__(DownloadJob)
+        job.__dict__.update(self.__dict__)
+        return job
+
+
+class DownloadJobRegistry:
+    """Thread-safe progress state for every running download, keyed by channel.
+
+    Each channel (or "others") owns one job, so downloads that run at the same
+    time no longer overwrite each other's progress. A job is created by its
+    first progress event and ends with a "finished" or "error" event; a new
+    "downloading" event for the same key starts it over (e.g. the next week of
+    a range download).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs = {}
+
+    def update(self, key, d):
+        """Apply a yt-dlp progress event to the job for `key` and return a copy of it.
+
+        Returns None if the event does not change anything, e.g. an "error"
+        for a download that already finished or never started.
+        """
+        status = d.get("status")
+        with self._lock:
+            job = self._jobs.get(key)
+            if status == "downloading":
+                if job is None or not job.active:
+                    job = self._jobs[key] = DownloadJob(key)
+                total = d.get("total_bytes") or d.get("total_bytes_estimate")
+                if total:
+                    job.total_bytes = total
+                job.downloaded_bytes = d.get("downloaded_bytes") or 0
+                job.speed = d.get("speed")
+                job.eta = d.get("eta")
+            elif status in ("finished", "error"):
+                if job is None or not job.active:
+                    return None
+                job.status = status
+                job.speed = job.eta = None
+                if status == "finished":
+                    job.total_bytes = job.total_bytes or job.downloaded_bytes
+                    job.downloaded_bytes = job.total_bytes
+            else:
+                return None
+            return job.copy()
+
+    def get(self, key):
+        with self._lock:
+            job = self._jobs.get(key)
+            return job.copy() if job else None
+
+    def remove(self, key):
+        """Forget the job for `key` unless it has started downloading again."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job and not job.active:
+                del self._jobs[key]
+
+    def active_jobs(self):
+        """Return copies of the jobs that are still downloading, oldest first."""
+        with self._lock:
+            jobs = [job.copy() for job in self._jobs.values() if job.active]
+        return sorted(jobs, key=lambda job: job.started_at)
+
+    def totals(self):
+        """Return (downloaded_bytes, total_bytes, speed) summed over active jobs with a known size."""
+        downloaded = total = speed = 0
+        for job in self.active_jobs():
+            if job.total_bytes:
+                downloaded += job.downloaded_bytes
+                total += job.total_bytes
+            speed += job.speed or 0
+        return downloaded, total, speed
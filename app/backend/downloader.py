@@ -1,35 +1,34 @@
 import os
-import json
 import time
-import yt_dlp
+import contextlib
+import functools
+import threading
 import logging
 from datetime import datetime, timedelta
-from app.backend.config import load_settings, SETTINGS_FILE, settings_lock
-from tkinter import messagebox
+from app.backend.config import load_settings
+from app.backend.ytdlp_session import YtdlpSession, ParallelStreams
+from app.backend.progress import AggregateProgress
+from app.backend.scheduler import current_task, PRIORITY_BACKGROUND
+from app.backend.bandwidth import get_bandwidth_manager
+from app.backend.download_archive import (
+    video_id_from_url, find_archived, record_download, record_pending, record_pending_stem, clear_pending,
+    pending_downloads
+)
+from app.backend.channel_cache import (
+    load_channel_cache, save_channel_cache, is_fresh, needs_full_refresh, evict_video, slim_entry,
+    DEFAULT_CACHE_TTL_MINUTES
+)
+from app.backend.protected_videos import all_protected, protect_video
+from app.backend.disk_space import DiskSpaceGuard
+from app.backend.folder_watcher import is_partial
 
 
 def load_protected_videos():
-    with settings_lock:
-        try:
-            with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f).get("protected_videos", {})
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+    """Return {channel_folder: [filename, ...]} for every protected video."""
+    return all_protected()
 
-def add_protected_video(channel_folder, title):
-    with settings_lock:
-        try:
-            with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
-                settings = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            settings = {}
-
-        protected = settings.setdefault("protected_videos", {})
-        protected.setdefault(channel_folder, [])
-        if title not in protected[channel_folder]:
-            protected[channel_folder].append(title)
-            with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
-                json.dump(settings, f, indent=2)
+def add_protected_video(channel_folder, title, video_id=None):
+    protect_video(channel_folder, title, video_id)
 
 def get_next_saturday(date_format="%d.%m.%Y"):
     today = datetime.today()
@@ -55,13 +54,16 @@ def format_romanian_date(date_obj):
 import re
 
 
+# Date-like patterns: 1-2 digits, separator, 1-2 digits, separator, 4 digits
+_DATE_LIKE_RE = re.compile(r'(\d{1,2})[^\d]+(\d{1,2})[^\d]+(\d{4})')
+
+
 def _normalize_date_in_text(text):
     """Replace any non-digit delimiters between date components with dots.
 
     Handles cases like '13 03.2026', '13,03,2026', '13 03 2026' -> '13.03.2026'
     """
-    # Match date-like patterns: 1-2 digits, separator, 1-2 digits, separator, 4 digits
-    return re.sub(r'(\d{1,2})[^\d]+(\d{1,2})[^\d]+(\d{4})', r'\1.\2.\3', text)
+    return _DATE_LIKE_RE.sub(r'\1.\2.\3', text)
 
 
 def _build_date_variants(date_obj):
@@ -85,128 +87,317 @@ def _build_date_variants(date_obj):
     return variants
 
 
-def find_video_url(channel_url, expected_date, date_format="%d.%m.%Y"):
-    """Find a video URL matching the expected date.
+# Lookup depth budget: how many uploads to scan before giving up on a date.
+# Older target dates are allowed to go deeper into the channel.
+LOOKUP_BASE_ENTRIES = 60
+LOOKUP_ENTRIES_PER_WEEK = 20
 
-    Returns: (url, match_info) tuple where match_info is:
-        - None if no match found (url will also be None)
-        - {"type": "exact", "title": ...} for exact date match
-        - {"type": "fuzzy", "title": ..., "reason": ...} for nearby date or delimiter mismatch
-    """
 
-    ydl_opts = {
-        'quiet': True,
-        'extract_flat': 'in_playlist',
-        'force_generic_extractor': True,
-        'nocheckcertificate': True,
-        'flat': True,
-    }
+def _lookup_depth(expected_date_obj):
+    weeks_back = max(0, (datetime.today().date() - expected_date_obj).days // 7)
+    return LOOKUP_BASE_ENTRIES + weeks_back * LOOKUP_ENTRIES_PER_WEEK
 
-    try:
-        expected_date_obj = datetime.strptime(expected_date, date_format).date()
-    except Exception as e:
-        logging.error(f"Expected date parsing error: {e}")
-        return None, None
 
-    # Build exact match strings
-    formatted_numeric = expected_date_obj.strftime(date_format).lower()
-    formatted_romanian = format_romanian_date(expected_date_obj).lower()
-    exact_parts = {formatted_numeric, formatted_romanian}
+# Options yt-dlp reads per call, applied on top of a shared session for lookups
+LOOKUP_PARAMS = {
+    'quiet': True,
+    'extract_flat': 'in_playlist',
+    'lazy_playlist': True,
+}
 
-    # Build fuzzy variants (±1 day, normalized delimiters)
-    date_variants = _build_date_variants(expected_date_obj)
 
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        try:
-            start_time = time.time()
-            info = ydl.extract_info(channel_url + "/videos", download=False)
-            logging.debug(f"yt-dlp took {time.time() - start_time:.2f} seconds to extract info.")
-            entries = info.get("entries", [])
-
-            best_fuzzy = None
-
-            for entry in entries:
-                title = entry.get("title", "")
-                title_lower = title.lower()
-
-                if "diaspora" in title_lower:
-                    continue
-
-                url = f"https://www.youtube.com/watch?v={entry['id']}"
-
-                # 1. Exact match (current behavior)
-                if any(part in title_lower for part in exact_parts):
-                    return url, {"type": "exact", "title": title}
-
-                # 2. Fuzzy match: normalize delimiters in title, then check variants
-                normalized_title = _normalize_date_in_text(title_lower)
-                for variant, offset in date_variants.items():
-                    if variant in title_lower or variant in normalized_title:
-                        reason = []
-                        if offset != 0:
-                            reason.append(f"date is off by {abs(offset)} day ({'before' if offset < 0 else 'after'} Sabbath)")
-                        if variant in normalized_title and variant not in title_lower:
-                            reason.append("delimiter mismatch in date format")
-                        if offset == 0 and variant not in exact_parts and not reason:
-                            reason.append("non-standard date format")
-                        if reason:
-                            best_fuzzy = (url, {
-                                "type": "fuzzy",
-                                "title": title,
-                                "reason": "; ".join(reason),
-                            })
-                            break
-                if best_fuzzy:
-                    break
+def _iter_channel_entries(channel_url, session=None):
+    """Yield the channel's /videos entries newest first.
 
-            if best_fuzzy:
-                return best_fuzzy
+    The playlist is extracted with process=False, so yt-dlp only requests the
+    next continuation page when the caller iterates that far. With a session
+    the lookup runs on its YoutubeDL; otherwise a standalone one is used.
+    """
+    if session is not None:
+        ydl_context = session.overrides(**LOOKUP_PARAMS)
+    else:
+        import yt_dlp  # deferred: importing the extractor registry is slow (see scripts/import_time_report.py)
+        ydl_context = yt_dlp.YoutubeDL({
+            **LOOKUP_PARAMS,
+            'force_generic_extractor': True,
+            'nocheckcertificate': True,
+            'flat': True,
+        })
 
-        except Exception as e:
-            logging.error(f"Failed to fetch video list: {e}")
-            return None, None
+    with ydl_context as ydl:
+        start_time = time.time()
+        info = ydl.extract_info(channel_url + "/videos", download=False, process=False)
+        # Follow redirects (e.g. /c/ handles to the canonical channel) without processing
+        for _ in range(3):
+            if info.get("_type") not in ("url", "url_transparent"):
+                break
+            info = ydl.extract_info(info["url"], download=False, process=False)
+        logging.debug(f"yt-dlp took {time.time() - start_time:.2f} seconds to extract info.")
+        for entry in info.get("entries") or []:
+            if entry.get("id"):
+                yield slim_entry(entry)
+
+
+class DateMatcher:
+    """Classifies titles against one expected date in a single regex pass.
+
+    All exact forms and fuzzy variants (see _build_date_variants) are compiled
+    into one alternation, so each title is scanned once instead of once per
+    variant. Build it through get_date_matcher() to reuse it across lookups.
+    """
 
+    def __init__(self, expected_date_obj, date_format="%d.%m.%Y"):
+        self.expected_date = expected_date_obj
+        formatted_numeric = expected_date_obj.strftime(date_format).lower()
+        formatted_romanian = format_romanian_date(expected_date_obj).lower()
+        self.exact_parts = {formatted_numeric, formatted_romanian}
+        self.date_variants = _build_date_variants(expected_date_obj)
+        self._variant_rank = {variant: i for i, variant in enumerate(self.date_variants)}
+
+        literals = sorted(self.exact_parts | set(self.date_variants), key=len, reverse=True)
+        # The lookahead reports overlapping hits; a shorter literal hidden behind a
+        # longer one at the same position is a substring of it, see _contained
+        self._pattern = re.compile("(?=(" + "|".join(map(re.escape, literals)) + "))")
+        self._contained = {
+            literal: {other for other in literals if other != literal and other in literal}
+            for literal in literals
+        }
+        # Cheap rejection test: a variant can only appear after normalization where
+        # the raw title has the same digits separated by non-digit runs
+        loose_variants = ("[^\\d]+".join(map(re.escape, v.split("."))) for v in self.date_variants)
+        self._prefilter = re.compile("|".join([*map(re.escape, self.exact_parts), *loose_variants]))
+
+    def _find(self, text):
+        found = {m.group(1) for m in self._pattern.finditer(text)}
+        for literal in list(found):
+            found |= self._contained[literal]
+        return found
+
+    def classify(self, title):
+        """Return None, {"type": "exact", "offset": 0} or
+        {"type": "fuzzy", "offset": days, "reason": ...} for a title."""
+        title_lower = title.lower()
+        if "diaspora" in title_lower:
+            return None
+        if not self._prefilter.search(title_lower):
+            return None
+
+        # 1. Exact match
+        found = self._find(title_lower)
+        if found & self.exact_parts:
+            return {"type": "exact", "offset": 0}
+
+        # 2. Fuzzy match: normalize delimiters in title, then check variants
+        normalized_title = _normalize_date_in_text(title_lower)
+        found_normalized = found if normalized_title == title_lower else self._find(normalized_title)
+        candidates = [v for v in found | found_normalized if v in self._variant_rank]
+        for variant in sorted(candidates, key=self._variant_rank.get):
+            offset = self.date_variants[variant]
+            reason = []
+            if offset != 0:
+                reason.append(f"date is off by {abs(offset)} day ({'before' if offset < 0 else 'after'} Sabbath)")
+            if variant in found_normalized and variant not in found:
+                reason.append("delimiter mismatch in date format")
+            if offset == 0 and variant not in self.exact_parts and not reason:
+                reason.append("non-standard date format")
+            if reason:
+                return {"type": "fuzzy", "offset": offset, "reason": "; ".join(reason)}
+        return None
+
+
+@functools.lru_cache(maxsize=64)
+def get_date_matcher(expected_date_obj, date_format="%d.%m.%Y"):
+    return DateMatcher(expected_date_obj, date_format)
+
+
+def _match_entry(entry, matcher):
+    """Return (url, match_info) if the entry's title matches the date, else None."""
+    title = entry.get("title", "")
+    result = matcher.classify(title)
+    if not result:
+        return None
+
+    url = f"https://www.youtube.com/watch?v={entry['id']}"
+    if result["type"] == "exact":
+        return url, {"type": "exact", "title": title}
+    return url, {"type": "fuzzy", "title": title, "reason": result["reason"]}
+
+
+def _scan_entries(entries, matcher):
+    """Return the first matching entry in listing order, as (url, match_info)."""
+    for entry in entries:
+        match = _match_entry(entry, matcher)
+        if match:
+            return match
     return None, None
 
-def delete_old_videos(video_folder, keep_old):
-    if not keep_old:
-        # If keep_old is False, delete all .mp4 files regardless of protection status
-        for filename in os.listdir(video_folder):
-            if filename.endswith(".mp4"):
-                os.remove(os.path.join(video_folder, filename))
-                logging.info(f"Deleted old video: {filename}")
-        # If keep_old is True, do nothing (i.e., keep all videos)
 
-def download_video(video_url, video_folder, quality_pref="1080p", protect=False, progress_hook=None):
-    if not video_folder:
-        logging.error("Video folder path is empty or invalid.")
-        return
+def _lookup_channel(channel_url, cache, max_entries, match, session=None):
+    """Walk the channel listing newest first, stopping as early as possible.
 
-    # Check if video already exists in folder by title (simplified check)
-    video_title = video_url.split("v=")[-1]
-    existing_files = os.listdir(video_folder) if os.path.exists(video_folder) else []
-    for file in existing_files:
-        if video_title in file:
-            logging.info(f"Video already exists: {file}")
-            return
+    New uploads are read until the cached listing is reached, the cache is then
+    scanned without network access, and older uploads are only requested while
+    there is no match and fewer than max_entries have been scanned.
 
-    os.makedirs(video_folder, exist_ok=True)
+    Returns (listing, complete, hit) where listing is the contiguous newest-first
+    list to cache, complete tells whether it covers the whole channel and hit is
+    the first truthy match(entry) result in listing order, or None. The walk
+    ends once match returns something truthy.
+    """
+    cached = cache["entries"] if cache else []
+    complete = bool(cache and cache.get("complete"))
+    pending_cache = {e["id"] for e in cached}
+    listing = []
+    seen = set()
+    hit = None
+
+    entries = _iter_channel_entries(channel_url, session)
+    try:
+        for entry in entries:
+            if entry["id"] in pending_cache:
+                # Reached the cached listing: splice it in and scan it offline
+                for cached_entry in cached:
+                    if cached_entry["id"] not in seen:
+                        seen.add(cached_entry["id"])
+                        listing.append(cached_entry)
+                        hit = hit or match(cached_entry)
+                pending_cache = set()
+                if hit or complete or len(listing) >= max_entries:
+                    break
+                continue
+            if entry["id"] in seen:
+                continue
+            seen.add(entry["id"])
+            listing.append(entry)
+            hit = hit or match(entry)
+            # Keep reading up to the cached listing so the cache stays contiguous
+            if not pending_cache and (hit or len(listing) >= max_entries):
+                break
+            if pending_cache and len(listing) >= max_entries:
+                cached = []  # Too far from the cache to join it; drop the old listing
+                break
+        else:
+            complete = True
+            if pending_cache:
+                cached = []  # The whole channel was read; cached ids no longer exist
+    finally:
+        entries.close()
+
+    if pending_cache:
+        # Never reached the cached listing (end of channel or budget); keep it behind
+        listing.extend(e for e in cached if e["id"] not in seen)
+        if not hit:
+            hit = next(filter(None, map(match, cached)), None)
+    return listing, complete, hit
+
+
+def find_video_url(channel_url, expected_date, date_format="%d.%m.%Y", cache_ttl_minutes=DEFAULT_CACHE_TTL_MINUTES,
+                   session=None):
+    """Find a video URL matching the expected date.
 
-    # Determine format options based on quality_pref
-    quality_formats = {
-        "max":   'bestvideo+bestaudio/best',
-        "4k":    'bestvideo[height<=2160]+bestaudio/best[height<=2160]',
-        "2k":    'bestvideo[height<=1440]+bestaudio/best[height<=1440]',
-        "1080p": 'bestvideo[height<=1080]+bestaudio/best[height<=1080]',
-        "720p":  'bestvideo[height<=720]+bestaudio/best[height<=720]',
-        "480p":  'bestvideo[height<=480]+bestaudio/best[height<=480]',
-    }
+    The channel listing is cached on disk; a fresh cache answers exact matches
+    without any network access. Otherwise entries are read lazily, newest
+    first, and the lookup stops at the first match. Older target dates are
+    allowed to scan deeper into the channel (see _lookup_depth). Pass the
+    channel run's YtdlpSession to reuse it for the download afterwards.
+
+    Returns: (url, match_info) tuple where match_info is:
+        - None if no match found (url will also be None)
+        - {"type": "exact", "title": ...} for exact date match
+        - {"type": "fuzzy", "title": ..., "reason": ...} for nearby date or delimiter mismatch
+        - {"type": "unreachable", "reason": ...} if the channel could not be fetched and
+          there is no cached listing (url is None)
+    """
+    return find_video_urls(channel_url, [expected_date], date_format, cache_ttl_minutes, session)[expected_date]
+
+
+def find_video_urls(channel_url, dates, date_format="%d.%m.%Y", cache_ttl_minutes=DEFAULT_CACHE_TTL_MINUTES,
+                    session=None):
+    """Find videos for several dates with a single scan of the channel listing.
+
+    Each date gets the same result find_video_url would return for it (the
+    first matching upload, newest first); the scan stops once every date has
+    a match or the lookup depth of the oldest date is used up.
 
+    Returns: dict mapping each requested date string to a (url, match_info) tuple.
+    """
+    results = {date_str: (None, None) for date_str in dates}
+    matchers = {}
+    for date_str in results:
+        try:
+            matchers[date_str] = get_date_matcher(datetime.strptime(date_str, date_format).date(), date_format)
+        except Exception as e:
+            logging.error(f"Expected date parsing error: {e}")
+    if not matchers:
+        return results
+
+    def scan(entries):
+        for date_str, matcher in matchers.items():
+            url, match_info = _scan_entries(entries, matcher)
+            if url:
+                results[date_str] = (url, match_info)
+        return results
+
+    cache = stale_cache = load_channel_cache(channel_url)
+    if needs_full_refresh(cache):
+        # Merging only ever adds uploads; start over now and then so deleted or private videos drop out
+        cache = None
+    if is_fresh(cache, cache_ttl_minutes):
+        scan(cache["entries"])
+        # Only exact hits are trusted; a newer upload could beat a fuzzy one
+        if all(results[d][1] and results[d][1]["type"] == "exact" for d in matchers):
+            return results
+        results.update({date_str: (None, None) for date_str in matchers})
+
+    pending = dict(matchers)
+
+    def match(entry):
+        for date_str, matcher in list(pending.items()):
+            hit = _match_entry(entry, matcher)
+            if hit:
+                results[date_str] = hit
+                del pending[date_str]
+        return not pending
+
+    max_entries = max(_lookup_depth(m.expected_date) for m in matchers.values())
+    try:
+        listing, complete, _ = _lookup_channel(channel_url, cache, max_entries, match, session)
+    except Exception as e:
+        logging.error(f"Failed to fetch video list: {e}")
+        if not stale_cache:
+            return {date_str: (None, {"type": "unreachable", "reason": str(e)}) for date_str in results}
+        # Fall back to the stale listing while offline
+        results.update({date_str: (None, None) for date_str in results})
+        return scan(stale_cache["entries"])
+
+    save_channel_cache(channel_url, listing, complete=complete, refreshed_at=cache.get("refreshed_at") if cache else None)
+    return results
+
+# Large downloads: DASH fragments fetched in parallel, plain HTTP streams in chunks
+DEFAULT_CONCURRENT_FRAGMENTS = 4
+DEFAULT_HTTP_CHUNK_SIZE_MB = 10
+# Interrupted downloads are retried at startup at most this many times
+MAX_RESUME_ATTEMPTS = 3
+# Parts of yt-dlp's error for a video that was deleted or made private
+_UNAVAILABLE_MARKERS = ("video unavailable", "private video", "has been removed", "no longer available")
+
+QUALITY_FORMATS = {
+    "max":   'bestvideo+bestaudio/best',
+    "4k":    'bestvideo[height<=2160]+bestaudio/best[height<=2160]',
+    "2k":    'bestvideo[height<=1440]+bestaudio/best[height<=1440]',
+    "1080p": 'bestvideo[height<=1080]+bestaudio/best[height<=1080]',
+    "720p":  'bestvideo[height<=720]+bestaudio/best[height<=720]',
+    "480p":  'bestvideo[height<=480]+bestaudio/best[height<=480]',
+}
+
+
+def download_options(video_folder, quality_pref="1080p", progress_hook=None):
+    """Build the yt-dlp options for downloading into video_folder at quality_pref."""
     if quality_pref == "mp3":
         ydl_format = 'bestaudio/best'
         merge_format = 'mp3'
-    elif quality_pref in quality_formats:
-        ydl_format = quality_formats[quality_pref]
+    elif quality_pref in QUALITY_FORMATS:
+        ydl_format = QUALITY_FORMATS[quality_pref]
         merge_format = 'mp4'
     else:
         ydl_format = 'bestvideo+bestaudio/best'
@@ -223,7 +414,11 @@ def download_video(video_url, video_folder, quality_pref="1080p", protect=False,
         'merge_output_format': merge_format,
         'postprocessors': [],
         'ffmpeg_location': ffmpeg_path,
-        'progress_hooks': [progress_hook] if progress_hook else []
+        'progress_hooks': [progress_hook] if progress_hook else [],
+        'concurrent_fragment_downloads': max(1, int(settings.get("concurrent_fragment_downloads", DEFAULT_CONCURRENT_FRAGMENTS))),
+        'http_chunk_size': int(float(settings.get("http_chunk_size_mb", DEFAULT_HTTP_CHUNK_SIZE_MB)) * 1024 * 1024) or None,
+        # Continue leftover .part files instead of starting over
+        'continuedl': settings.get("resume_partial_downloads", True),
     }
 
     if quality_pref == "mp3":
@@ -232,28 +427,193 @@ def download_video(video_url, video_folder, quality_pref="1080p", protect=False,
             'preferredcodec': 'mp3',
             'preferredquality': '192',
         })
+    return ydl_opts
 
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+
+def open_download_session(video_folder, quality_pref="1080p", progress_hook=None):
+    """Return a YtdlpSession for one channel run: lookups, then downloads into video_folder.
+
+    progress_hook receives yt-dlp style events aggregated over all streams of a
+    download (see AggregateProgress).
+    """
+    progress = AggregateProgress(progress_hook) if progress_hook else None
+    return YtdlpSession(download_options(video_folder, quality_pref, progress), progress=progress)
+
+
+def _downloaded_filename(info):
+    """Name of the finished file, taken from the info dict the download returned."""
+    for requested in info.get("requested_downloads") or []:
+        if requested.get("filepath"):
+            return os.path.basename(requested["filepath"])
+    # Matches the outtmpl used by download_options: '%(title)s.%(ext)s'
+    return f"{info.get('title')}.{info.get('ext')}"
+
+
+_video_locks = {}
+_video_locks_guard = threading.Lock()
+
+
+def _video_lock(video_folder, video_id):
+    """Lock held while one video is downloaded into one folder.
+
+    A second request for the same video (e.g. a startup resume racing the
+    automatic check) waits and then finds it in the archive.
+    """
+    key = (os.path.normcase(os.path.abspath(video_folder)), video_id)
+    with _video_locks_guard:
+        return _video_locks.setdefault(key, threading.Lock())
+
+
+def _has_partial_files(video_folder, stem=None):
+    """True if yt-dlp left unfinished download files in video_folder.
+
+    With a stem (the output name without extension) only that video's files
+    count, e.g. "<stem>.f137.mp4.part"; without one (entries recorded before
+    the name was known) any partial file does.
+    """
+    try:
+        with os.scandir(video_folder) as entries:
+            return any(
+                is_partial(e.name) and (stem is None or e.name.startswith(f"{stem}."))
+                for e in entries
+            )
+    except OSError:
+        return False
+
+
+@contextlib.contextmanager
+def _recording_output_stem(ydl, video_folder, video_id):
+    """Store the output name in the pending entry once yt-dlp has chosen formats.
+
+    Uses an instance override of process_info, like ParallelStreams, so it is
+    known before the first byte is written.
+    """
+    saved = vars(ydl).get("process_info")
+    process_info = ydl.process_info
+
+    def record_then_process(info_dict, *args, **kwargs):
+        stem = os.path.splitext(os.path.basename(ydl.prepare_filename(info_dict)))[0]
+        record_pending_stem(video_folder, video_id, stem)
+        return process_info(info_dict, *args, **kwargs)
+
+    if video_id:
+        ydl.process_info = record_then_process
+    try:
+        yield
+    finally:
+        if saved is not None:
+            ydl.process_info = saved
+        else:
+            vars(ydl).pop("process_info", None)
+
+
+def find_resumable_downloads():
+    """Return pending downloads that left partial files behind.
+
+    Entries without partial files, or that already failed MAX_RESUME_ATTEMPTS
+    times, are dropped from the archive.
+    """
+    resumable = []
+    for item in pending_downloads():
+        if item.get("attempts", 0) < MAX_RESUME_ATTEMPTS and _has_partial_files(item["folder"], item.get("stem")):
+            resumable.append(item)
+        else:
+            clear_pending(item["folder"], item["video_id"])
+    return resumable
+
+
+def queue_resumable_downloads(scheduler, worker, settings):
+    """Queue worker(item) as background work for each of find_resumable_downloads(); returns the futures.
+
+    The window and the headless mode both resume through here, so each video
+    has the same task key (folder name, video ID) whichever one queued it.
+    """
+    if not settings.get("resume_partial_downloads", True):
+        return []
+    futures = []
+    for item in find_resumable_downloads():
+        folder_name = os.path.basename(item["folder"])
+        # One task per video: several can be pending in the same folder
+        futures.append(scheduler.download(worker, item, key=(folder_name, item["video_id"]),
+                                          label=folder_name, priority=PRIORITY_BACKGROUND))
+    return futures
+
+
+def download_video(video_url, video_folder, quality_pref="1080p", protect=False, progress_hook=None, session=None):
+    """Download video_url into video_folder. Returns None on success or an error message.
+
+    A session from open_download_session() for the same folder and quality may
+    be passed to reuse the YoutubeDL from the lookup; it is left open.
+    """
+    if not video_folder:
+        logging.error("Video folder path is empty or invalid.")
+        return
+
+    video_id = video_id_from_url(video_url)
+    if not video_id:
+        return _download(video_url, video_folder, quality_pref, protect, progress_hook, session, None)
+
+    with _video_lock(video_folder, video_id):
+        # Check the folder's download archive for this video ID
+        existing = find_archived(video_folder, video_id)
+        if existing:
+            logging.info(f"Video already exists: {existing}")
+            return
+        return _download(video_url, video_folder, quality_pref, protect, progress_hook, session, video_id)
+
+
+def _download(video_url, video_folder, quality_pref, protect, progress_hook, session, video_id):
+    import yt_dlp
+    os.makedirs(video_folder, exist_ok=True)
+    if video_id:
+        record_pending(video_folder, video_id, video_url, quality_pref, protect)
+
+    owns_session = session is None
+    if owns_session:
+        session = open_download_session(video_folder, quality_pref, progress_hook)
+    # Lets DownloadScheduler.cancel() stop this transfer
+    session.task = current_task()
+    # Background work shares the configured speed cap; downloads started by hand run at full speed
+    bandwidth = get_bandwidth_manager() if session.task and session.task.priority >= PRIORITY_BACKGROUND else None
+    session.throttle = bandwidth.transfer() if bandwidth else None
+    settings, _ = load_settings()
+
+    try:
+        ydl = session.open()
         try:
             logging.info(f"Downloading: {video_url} with quality {quality_pref}")
-            ydl.download([video_url])
+            # Video and audio streams are fetched concurrently and merged once both arrive.
+            # Free space is checked once formats are chosen, before any byte is fetched.
+            # The returned info dict describes the finished file; no second lookup needed
+            with ParallelStreams(ydl, session.progress), \
+                    _recording_output_stem(ydl, video_folder, video_id), \
+                    DiskSpaceGuard(ydl, video_folder, quality_pref, settings, QUALITY_FORMATS):
+                info = ydl.extract_info(video_url, download=True)
             logging.info("Download complete.")
-            if protect:
-                # Get video info to accurately identify the downloaded file
-                info = ydl.extract_info(video_url, download=False)
-                if info:
-                    # Construct the expected filename based on yt-dlp's output template
-                    # This assumes the default outtmpl: '%(title)s.%(ext)s'
-                    video_filename = f"{info.get('title')}.{info.get('ext')}"
-                    add_protected_video(os.path.basename(video_folder), video_filename)
+            if info:
+                filename = _downloaded_filename(info)
+                if video_id:
+                    record_download(video_folder, video_id, filename, info.get("duration"))
+                if protect:
+                    add_protected_video(os.path.basename(video_folder), filename, video_id)
         except yt_dlp.utils.DownloadError as e:
             error_message = str(e)
             logging.error(f"Download failed: {error_message}")
+            if video_id and any(marker in error_message.lower() for marker in _UNAVAILABLE_MARKERS):
+                # Otherwise the cached listing keeps matching it on every check
+                evict_video(video_id)
             return error_message
         except Exception as e:
             error_message = str(e)
             logging.error(f"An unexpected error occurred during download: {error_message}")
             return error_message
+    finally:
+        if video_id and session.task and session.task.cancel_requested:
+            # Stopped by the user, so it is not resumed at the next start
+            clear_pending(video_folder, video_id)
+        session.task = session.throttle = None
+        if owns_session:
+            session.close()
     return None # Return None on successful download
 
 def get_recent_sabbaths(n=30, date_format="%d.%m.%Y"):
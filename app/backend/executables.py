@@ -0,0 +1,174 @@
+import json
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+from app.backend.config import CONFIG_DIR, get_bundled_executable_paths, init_app_dirs
+
+EXECUTABLE_INFO_FILE = os.path.join(CONFIG_DIR, "executables.json")
+
+# Seconds before a failed lookup is tried again (e.g. mpv installed while the app runs)
+NOT_FOUND_RECHECK_SECONDS = 60
+
+# Seconds one version/capability probe may take
+PROBE_TIMEOUT = 15
+
+_lock = threading.Lock()
+# (name, configured path) -> (path, source, file stamp, checked at)
+_resolved = {}
+# Contents of EXECUTABLE_INFO_FILE, loaded on first use
+_info_cache = None
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _is_executable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def resolve_executable(name, configured=None):
+    """Find `name` ("mpv" or "ffmpeg"); returns (path, source) or ("", None).
+
+    The configured path (from settings) is tried first, then the copy bundled
+    with the app, then PATH; source says which one matched ("settings",
+    "bundled" or "path"). The answer is cached and only looked up again when
+    the file it points at changes or disappears, so each call costs one stat.
+    """
+    cache_key = (name, configured or "")
+    with _lock:
+        cached = _resolved.get(cache_key)
+        if cached:
+            path, source, stamp, checked_at = cached
+            if path and _file_stamp(path) == stamp:
+                return path, source
+            if not path and time.monotonic() - checked_at < NOT_FOUND_RECHECK_SECONDS:
+                return "", None
+
+        path, source = "", None
+        candidates = (
+            ("settings", lambda: configured),
+            ("bundled", lambda: get_bundled_executable_paths().get(name)),
+            ("path", lambda: shutil.which(name)),
+        )
+        for candidate_source, candidate in candidates:
+            candidate_path = candidate()
+            if _is_executable(candidate_path):
+                path, source = candidate_path, candidate_source
+                break
+        _resolved[cache_key] = (path, source, _file_stamp(path) if path else None, time.monotonic())
+        return path, source
+
+
+def _run(args):
+    kwargs = {}
+    if os.name == "nt":
+        # Don't flash a console window from the GUI
+        kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+    result = subprocess.run(args, capture_output=True, text=True, errors="replace", timeout=PROBE_TIMEOUT, **kwargs)
+    return result.stdout
+
+
+def _first_line(output):
+    return output.strip().splitlines()[0] if output.strip() else ""
+
+
+def _parse_ffmpeg_hwaccels(output):
+    # "Hardware acceleration methods:" followed by one name per line
+    lines = output.strip().splitlines()
+    return [line.strip() for line in lines[1:] if line.strip()]
+
+
+def _parse_ffmpeg_encoders(output):
+    # A legend, a " ------" line, then " V....D libx264   description" rows
+    encoders = []
+    in_table = False
+    for line in output.splitlines():
+        if line.strip().startswith("---"):
+            in_table = True
+            continue
+        parts = line.split()
+        if in_table and len(parts) >= 2:
+            encoders.append(parts[1])
+    return encoders
+
+
+def _parse_mpv_hwdec(output):
+    # "Valid values (with alternative full names):" followed by indented "name (full-name)" rows
+    values = []
+    for line in output.splitlines():
+        if line.startswith((" ", "\t")) and line.strip():
+            values.append(line.split()[0])
+    return values
+
+
+def _probe(name, path):
+    if name == "ffmpeg":
+        return {
+            "version": _first_line(_run([path, "-hide_banner", "-version"])),
+            "hwaccels": _parse_ffmpeg_hwaccels(_run([path, "-hide_banner", "-hwaccels"])),
+            "encoders": _parse_ffmpeg_encoders(_run([path, "-hide_banner", "-encoders"])),
+        }
+    if name == "mpv":
+        return {
+            "version": _first_line(_run([path, "--no-config", "--version"])),
+            "hwdec": _parse_mpv_hwdec(_run([path, "--no-config", "--hwdec=help"])),
+        }
+    return {"version": _first_line(_run([path, "--version"]))}
+
+
+def _load_info_cache():
+    global _info_cache
+    if _info_cache is None:
+        try:
+            with open(EXECUTABLE_INFO_FILE, "r", encoding="utf-8") as f:
+                _info_cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            _info_cache = {}
+    return _info_cache
+
+
+def get_executable_info(name, configured=None):
+    """Return version and capability info for `name`, or None if it is not found.
+
+    ffmpeg: {"path", "source", "version", "hwaccels", "encoders"}
+    mpv:    {"path", "source", "version", "hwdec"}
+
+    The executable is run once per file version (path + mtime + size); the
+    result is kept in executables.json next to settings.json, so later calls
+    and later runs of the app answer without starting a process.
+    """
+    path, source = resolve_executable(name, configured)
+    if not path:
+        return None
+    stamp = list(_file_stamp(path) or ())
+
+    with _lock:
+        cached = _load_info_cache().get(path)
+    if cached and cached.get("stamp") == stamp:
+        return dict(cached["info"], path=path, source=source)
+
+    try:
+        info = _probe(name, path)
+    except (OSError, subprocess.SubprocessError) as e:
+        logging.warning(f"Could not query {name} at {path}: {e}")
+        return {"path": path, "source": source, "version": ""}
+
+    with _lock:
+        cache = _load_info_cache()
+        cache[path] = {"stamp": stamp, "info": info}
+        try:
+            init_app_dirs()
+            with open(EXECUTABLE_INFO_FILE, "w", encoding="utf-8") as f:
+                json.dump(cache, f, indent=2)
+        except OSError as e:
+            logging.warning(f"Could not save executable info: {e}")
+    return dict(info, path=path, source=source)
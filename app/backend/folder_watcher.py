@@ -0,0 +1,252 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import stat
+import struct
+import sys
+import threading
+
+# Seconds between checks of the folder's mtime where inotify is not available
+POLL_INTERVAL = 2.0
+
+# Seconds to wait for a burst of events (e.g. a merge renaming several files) to settle
+SETTLE_DELAY = 0.2
+
+# Entries per list yielded by iter_folder()
+SCAN_CHUNK_SIZE = 500
+
+# yt-dlp's in-progress files; they show up once the download has finished
+_PARTIAL_SUFFIXES = (".part", ".ytdl", ".temp")
+# Fragments ("x.mp4.part-Frag3") and the merger's output before its rename ("x.temp.mp4")
+_PARTIAL_MARKERS = (".part-Frag", ".temp.")
+
+# inotify(7) constants
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+# Events after which the whole folder is listed again instead of the named files
+_RESCAN_MASK = _IN_Q_OVERFLOW | _IN_DELETE_SELF | _IN_MOVE_SELF
+# struct inotify_event: wd, mask, cookie, len, then len bytes of NUL-padded name
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def is_partial(name):
+    return name.endswith(_PARTIAL_SUFFIXES) or any(marker in name for marker in _PARTIAL_MARKERS)
+
+
+def _stat_entry(folder, name):
+    """Return the scan_folder() entry for one finished file, or None if it is not there."""
+    try:
+        st = os.stat(os.path.join(folder, name))
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return {"name": name, "size": st.st_size, "mtime": st.st_mtime}
+
+
+def _parse_events(data):
+    """Yield (mask, name) for each inotify_event in a buffer read from the inotify fd."""
+    offset = 0
+    while offset + _EVENT_HEADER.size <= len(data):
+        _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+        offset += _EVENT_HEADER.size
+        name = data[offset:offset + length].split(b"\0", 1)[0]
+        offset += length
+        yield mask, os.fsdecode(name)
+
+
+def iter_folder(folder, chunk_size=SCAN_CHUNK_SIZE):
+    """Yield the finished files in folder in lists of up to chunk_size entries.
+
+    Entries are {"name", "size", "mtime"} and come out as os.scandir finds
+    them, so a caller can show the first ones before a large folder is fully
+    listed. An unreadable or missing folder yields nothing.
+    """
+    chunk = []
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if is_partial(entry.name):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                chunk.append({"name": entry.name, "size": st.st_size, "mtime": st.st_mtime})
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+    except OSError:
+        pass
+    if chunk:
+        yield chunk
+
+
+def scan_folder(folder):
+    """List the finished files in folder with one os.scandir pass.
+
+    Returns {name: {"name", "size", "mtime"}}; an unreadable or missing
+    folder gives an empty dict.
+    """
+    return {entry["name"]: entry for chunk in iter_folder(folder) for entry in chunk}
+
+
+def diff_snapshots(old, new):
+    """Return (added, removed, changed) between two scan_folder() results.
+
+    added and changed map names to their new entries; removed is a set of names.
+    """
+    added = {name: entry for name, entry in new.items() if name not in old}
+    removed = {name for name in old if name not in new}
+    changed = {name: entry for name, entry in new.items() if name in old and old[name] != entry}
+    return added, removed, changed
+
+
+def _load_inotify():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FolderWatcher:
+    """Reports files appearing in, leaving or changing in one folder.
+
+    A daemon thread waits for inotify events on Linux and otherwise polls the
+    folder's mtime every POLL_INTERVAL seconds. With inotify only the files
+    named in the events are looked at again, and events for yt-dlp's partial
+    files are ignored, so a running download does not cause any work; the
+    folder is only listed again if the event queue overflowed. When polling,
+    a change of the folder's mtime lists it again. Either way
+    on_change(added, removed, changed) is called from that thread with the
+    difference (see diff_snapshots). The caller is responsible for moving the
+    update onto the UI thread.
+    """
+
+    def __init__(self, folder, on_change, snapshot=None, poll_interval=POLL_INTERVAL, use_inotify=True):
+        self.folder = folder
+        self._on_change = on_change
+        self._snapshot = snapshot if snapshot is not None else scan_folder(folder)
+        self._poll_interval = poll_interval
+        self._use_inotify = use_inotify
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"watch-{os.path.basename(self.folder)}", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def rescan(self):
+        """List the folder now and report any difference to the last listing."""
+        snapshot = scan_folder(self.folder)
+        added, removed, changed = diff_snapshots(self._snapshot, snapshot)
+        self._snapshot = snapshot
+        self._report(added, removed, changed)
+
+    def update(self, names):
+        """Look at only the named files again and report how they differ from the last listing."""
+        added, removed, changed = {}, set(), {}
+        for name in names:
+            entry = _stat_entry(self.folder, name)
+            old = self._snapshot.get(name)
+            if entry is None:
+                if old is not None:
+                    removed.add(name)
+                    del self._snapshot[name]
+                continue
+            if old is None:
+                added[name] = entry
+            elif old != entry:
+                changed[name] = entry
+            self._snapshot[name] = entry
+        self._report(added, removed, changed)
+
+    def _report(self, added, removed, changed):
+        if added or removed or changed:
+            try:
+                self._on_change(added, removed, changed)
+            except Exception as e:
+                logging.error(f"Folder watcher callback failed for {self.folder}: {e}")
+
+    def _run(self):
+        libc = _load_inotify() if self._use_inotify else None
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC) if libc else -1
+        if fd >= 0 and libc.inotify_add_watch(fd, os.fsencode(self.folder), _WATCH_MASK) >= 0:
+            try:
+                self._run_inotify(fd)
+            finally:
+                os.close(fd)
+            return
+        if fd >= 0:
+            os.close(fd)
+        self._run_polling()
+
+    def _drain(self, fd):
+        """Read every queued event; returns (names of finished files touched, whether to rescan)."""
+        names = set()
+        rescan = False
+        try:
+            while True:
+                data = os.read(fd, 65536)
+                if not data:
+                    break
+                for mask, name in _parse_events(data):
+                    if mask & _RESCAN_MASK:
+                        rescan = True
+                    elif name and not is_partial(name):
+                        names.add(name)
+        except BlockingIOError:
+            pass
+        return names, rescan
+
+    def _run_inotify(self, fd):
+        while not self._stop.is_set():
+            # Wake up now and then to notice stop()
+            ready, _, _ = select.select([fd], [], [], 0.5)
+            if not ready:
+                continue
+            names, rescan = self._drain(fd)
+            if not (names or rescan):
+                continue  # Only partial files changed
+            self._stop.wait(SETTLE_DELAY)
+            more_names, more_rescan = self._drain(fd)
+            if rescan or more_rescan:
+                self.rescan()
+            else:
+                self.update(names | more_names)
+
+    def _run_polling(self):
+        last_mtime = self._folder_mtime()
+        while not self._stop.wait(self._poll_interval):
+            mtime = self._folder_mtime()
+            if mtime != last_mtime:
+                last_mtime = mtime
+                self.rescan()
+
+    def _folder_mtime(self):
+        try:
+            return os.stat(self.folder).st_mtime_ns
+        except OSError:
+            return None
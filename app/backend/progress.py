@@ -0,0 +1,68 @@
+import threading
+
+
+class AggregateProgress:
+    """Combines the yt-dlp progress events of all streams of one download.
+
+    A merged format (e.g. bestvideo+bestaudio) is fetched as separate streams.
+    The wrapped hook receives yt-dlp style dicts whose downloaded_bytes and
+    total_bytes are summed over every stream, and whose status only becomes
+    "finished" once all expected streams are done.
+    """
+
+    def __init__(self, hook):
+        self._hook = hook
+        self._lock = threading.Lock()
+        self._streams = {}
+        self._expected = 1
+
+    def expect(self, formats):
+        """Announce the formats about to be downloaded, with their sizes if known."""
+        with self._lock:
+            self._streams = {}
+            self._expected = max(1, len(formats))
+            for f in formats:
+                self._streams[f.get("format_id")] = {
+                    "downloaded": 0,
+                    "total": f.get("filesize") or f.get("filesize_approx"),
+                    "speed": 0,
+                    "finished": False,
+                }
+
+    def __call__(self, d):
+        if d.get("status") not in ("downloading", "finished"):
+            self._hook(d)
+            return
+
+        key = (d.get("info_dict") or {}).get("format_id") or d.get("filename")
+        with self._lock:
+            stream = self._streams.setdefault(key, {"downloaded": 0, "total": None, "speed": 0, "finished": False})
+            total = d.get("total_bytes") or d.get("total_bytes_estimate")
+            if total:
+                stream["total"] = total
+            if d.get("downloaded_bytes") is not None:
+                stream["downloaded"] = d["downloaded_bytes"]
+            if d["status"] == "finished":
+                stream["finished"] = True
+                stream["speed"] = 0
+                stream["total"] = stream["downloaded"] = stream["total"] or stream["downloaded"]
+            else:
+                stream["speed"] = d.get("speed") or 0
+
+            streams = list(self._streams.values())
+            done = sum(1 for s in streams if s["finished"]) >= self._expected
+            downloaded = sum(s["downloaded"] for s in streams)
+            total = sum(s["total"] or s["downloaded"] for s in streams)
+            speed = sum(s["speed"] for s in streams)
+
+        event = dict(d)
+        event.pop("total_bytes_estimate", None)
+        event.update(
+            status="finished" if done else "downloading",
+            downloaded_bytes=downloaded,
+            total_bytes=total or None,
+            speed=speed or None,
+            eta=int((total - downloaded) / speed) if speed and total > downloaded else None,
+            stream_count=self._expected,
+        )
+        self._hook(event)
@@ -0,0 +1,166 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from app.backend.config import CONFIG_DIR, get_settings_store, init_app_dirs
+from app.backend.download_archive import archived_video_ids
+
+PROTECTED_VIDEOS_FILE = os.path.join(CONFIG_DIR, "protected_videos.json")
+
+_lock = threading.Lock()
+# (file mtime, {folder: {"files": {filename: entry}, "ids": {video_id: filename}}}); rebuilt when the file changes
+_loaded = None
+
+
+def _folder_key(video_folder):
+    # Videos are grouped by channel folder name, as they were in settings.json
+    return os.path.basename(os.path.normpath(video_folder))
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _build_index(data):
+    index = {}
+    for folder, files in data.items():
+        if not isinstance(files, dict):
+            continue
+        index[folder] = {
+            "files": dict(files),
+            "ids": {entry["video_id"]: name for name, entry in files.items() if entry.get("video_id")},
+        }
+    return index
+
+
+def _migrate_from_settings():
+    """Move the "protected_videos" lists out of settings.json. Callers must hold _lock."""
+    store = get_settings_store()
+    settings = store.get()
+    legacy = settings.get("protected_videos") or {}
+    data = {
+        folder: {name: {"video_id": None, "protected_at": None} for name in names}
+        for folder, names in legacy.items() if isinstance(names, list)
+    }
+    index = _build_index(data)
+    _save(index)
+    if "protected_videos" in settings:
+        del settings["protected_videos"]
+        store.save(settings)
+        logging.info(f"Moved protected videos from settings.json to {PROTECTED_VIDEOS_FILE}")
+    return index
+
+
+def _load():
+    """Return the index, re-reading the file only if it changed. Callers must hold _lock.
+
+    The file is {channel_folder: {filename: {"video_id": ..., "protected_at": ...}}}.
+    """
+    global _loaded
+    mtime = _mtime(PROTECTED_VIDEOS_FILE)
+    if _loaded and _loaded[0] == mtime:
+        return _loaded[1]
+    if mtime is None:
+        return _migrate_from_settings()
+
+    try:
+        with open(PROTECTED_VIDEOS_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logging.warning(f"Could not read {PROTECTED_VIDEOS_FILE}: {e}")
+        data = {}
+    index = _build_index(data if isinstance(data, dict) else {})
+    _loaded = (mtime, index)
+    return index
+
+
+def _save(index):
+    """Write the index atomically. Callers must hold _lock."""
+    global _loaded
+    data = {folder: entry["files"] for folder, entry in index.items() if entry["files"]}
+    try:
+        init_app_dirs()
+        os.makedirs(os.path.dirname(PROTECTED_VIDEOS_FILE), exist_ok=True)
+        temp_path = f"{PROTECTED_VIDEOS_FILE}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, PROTECTED_VIDEOS_FILE)
+    except OSError as e:
+        logging.warning(f"Could not save protected videos: {e}")
+    _loaded = (_mtime(PROTECTED_VIDEOS_FILE), index)
+
+
+def _protected_name(entry, video_folder, filename, video_id=None):
+    """Return the name filename is protected under in entry, or None. Callers must hold _lock.
+
+    Without a video_id, the download archive tells which video the file is,
+    so a protected file that was renamed is still recognised.
+    """
+    if filename in entry["files"]:
+        return filename
+    if not entry["ids"]:
+        return None
+    if video_id is None:
+        video_id = archived_video_ids(video_folder).get(filename)
+    return entry["ids"].get(video_id)
+
+
+def is_protected(video_folder, filename=None, video_id=None):
+    """Return True if the file name or the video ID is protected in video_folder."""
+    with _lock:
+        entry = _load().get(_folder_key(video_folder))
+        return bool(entry) and _protected_name(entry, video_folder, filename, video_id) is not None
+
+
+def protected_files(video_folder):
+    """Return the set of protected file names in video_folder, renamed ones included."""
+    with _lock:
+        entry = _load().get(_folder_key(video_folder))
+        if not entry:
+            return frozenset()
+        names = set(entry["files"])
+        if entry["ids"]:
+            names.update(name for name, video_id in archived_video_ids(video_folder).items() if video_id in entry["ids"])
+        return frozenset(names)
+
+
+def all_protected():
+    """Return {channel_folder: [filename, ...]} for every protected video."""
+    with _lock:
+        return {folder: sorted(entry["files"]) for folder, entry in _load().items() if entry["files"]}
+
+
+def protect_video(video_folder, filename, video_id=None):
+    with _lock:
+        index = _load()
+        entry = index.setdefault(_folder_key(video_folder), {"files": {}, "ids": {}})
+        current = entry["files"].get(filename)
+        if current and (video_id is None or current.get("video_id") == video_id):
+            return
+        entry["files"][filename] = {"video_id": video_id, "protected_at": time.time()}
+        if video_id:
+            entry["ids"][video_id] = filename
+        _save(index)
+
+
+def unprotect_video(video_folder, filename, video_id=None):
+    """Drop the protection of a file, e.g. after the user deleted it.
+
+    Pass the video_id when the file is already gone from video_folder, since
+    the archive can then no longer match a renamed file to its video.
+    """
+    with _lock:
+        index = _load()
+        entry = index.get(_folder_key(video_folder))
+        filename = _protected_name(entry, video_folder, filename, video_id) if entry else None
+        if filename is None:
+            return
+        video_id = entry["files"].pop(filename).get("video_id")
+        if video_id and entry["ids"].get(video_id) == filename:
+            del entry["ids"][video_id]
+        _save(index)
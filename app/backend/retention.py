@@ -0,0 +1,156 @@
+import logging
+import os
+import threading
+import time
+
+from app.backend.protected_videos import protected_files
+
+# Finished downloads; partial files (.part, .ytdl) are never touched
+MEDIA_EXTENSIONS = (".mp4", ".mkv", ".webm", ".mp3", ".m4a", ".opus")
+
+_SECONDS_PER_WEEK = 7 * 24 * 3600
+
+_scan_lock = threading.Lock()
+# folder -> (folder mtime, [media file dicts]); a folder is only re-listed when its mtime changes
+_scans = {}
+
+
+def policy_for(settings, video_folder):
+    """Return the retention policy for a channel folder.
+
+    "retention_policies" in settings.json maps a channel folder name (or
+    "default") to {"keep_last": N, "max_size_gb": X, "max_age_weeks": W};
+    the channel's entry is layered over "default" and any limit may be left
+    out. Without either entry, "keep_old_videos" decides as before: off keeps
+    only the newest video, on keeps everything.
+    """
+    policies = settings.get("retention_policies") or {}
+    policy = dict(policies.get("default") or {})
+    policy.update(policies.get(os.path.basename(os.path.normpath(video_folder))) or {})
+    if not policy and not settings.get("keep_old_videos", False):
+        policy = {"keep_last": 1}
+    return policy
+
+
+def scan_media(video_folder):
+    """List the media files in video_folder with one os.scandir pass.
+
+    Each file is {"name", "size", "time"}, newest first; "time" is the later
+    of mtime and ctime, because yt-dlp may set mtime to the upload date.
+    """
+    try:
+        folder_mtime = os.stat(video_folder).st_mtime_ns
+    except OSError:
+        return []
+    with _scan_lock:
+        cached = _scans.get(video_folder)
+        if cached and cached[0] == folder_mtime:
+            return list(cached[1])
+
+    files = []
+    try:
+        with os.scandir(video_folder) as entries:
+            for entry in entries:
+                if not entry.name.lower().endswith(MEDIA_EXTENSIONS):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                files.append({"name": entry.name, "size": st.st_size, "time": max(st.st_mtime, st.st_ctime)})
+    except OSError as e:
+        logging.warning(f"Could not list {video_folder}: {e}")
+        return []
+    files.sort(key=lambda f: f["time"], reverse=True)
+
+    with _scan_lock:
+        _scans[video_folder] = (folder_mtime, files)
+    return list(files)
+
+
+def plan_retention(files, policy, protected=frozenset(), now=None):
+    """Decide which files a policy removes; returns [(file, reason)], oldest first.
+
+    `files` must be newest first (as scan_media returns them). Protected files
+    are never removed but count towards the size limit. The newest file is
+    always kept, so a fresh download is never removed by its own cleanup.
+    """
+    now = now or time.time()
+    keep_last = policy.get("keep_last")
+    max_age_weeks = policy.get("max_age_weeks")
+    max_size_gb = policy.get("max_size_gb")
+    max_bytes = float(max_size_gb) * 1024 ** 3 if max_size_gb else None
+
+    remove = []
+    kept_count = 0
+    kept_bytes = 0
+    for position, file in enumerate(files):
+        reason = None
+        if position > 0 and file["name"] not in protected:
+            if keep_last is not None and kept_count >= int(keep_last):
+                reason = f"more than {keep_last} newer videos"
+            elif max_age_weeks and now - file["time"] > float(max_age_weeks) * _SECONDS_PER_WEEK:
+                reason = f"older than {max_age_weeks} weeks"
+            elif max_bytes is not None and kept_bytes + file["size"] > max_bytes:
+                reason = f"folder over {max_size_gb} GB"
+        if reason:
+            remove.append((file, reason))
+        else:
+            if file["name"] not in protected:
+                kept_count += 1
+            kept_bytes += file["size"]
+    remove.reverse()
+    return remove
+
+
+def retention_report(video_folder, settings, now=None):
+    """Work out what apply_retention() would remove, without deleting anything.
+
+    Returns {"folder", "policy", "files", "total_bytes", "remove": [{"name",
+    "size", "reason"}], "freed_bytes"}.
+    """
+    policy = policy_for(settings, video_folder)
+    files = scan_media(video_folder)
+    remove = plan_retention(files, policy, protected_files(video_folder), now) if policy else []
+    return {
+        "folder": video_folder,
+        "policy": policy,
+        "files": len(files),
+        "total_bytes": sum(f["size"] for f in files),
+        "remove": [{"name": f["name"], "size": f["size"], "reason": reason} for f, reason in remove],
+        "freed_bytes": sum(f["size"] for f, _ in remove),
+    }
+
+
+def apply_retention(video_folder, settings, dry_run=False, now=None):
+    """Remove the files in video_folder that its retention policy no longer keeps.
+
+    Meant to run after each download into the folder. Returns the report of
+    retention_report(); with dry_run=True nothing is deleted.
+    """
+    report = retention_report(video_folder, settings, now)
+    if dry_run:
+        return report
+    for item in report["remove"]:
+        try:
+            os.remove(os.path.join(video_folder, item["name"]))
+            logging.info(f"Deleted old video: {item['name']} ({item['reason']})")
+        except OSError as e:
+            logging.warning(f"Could not delete {item['name']}: {e}")
+    return report
+
+
+def format_report(reports):
+    """Render retention reports as text for the Settings window."""
+    lines = []
+    for report in reports:
+        name = os.path.basename(os.path.normpath(report["folder"]))
+        if not report["remove"]:
+            lines.append(f"{name}: nothing to remove ({report['files']} files)")
+            continue
+        lines.append(f"{name}: remove {len(report['remove'])} of {report['files']} files, "
+                     f"freeing {report['freed_bytes'] / 1024 ** 2:.0f} MB")
+        lines.extend(f"  - {item['name']} ({item['reason']})" for item in report["remove"])
+    return "\n".join(lines)
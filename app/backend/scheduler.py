@@ -0,0 +1,238 @@
+import itertools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+DEFAULT_MAX_LOOKUPS = 8
+DEFAULT_MAX_DOWNLOADS = 2
+
+# Lower numbers run first: a click in the window goes ahead of queued background work
+PRIORITY_MANUAL = 0
+PRIORITY_BACKGROUND = 10
+
+# Seconds an idle worker waits for new work before exiting
+WORKER_IDLE_TIMEOUT = 30
+
+_current = threading.local()
+
+
+class ScheduledTask:
+    """One unit of work queued in the scheduler."""
+
+    def __init__(self, task_id, stage, key, label, priority, on_cancel=None):
+        self.id = task_id
+        self.stage = stage
+        self.key = key
+        self.label = label or key
+        self.priority = priority
+        self.on_cancel = on_cancel
+        self.state = "queued"
+        self.submitted_at = time.time()
+        self.future = Future()
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancel_requested(self):
+        return self._cancel_event.is_set()
+
+    def as_dict(self):
+        return {
+            "id": self.id,
+            "stage": self.stage,
+            "key": self.key,
+            "label": self.label,
+            "priority": self.priority,
+            "state": self.state,
+            "submitted_at": self.submitted_at,
+        }
+
+
+def current_task():
+    """Return the ScheduledTask running on this thread, or None outside the scheduler."""
+    return getattr(_current, "task", None)
+
+
+class _Stage:
+    """Daemon worker threads pulling tasks from a priority queue.
+
+    Daemon threads are used (unlike ThreadPoolExecutor) so that a running
+    download never keeps the process alive after the user quits the app.
+    Workers are started on demand up to the stage's limit and exit when idle.
+    """
+
+    def __init__(self, max_workers, name):
+        self._max_workers = max(1, int(max_workers))
+        self._name = name
+        self._queue = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._workers = 0
+        self._idle = 0
+
+    def set_limit(self, max_workers):
+        with self._lock:
+            self._max_workers = max(1, int(max_workers))
+            self._spawn_if_needed()
+
+    def submit(self, task, fn, args, kwargs):
+        with self._lock:
+            # The counter keeps equal priorities in submission order
+            self._queue.put((task.priority, next(self._order), task, fn, args, kwargs))
+            self._spawn_if_needed()
+
+    def _spawn_if_needed(self):
+        # Callers must hold self._lock
+        while self._workers < self._max_workers and self._idle < self._queue.qsize():
+            self._workers += 1
+            threading.Thread(
+                target=self._worker,
+                name=f"{self._name}-{self._workers}",
+                daemon=True
+            ).start()
+            self._idle += 1
+
+    def _worker(self):
+        while True:
+            try:
+                _, _, task, fn, args, kwargs = self._queue.get(timeout=WORKER_IDLE_TIMEOUT)
+            except queue.Empty:
+                with self._lock:
+                    if self._queue.empty():
+                        self._idle -= 1
+                        self._workers -= 1
+                        return
+                continue
+
+            with self._lock:
+                self._idle -= 1
+            self._run(task, fn, args, kwargs)
+            with self._lock:
+                # Shrink after set_limit() lowered the limit
+                if self._workers > self._max_workers:
+                    self._workers -= 1
+                    return
+                self._idle += 1
+
+    @staticmethod
+    def _run(task, fn, args, kwargs):
+        if not task.future.set_running_or_notify_cancel():
+            return
+        task.state = "running"
+        _current.task = task
+        try:
+            task.future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            task.future.set_exception(e)
+        finally:
+            _current.task = None
+
+
+class DownloadScheduler:
+    """The one queue every download in the app goes through.
+
+    Work is split in two stages so channel lookups (metadata fetches) never
+    wait behind media transfers: resolve() for lookups and download() for
+    transfers, each with its own worker limit. The download limit is global,
+    shared by the window, the tray and the automatic checks.
+
+    Tasks with a key are deduplicated per stage: submitting a key that is
+    already queued or running returns the existing Future. Tasks run in
+    priority order (PRIORITY_MANUAL before PRIORITY_BACKGROUND) and can be
+    cancelled by key; a running task sees cancel_requested on its
+    ScheduledTask (see current_task()) and is expected to stop. A queued task
+    that is cancelled never runs, so on_cancel() is called instead, on the
+    cancelling thread, to release whatever was handed to it (e.g. a session).
+    """
+
+    def __init__(self, max_downloads=DEFAULT_MAX_DOWNLOADS, max_lookups=DEFAULT_MAX_LOOKUPS):
+        self._stages = {
+            "resolve": _Stage(max_lookups, "lookup"),
+            "download": _Stage(max_downloads, "download"),
+        }
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        # (stage, key) -> task, for tasks that are queued or running
+        self._tasks = {}
+
+    def resolve(self, fn, *args, key=None, label=None, priority=PRIORITY_MANUAL, on_cancel=None, **kwargs):
+        """Run a lookup (e.g. find_video_url) in the resolver stage."""
+        return self._submit("resolve", fn, args, kwargs, key, label, priority, on_cancel)
+
+    def download(self, fn, *args, key=None, label=None, priority=PRIORITY_MANUAL, on_cancel=None, **kwargs):
+        """Queue a transfer (e.g. download_video) in the download stage."""
+        return self._submit("download", fn, args, kwargs, key, label, priority, on_cancel)
+
+    def set_max_downloads(self, max_downloads):
+        self._stages["download"].set_limit(max_downloads)
+
+    def _submit(self, stage, fn, args, kwargs, key, label, priority, on_cancel):
+        with self._lock:
+            task_key = (stage, key if key is not None else object())
+            existing = self._tasks.get(task_key)
+            if existing:
+                logging.info(f"'{existing.label}' is already {existing.state}; not queued again.")
+                return existing.future
+            task = ScheduledTask(next(self._ids), stage, key, label, priority, on_cancel)
+            self._tasks[task_key] = task
+        task.future.add_done_callback(lambda future: self._finished(task_key, task))
+        self._stages[stage].submit(task, fn, args, kwargs)
+        return task.future
+
+    def _finished(self, task_key, task):
+        future = task.future
+        if future.cancelled():
+            task.state = "cancelled"
+            if task.on_cancel:
+                try:
+                    task.on_cancel()
+                except Exception as e:
+                    logging.error(f"Cleanup of cancelled task '{task.label}' failed: {e}")
+        elif future.exception() is not None:
+            task.state = "failed"
+            logging.error(f"Scheduled task '{task.label}' failed: {future.exception()}")
+        else:
+            task.state = "done"
+        with self._lock:
+            if self._tasks.get(task_key) is task:
+                del self._tasks[task_key]
+
+    def is_active(self, key):
+        """Return True while any task for `key` is queued or running, in either stage."""
+        with self._lock:
+            return any(task.key == key for task in self._tasks.values())
+
+    def cancel(self, key):
+        """Cancel every task for `key`. Returns True if there was one.
+
+        Queued tasks are dropped. Running tasks are asked to stop; download
+        sessions check this from their progress hook.
+        """
+        with self._lock:
+            tasks = [task for task in self._tasks.values() if task.key == key]
+        for task in tasks:
+            task._cancel_event.set()
+            task.future.cancel()
+        return bool(tasks)
+
+    def status(self):
+        """Return a dict per queued or running task, in the order they will run."""
+        with self._lock:
+            tasks = list(self._tasks.values())
+        order = {"running": 0, "queued": 1}
+        tasks.sort(key=lambda task: (order.get(task.state, 2), task.priority, task.id))
+        return [task.as_dict() for task in tasks]
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Return the process-wide DownloadScheduler, creating it on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = DownloadScheduler()
+        return _scheduler
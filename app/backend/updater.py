@@ -1,6 +1,5 @@
 import os
 import platform
-import requests
 import logging
 from app.backend.config import __version__
 
@@ -40,6 +39,8 @@ def check_for_updates():
     Returns: (is_new, latest_version, release_page_url, assets)
     - assets is the list of release asset dicts (empty list on error)
     """
+    import requests  # deferred to keep it out of app startup
+
     try:
         response = requests.get(GITHUB_REPO_URL, timeout=5)
         response.raise_for_status()
@@ -75,6 +76,8 @@ def download_update(asset_url, dest_path, progress_callback=None):
 
     Raises: Exception on failure
     """
+    import requests
+
     os.makedirs(os.path.dirname(dest_path), exist_ok=True)
 
     response = requests.get(asset_url, stream=True, timeout=30)
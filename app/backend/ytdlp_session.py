@@ -0,0 +1,176 @@
+import contextlib
+import os
+import threading
+
+
+class YtdlpSession:
+    """A yt_dlp.YoutubeDL kept open across the steps of one channel run.
+
+    The channel lookup, the download and the post-download metadata all go
+    through the same instance, so extractor state, cookies and pooled HTTP
+    connections survive between steps instead of being rebuilt for each call.
+    The instance is created on first use. A session is used by one stage at a
+    time (lookup, then download) and is not meant to be shared between threads.
+
+    Download sessions (options with "progress_hooks") stop the transfer from
+    their progress hook once `task.cancel_requested` is set, and pass every
+    event to `throttle` (see bandwidth.BackgroundTransfer) when one is set.
+    """
+
+    def __init__(self, ydl_opts, progress=None):
+        self._ydl_opts = ydl_opts
+        self._stack = None
+        self.ydl = None
+        # The AggregateProgress registered as the session's progress hook, if any
+        self.progress = progress
+        # The scheduler task currently downloading through this session, if any
+        self.task = None
+        self.throttle = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def open(self):
+        """Return the session's YoutubeDL, creating it on first use."""
+        if self.ydl is None:
+            # Imported on first use: the extractor registry is slow to load and not
+            # needed until the first lookup (see scripts/import_time_report.py)
+            import yt_dlp
+            opts = self._ydl_opts
+            if "progress_hooks" in opts:
+                opts = dict(opts, progress_hooks=[*opts["progress_hooks"], self._on_progress])
+            self._stack = contextlib.ExitStack()
+            self.ydl = self._stack.enter_context(yt_dlp.YoutubeDL(opts))
+        return self.ydl
+
+    def _on_progress(self, d):
+        # Raising from a progress hook is how yt-dlp lets a caller abort a transfer
+        if self.task is not None and self.task.cancel_requested:
+            import yt_dlp
+            raise yt_dlp.utils.DownloadCancelled("Download cancelled")
+        if self.throttle is not None:
+            self.throttle(d)
+
+    def close(self):
+        if self._stack is not None:
+            stack, self._stack, self.ydl = self._stack, None, None
+            stack.close()
+
+    @contextlib.contextmanager
+    def overrides(self, **params):
+        """Temporarily change options yt-dlp reads on every call (e.g. quiet, extract_flat)."""
+        ydl = self.open()
+        saved = {key: ydl.params[key] for key in params if key in ydl.params}
+        ydl.params.update(params)
+        try:
+            yield ydl
+        finally:
+            for key in params:
+                if key in saved:
+                    ydl.params[key] = saved[key]
+                else:
+                    ydl.params.pop(key, None)
+
+
+class ParallelStreams:
+    """Fetch the streams of a merged format (video + audio) at the same time.
+
+    yt-dlp downloads each requested format in turn through YoutubeDL.dl() and
+    then merges them in post_process(). While this context is active, those
+    per-stream dl() calls start a thread and return at once, and post_process()
+    waits for every stream before the merge runs. The overrides are set on the
+    instance only and removed on exit.
+
+    The first stream to fail stops the others through a progress hook, and
+    its error is raised from post_process(): a DownloadCancelled as itself,
+    anything else as a DownloadError.
+    """
+
+    _OVERRIDDEN = ("dl", "post_process", "process_info")
+
+    def __init__(self, ydl, progress=None):
+        self._ydl = ydl
+        self._progress = progress
+        self._threads = []
+        self._lock = threading.Lock()
+        self._failed = threading.Event()
+        self._error = None
+
+    def __enter__(self):
+        ydl = self._ydl
+        self._saved = {name: vars(ydl)[name] for name in self._OVERRIDDEN if name in vars(ydl)}
+        self._dl, self._post_process, self._process_info = ydl.dl, ydl.post_process, ydl.process_info
+        ydl.dl = self._start_stream
+        ydl.post_process = self._join_then_post_process
+        ydl.process_info = self._announce_formats
+        # Copied into each stream's downloader by dl(), so it must be in place before the first one
+        ydl.add_progress_hook(self._stop_if_failed)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._failed.set()  # Don't leave streams running if the download was abandoned
+        self._join()
+        # YoutubeDL has no public way to remove a progress hook
+        if self._stop_if_failed in self._ydl._progress_hooks:
+            self._ydl._progress_hooks.remove(self._stop_if_failed)
+        for name in self._OVERRIDDEN:
+            if name in self._saved:
+                setattr(self._ydl, name, self._saved[name])
+            else:
+                vars(self._ydl).pop(name, None)
+
+    def _announce_formats(self, info_dict, *args, **kwargs):
+        if self._progress is not None:
+            self._progress.expect(info_dict.get("requested_formats") or [info_dict])
+        return self._process_info(info_dict, *args, **kwargs)
+
+    def _stop_if_failed(self, d):
+        if self._failed.is_set():
+            import yt_dlp
+            raise yt_dlp.utils.DownloadCancelled("Stopped because another stream failed")
+
+    def _fail(self, error):
+        # Only the first failure counts; the other streams' errors are caused by stopping them
+        with self._lock:
+            if not self._failed.is_set():
+                self._error = error
+                self._failed.set()
+
+    def _start_stream(self, name, info, subtitle=False, test=False):
+        # Only the per-format pieces of a merge are named "<title>.f<format_id>.<ext>"
+        if subtitle or test or f".f{info.get('format_id')}." not in os.path.basename(name):
+            return self._dl(name, info, subtitle=subtitle, test=test)
+        if self._failed.is_set():
+            return True, True  # Not fetched; post_process() raises the first stream's error
+
+        def run():
+            try:
+                success, _ = self._dl(name, info)
+                if not success:
+                    self._fail(f"Stream {info.get('format_id')} did not finish")
+            except Exception as e:
+                self._fail(e)
+
+        thread = threading.Thread(target=run, name=f"stream-{info.get('format_id')}", daemon=True)
+        self._threads.append(thread)
+        thread.start()
+        return True, True
+
+    def _join(self):
+        threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join()
+
+    def _join_then_post_process(self, *args, **kwargs):
+        self._join()
+        if self._failed.is_set():
+            import yt_dlp
+            error = self._error
+            if isinstance(error, yt_dlp.utils.DownloadCancelled):
+                raise error
+            raise yt_dlp.utils.DownloadError(str(error))
+        return self._post_process(*args, **kwargs)
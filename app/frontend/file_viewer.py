@@ -1,10 +1,41 @@
 import os
 import sys
+import queue
+import threading
 import tkinter as tk
+from datetime import datetime
 from tkinter import ttk, messagebox
 from app.backend.config import save_settings
+from app.backend.download_archive import archived_durations, archived_video_ids
+from app.backend.folder_watcher import FolderWatcher, iter_folder, scan_folder, diff_snapshots
+from app.backend.protected_videos import is_protected, protected_files, unprotect_video
 from app.frontend.player_utils import play_video
 
+# Milliseconds between checks for changes reported by the folder watcher
+WATCH_REFRESH_MS = 250
+
+# Pixel heights of a row (the Treeview rowheight below) and of the heading, used to work out how many rows fit
+ROW_HEIGHT = 25
+HEADING_HEIGHT = 25
+
+# Rows scrolled per mouse wheel notch
+WHEEL_ROWS = 3
+
+
+def _format_size(nbytes):
+    if nbytes >= 1024 ** 3:
+        return f"{nbytes / 1024 ** 3:.1f} GB"
+    return f"{nbytes / 1024 ** 2:.0f} MB"
+
+
+def _format_duration(seconds):
+    if not seconds:
+        return ""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
 class FileViewer(tk.Toplevel):
     def __init__(self, parent, settings, channel_name, channel_folder, on_close_callback):
         super().__init__(parent)
@@ -21,6 +52,20 @@ class FileViewer(tk.Toplevel):
         self.configure(bg="#2b2b2b")
         self.channel_folder = channel_folder
         self.selected_file_path = None
+        # The tree only holds as many items ("slots") as fit in the window; the
+        # listing lives in rows/order and the slots are refilled as it scrolls
+        self.rows = {}  # filename -> folder_watcher entry
+        self.order = []  # filenames, newest first
+        self._order_stale = False
+        self.top = 0  # index in order of the first visible row
+        self._slots = []  # tree item ids, top to bottom
+        self._slot_names = {}  # slot -> filename shown in it
+        self._name_slots = {}  # filename -> slot, for the visible rows only
+        self.durations = {}
+        self.watcher = None
+        self._changes = queue.Queue()
+        self._poll_id = None
+        self._closed = threading.Event()
 
         style = ttk.Style(self)
         style.theme_use("default")
@@ -29,21 +74,39 @@ class FileViewer(tk.Toplevel):
         style.configure("Treeview.Heading", background="#2b2b2b", foreground="white", font=('Segoe UI', 10, 'bold'))
         style.configure("Dark.TFrame", background="#2b2b2b")
 
-        self.file_tree = ttk.Treeview(self, columns=("name", "selected"), show="headings", selectmode="browse")
+        list_frame = ttk.Frame(self, style="Dark.TFrame")
+        list_frame.pack(pady=10, padx=10, fill="both", expand=True)
+
+        self.file_tree = ttk.Treeview(list_frame, columns=("name", "size", "duration", "date", "selected"), show="headings", selectmode="browse")
         self.file_tree.heading("name", text="File Name")
+        self.file_tree.heading("size", text="Size")
+        self.file_tree.heading("duration", text="Length")
+        self.file_tree.heading("date", text="Date")
         self.file_tree.heading("selected", text="✓")
         
         # Configure columns
         self.file_tree.column("name", stretch=True)
+        self.file_tree.column("size", width=65, anchor="e", stretch=False)
+        self.file_tree.column("duration", width=60, anchor="e", stretch=False)
+        self.file_tree.column("date", width=75, anchor="center", stretch=False)
         self.file_tree.column("selected", width=30, anchor="center", stretch=False)
         
         # Disable column resizing by unbinding the resize events
         self.file_tree.bind("<Button-1>", self._disable_column_resize)
         self.file_tree.bind("<B1-Motion>", self._disable_column_resize)
         
-        self.file_tree.pack(pady=10, padx=10, fill="both", expand=True)
+        self.scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.file_tree.pack(side="left", fill="both", expand=True)
         self.file_tree.bind("<<TreeviewSelect>>", self.on_file_select)
-        self.populate_files()
+        self.file_tree.bind("<Configure>", lambda event: self._render())
+        # The tree never holds more rows than it shows, so scrolling is done here rather than by the tree
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.file_tree.bind(sequence, self._on_mouse_wheel)
+        for sequence in ("<Up>", "<Down>", "<Prior>", "<Next>", "<Home>", "<End>"):
+            self.file_tree.bind(sequence, self._on_key)
+        self.load_files()
+        self._poll_changes()
 
         # --- Button Frame ---
         button_frame = ttk.Frame(self)
@@ -77,35 +140,174 @@ class FileViewer(tk.Toplevel):
             self.geometry("362x329+1223+406") # Default size and position for file viewer
 
     def on_closing(self):
+        self._closed.set()
+        if self.watcher:
+            self.watcher.stop()
+        if self._poll_id:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
         self.settings[self.geometry_key] = self.geometry()
-        save_settings(self.settings)
+        save_settings(self.settings, defer=True)
         if self.on_close_callback:
             self.on_close_callback(self.channel_folder)
         self.destroy()
 
+    def load_files(self):
+        """List the folder on a background thread; rows show up chunk by chunk, then the folder is watched."""
+        threading.Thread(target=self._load_files_worker, name=f"list-{self.channel_name}", daemon=True).start()
+
+    def _load_files_worker(self):
+        snapshot = {}
+        for chunk in iter_folder(self.channel_folder):
+            if self._closed.is_set():
+                return
+            added = {entry["name"]: entry for entry in chunk}
+            snapshot.update(added)
+            self._changes.put((added, set(), {}))
+
+        # Files finished by a download (or removed elsewhere) show up while the window is open
+        watcher = FolderWatcher(self.channel_folder, self._queue_changes, snapshot=snapshot)
+        watcher.rescan()  # Anything that changed while the folder was being listed
+        watcher.start()
+        self.watcher = watcher
+        if self._closed.is_set():
+            watcher.stop()
+
     def populate_files(self):
+        """List the folder now and bring the view in line with it, e.g. after deleting files."""
         if not os.path.exists(self.channel_folder):
             return
+        if self._apply_changes(*diff_snapshots(self.rows, scan_folder(self.channel_folder))):
+            self._render()
 
-        for i in self.file_tree.get_children():
-            self.file_tree.delete(i)
+    def _queue_changes(self, added, removed, changed):
+        # Called on the loader and watcher threads; the tree is only touched from _poll_changes
+        self._changes.put((added, removed, changed))
 
-        files = [f for f in os.listdir(self.channel_folder) if os.path.isfile(os.path.join(self.channel_folder, f))]
-        for file in files:
-            self.file_tree.insert("", tk.END, values=(file, ""))
+    def _poll_changes(self):
+        updated = False
+        while True:
+            try:
+                changes = self._changes.get_nowait()
+            except queue.Empty:
+                break
+            updated = self._apply_changes(*changes) or updated
+        if updated:
+            self._render()
+        self._poll_id = self.after(WATCH_REFRESH_MS, self._poll_changes)
 
-    def on_file_select(self, event):
-        for item_id in self.file_tree.get_children():
-            self.file_tree.set(item_id, "selected", "")
+    def _apply_changes(self, added, removed, changed):
+        """Update the listing (not the tree); returns True if anything changed. Safe to apply the same change twice."""
+        removed = {name for name in removed if self.rows.pop(name, None) is not None}
+        if removed:
+            self.order = [name for name in self.order if name not in removed]
+            if self._selected_name() in removed:
+                self.selected_file_path = None
+
+        updates = dict(added)
+        updates.update(changed)
+        if added:
+            # Lengths come from the download archive, not from the files
+            self.durations = archived_durations(self.channel_folder)
+        self.order.extend(name for name in updates if name not in self.rows)
+        self.rows.update(updates)
+        if updates:
+            self._order_stale = True
+        return bool(removed or updates)
 
-        selected_item = self.file_tree.focus()
-        if not selected_item:
-            self.selected_file_path = None
+    def _selected_name(self):
+        return os.path.basename(self.selected_file_path) if self.selected_file_path else None
+
+    def _visible_rows(self):
+        return max(1, (self.file_tree.winfo_height() - HEADING_HEIGHT) // ROW_HEIGHT)
+
+    def _row_values(self, entry, checked):
+        date = datetime.fromtimestamp(entry["mtime"]).strftime("%d.%m.%Y")
+        duration = _format_duration(self.durations.get(entry["name"]))
+        return (entry["name"], _format_size(entry["size"]), duration, date, "✓" if checked else "")
+
+    def _render(self):
+        """Fill the slots with the rows from self.top down; the work depends on the window height, not the folder size."""
+        if self._order_stale:
+            self.order.sort(key=lambda name: self.rows[name]["mtime"], reverse=True)
+            self._order_stale = False
+        visible = self._visible_rows()
+        self.top = max(0, min(self.top, len(self.order) - visible))
+        count = min(visible, len(self.order))
+        while len(self._slots) < count:
+            self._slots.append(self.file_tree.insert("", tk.END, iid=f"slot{len(self._slots)}"))
+        while len(self._slots) > count:
+            self.file_tree.delete(self._slots.pop())
+
+        selected = self._selected_name()
+        self._slot_names = {}
+        self._name_slots = {}
+        for offset, slot in enumerate(self._slots):
+            name = self.order[self.top + offset]
+            self._slot_names[slot] = name
+            self._name_slots[name] = slot
+            self.file_tree.item(slot, values=self._row_values(self.rows[name], name == selected))
+        selected_slot = self._name_slots.get(selected)
+        self.file_tree.selection_set([selected_slot] if selected_slot else [])
+
+        total = len(self.order)
+        if total:
+            self.scrollbar.set(self.top / total, (self.top + count) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _scroll_to(self, top):
+        self.top = top
+        self._render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * len(self.order)))
+        elif unit == "pages":
+            self._scroll_to(self.top + int(amount) * self._visible_rows())
+        else:
+            self._scroll_to(self.top + int(amount))
+
+    def _on_mouse_wheel(self, event):
+        # Button-4/5 on Linux, MouseWheel with a signed delta on Windows and macOS
+        up = event.num == 4 or (event.num != 5 and event.delta > 0)
+        self._scroll_to(self.top + (-WHEEL_ROWS if up else WHEEL_ROWS))
+        return "break"
+
+    def _on_key(self, event):
+        if not self.order:
+            return "break"
+        visible = self._visible_rows()
+        steps = {"Up": -1, "Down": 1, "Prior": -visible, "Next": visible, "Home": -len(self.order), "End": len(self.order)}
+        slot = self._name_slots.get(self._selected_name())
+        index = self.top + self._slots.index(slot) if slot else self.top
+        index = max(0, min(len(self.order) - 1, index + steps.get(event.keysym, 0)))
+
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + visible:
+            self.top = index - visible + 1
+        self.selected_file_path = os.path.join(self.channel_folder, self.order[index])
+        self._render()
+        self.file_tree.focus(self._name_slots[self.order[index]])
+        return "break"
+
+    def on_file_select(self, event):
+        selection = self.file_tree.selection()
+        if not selection or selection[0] not in self._slot_names:
+            # The selected file scrolled out of view; it stays selected
+            return
+        name = self._slot_names[selection[0]]
+        previous = self._selected_name()
+        if name == previous:
             return
 
-        self.file_tree.set(selected_item, "selected", "✓")
-        file_name = self.file_tree.item(selected_item)["values"][0]
-        self.selected_file_path = os.path.join(self.channel_folder, file_name)
+        # Only the newly and previously checked rows change, however many files there are
+        self.selected_file_path = os.path.join(self.channel_folder, name)
+        self.file_tree.set(selection[0], "selected", "✓")
+        previous_slot = self._name_slots.get(previous)
+        if previous_slot:
+            self.file_tree.set(previous_slot, "selected", "")
 
     def play_selected(self):
         if not self.selected_file_path:
@@ -122,11 +324,20 @@ class FileViewer(tk.Toplevel):
             return
 
         file_name = os.path.basename(self.selected_file_path)
-        if messagebox.askyesno("Confirm Delete", f"Are you sure you want to permanently delete {file_name}?"):
+        # Looked up before deleting: a renamed protected file is only known by its video ID
+        video_id = archived_video_ids(self.channel_folder).get(file_name)
+        protected = is_protected(self.channel_folder, file_name, video_id)
+        message = f"Are you sure you want to permanently delete {file_name}?"
+        if protected:
+            message += "\n\nThis video is protected from automatic deletion."
+        if messagebox.askyesno("Confirm Delete", message):
             try:
                 os.remove(self.selected_file_path)
+                if protected:
+                    unprotect_video(self.channel_folder, file_name, video_id)
                 self.selected_file_path = None
-                self.populate_files() # Refresh the list
+                self._apply_changes({}, {file_name}, {})
+                self._render()
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete file: {e}")
 
@@ -135,11 +346,15 @@ class FileViewer(tk.Toplevel):
             messagebox.showinfo("Empty", "The folder is already empty.")
             return
 
-        if messagebox.askyesno("Confirm Delete All", f"Are you sure you want to permanently delete ALL files in the {self.channel_name} folder? This cannot be undone."):
+        protected = protected_files(self.channel_folder)
+        message = f"Are you sure you want to permanently delete ALL files in the {self.channel_name} folder? This cannot be undone."
+        if protected:
+            message += "\n\nProtected videos are kept; delete them one at a time."
+        if messagebox.askyesno("Confirm Delete All", message):
             try:
                 for file_name in os.listdir(self.channel_folder):
                     file_path = os.path.join(self.channel_folder, file_name)
-                    if os.path.isfile(file_path):
+                    if os.path.isfile(file_path) and file_name not in protected:
                         os.remove(file_path)
                 self.selected_file_path = None
                 self.populate_files() # Refresh the list
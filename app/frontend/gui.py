@@ -6,23 +6,35 @@ import webbrowser
 import tkinter as tk
 from tkinter import ttk, messagebox
 import subprocess
-from plyer import notification
-from PIL import Image
-import pystray
 
-from app.backend.config import load_channels, load_settings, save_settings
-from app.backend.downloader import find_video_url, download_video, get_next_saturday, delete_old_videos, format_romanian_date, get_recent_sabbaths
+from app.backend.config import get_settings_store, init_app_dirs, load_channel_list, load_settings, save_settings
+from app.backend.downloader import find_video_url, find_video_urls, download_video, open_download_session, queue_resumable_downloads, get_next_saturday, format_romanian_date, get_recent_sabbaths
 from datetime import datetime
 from app.frontend.settings_window import SettingsWindow
 from app.frontend.file_viewer import FileViewer
 from app.frontend.help_window import HelpWindow
 from app.frontend.player_utils import play_video
-from app.backend.auto_downloader import run_automatic_checks
+from app.frontend.progress_dispatcher import ProgressDispatcher
+from app.backend.download_jobs import DownloadJobRegistry
+from app.backend.auto_downloader import DEFAULT_MAX_PARALLEL_CHANNELS
+from app.backend.auto_check import AutoCheckScheduler
+from app.backend.scheduler import get_scheduler, current_task
+from app.backend.retention import apply_retention
+from app.backend.channel_cache import DEFAULT_CACHE_TTL_MINUTES
 from app.backend.updater import check_for_updates, get_asset_download_url, get_platform_asset_name, download_update
 from app.backend.config import get_base_path, UPDATE_DIR
 from app.backend.startup_manager import is_in_startup, add_to_startup, remove_from_startup
 from app.backend.logger import setup_logger
 
+def _format_speed(bytes_per_second):
+    return f"{bytes_per_second / (1024 * 1024):.1f} MB/s"
+
+
+def _format_eta(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
+
+
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
     try:
@@ -45,36 +57,22 @@ class YoutubeWeeklyGUI(tk.Tk):
         log_folder = self.settings.get("log_folder", "data/logs")
         setup_logger(log_folder)
 
-        # Clean up any leftover update artifacts
-        self._cleanup_update_artifacts()
-
-        # Synchronize startup setting with Windows Registry
-        app_should_start_with_system = self.settings.get("start_with_system", False)
-        is_currently_in_startup = is_in_startup()
-
-        if app_should_start_with_system and not is_currently_in_startup:
-            add_to_startup()
-        elif not app_should_start_with_system and is_currently_in_startup:
-            remove_from_startup()
-
-        if self.startup_warnings:
-            messagebox.showwarning("Configuration Warnings", "\n".join(self.startup_warnings))
-
         self.quality_options = ["max", "4k", "2k", "1080p", "720p", "480p", "mp3"]
         self.channel_quality_vars = {}
         self.channel_date_vars = {}
         self.open_file_viewers = {}
-        self.download_stage = 0 # 0: idle, 1: video, 2: audio
-        self.last_progress_value = 0
-        self.downloading_channels = set()
+        # Progress per download, keyed by channel folder, rendered by the dispatcher
+        self.jobs = DownloadJobRegistry()
+        # Channel folder -> (download button, its idle text); shows that channel's progress
+        self.channel_buttons = {}
+        self.progress_visible = False
+        self.progress_dispatcher = ProgressDispatcher(self, self._render_progress)
         self.tray_icon = None
-
-        # Initialize and run tray icon from the start
-        image = Image.open(resource_path("assets/icon4.ico"))
-        menu = (pystray.MenuItem('Show', self.show_window, default=True),
-                pystray.MenuItem('Quit', self.quit_application))
-        self.tray_icon = pystray.Icon("YoutubeWeekly", image, "YoutubeWeekly Downloader", menu)
-        self.tray_icon.run_detached()
+        # Every lookup and download goes through the app-wide scheduler, which
+        # also tells the window which channels are busy
+        self.scheduler = get_scheduler()
+        self.scheduler.set_max_downloads(self.settings.get("max_parallel_channels", DEFAULT_MAX_PARALLEL_CHANNELS))
+        get_settings_store().subscribe(self._on_settings_changed)
 
         style = ttk.Style()
         style.theme_use("default")
@@ -97,16 +95,7 @@ class YoutubeWeeklyGUI(tk.Tk):
         self.base_path = self.settings.get("video_folder", "data/videos")
 
         # Load channels configuration
-        raw = load_channels()
-        self.channels = [
-            {
-                "name": ch_data.get("name", key),
-                "url": ch_data["url"],
-                "date_format": ch_data.get("date_format", "%d.%m.%Y"),
-                "folder": ch_data.get("folder", key)
-            }
-            for key, ch_data in raw.items()
-        ]
+        self.channels = load_channel_list()
 
         self.recent_sabbaths_per_channel = {
             ch["name"]: ["automat"] + get_recent_sabbaths(date_format="%d.%m.%Y")
@@ -177,6 +166,9 @@ class YoutubeWeeklyGUI(tk.Tk):
                 width=34
             )
             btn.pack(side="left")
+            self.channel_buttons[channel["folder"]] = (btn, btn.cget("text"))
+            # Right-click offers downloading every missed week since the selected date
+            btn.bind("<Button-3>", lambda e, ch=channel: self._show_channel_menu(e, ch))
 
             play_btn = ttk.Button(
                 row,
@@ -227,6 +219,7 @@ class YoutubeWeeklyGUI(tk.Tk):
             width=12
         )
         others_btn.pack(side="left")
+        self.channel_buttons["other"] = (others_btn, others_btn.cget("text"))
 
         play_others_btn = ttk.Button(
             others_frame,
@@ -265,23 +258,60 @@ class YoutubeWeeklyGUI(tk.Tk):
         self.resizable(False, False)
         self.bind("<Configure>", self._on_resize)
 
+        # Download threads only queue progress; the UI is refreshed from one after() loop
+        self.progress_dispatcher.start()
+        self._poll_scheduler()
+
+        # Everything the window does not need to appear runs once it is on screen
+        self.after_idle(self._deferred_startup)
+
         # IMPORTANT: Move the automatic checks and update check to AFTER all UI initialization
         # This ensures self.progress_hook exists when it's passed to the threads
-        
-        # Run automatic checks in a separate thread
-        threading.Thread(
-            target=run_automatic_checks,
-            args=(self.settings, self.channels, self._send_notification, self.progress_hook, self.show_window),
-            kwargs={
-                'status_callback': lambda msg: self.after(0, lambda: self._set_status(msg)),
-                'reset_progress_callback': lambda: self.after(0, self._reset_download_progress),
-            },
-            daemon=True
-        ).start()
+
+        # Automatic checks repeat on the auto_check_schedule while the app runs (also from the tray)
+        self.auto_checks = AutoCheckScheduler(
+            self.channels, self._send_notification, progress_hook=self.progress_hook,
+            show_window_callback=self.show_window,
+            status_callback=lambda msg: self.after(0, lambda: self._set_status(msg)),
+        )
+        self.auto_checks.start()
+
+        # Continue downloads that were interrupted when the app last closed
+        threading.Thread(target=self._resume_partial_downloads, daemon=True).start()
 
         # Check for updates in a separate thread
         threading.Thread(target=self._check_for_updates_thread, daemon=True).start()
 
+    def _deferred_startup(self):
+        """Startup work that can wait until the main window has been drawn."""
+        # Clean up any leftover update artifacts
+        self._cleanup_update_artifacts()
+
+        # Synchronize startup setting with Windows Registry
+        app_should_start_with_system = self.settings.get("start_with_system", False)
+        is_currently_in_startup = is_in_startup()
+
+        if app_should_start_with_system and not is_currently_in_startup:
+            add_to_startup()
+        elif not app_should_start_with_system and is_currently_in_startup:
+            remove_from_startup()
+
+        self._start_tray_icon()
+
+        if self.startup_warnings:
+            messagebox.showwarning("Configuration Warnings", "\n".join(self.startup_warnings))
+
+    def _start_tray_icon(self):
+        # PIL and pystray are only imported here; pystray also connects to the display server on import
+        from PIL import Image
+        import pystray
+
+        image = Image.open(resource_path("assets/icon4.ico"))
+        menu = (pystray.MenuItem('Show', self.show_window, default=True),
+                pystray.MenuItem('Quit', self.quit_application))
+        self.tray_icon = pystray.Icon("YoutubeWeekly", image, "YoutubeWeekly Downloader", menu)
+        self.tray_icon.run_detached()
+
     def center_window(self):
         self.update_idletasks()
         width = self.winfo_width()
@@ -297,7 +327,7 @@ class YoutubeWeeklyGUI(tk.Tk):
 
     def on_closing(self):
         self.settings["main_window_geometry"] = self.geometry()
-        save_settings(self.settings)
+        save_settings(self.settings, defer=True)
         self.quit_application()
 
     def minimize_to_tray(self, event):
@@ -365,10 +395,16 @@ class YoutubeWeeklyGUI(tk.Tk):
         self.after(0, self._perform_quit)
 
     def _perform_quit(self):
+        self.auto_checks.stop()
+        get_settings_store().flush()
         if self.tray_icon is not None and self.tray_icon.visible:
             self.tray_icon.stop()
         self.destroy()
 
+    def _on_settings_changed(self, settings):
+        # Called on the saving thread; the scheduler is thread-safe, widgets are not touched here
+        self.scheduler.set_max_downloads(settings.get("max_parallel_channels", DEFAULT_MAX_PARALLEL_CHANNELS))
+
     def open_settings(self):
         settings_win = SettingsWindow(self, self.settings)
         settings_win.transient(self)
@@ -431,6 +467,7 @@ class YoutubeWeeklyGUI(tk.Tk):
                         icon_path = candidate
                         break
                 
+                from plyer import notification
                 notification.notify(
                     title=title,
                     message=message,
@@ -443,51 +480,54 @@ class YoutubeWeeklyGUI(tk.Tk):
                 print(f"Error sending notification: {e}")
 
     def download_for_channel(self, channel):
-        """Launch the download check in a background thread."""
+        """Queue the channel lookup in the scheduler's resolver stage."""
         channel_name = channel["name"]
-        if channel_name in self.downloading_channels:
+        if self.scheduler.is_active(channel["folder"]):
             self._set_status(f"A download for {channel_name} is already in progress.")
             return
 
-        self.downloading_channels.add(channel_name)
-        self.download_stage = 1 # Reset for new download
-        self.last_progress_value = 0
         try:
-            threading.Thread(
-                target=self._worker_download,
-                args=(channel,),
-                daemon=True
-            ).start()
+            self.scheduler.resolve(self._worker_download, channel, key=channel["folder"], label=channel_name)
         except Exception as e:
             self._set_status(f"Error starting download: {e}")
-            if channel_name in self.downloading_channels:
-                self.downloading_channels.remove(channel_name)
 
     def download_others(self):
         """Download video from the link in the others entry to data/videos/other."""
-        if "others" in self.downloading_channels:
-            self._set_status("A download for 'others' is already in progress.")
-            return
-
-        self.downloading_channels.add("others")
-        self.download_stage = 1 # Reset for new download
-        self.last_progress_value = 0
         link = self.others_link_var.get().strip()
         if not link:
             self._set_status("Please enter a YouTube link.")
-            self.downloading_channels.remove("others")
+            return
+        if self.scheduler.is_active(link):
+            self._set_status("A download for this link is already in progress.")
             return
 
         self._set_status("Starting download...")
         try:
-            threading.Thread(
-                target=self._worker_download_others,
-                args=(link,),
-                daemon=True
-            ).start()
+            # A direct link needs no lookup, so it goes straight to the download stage
+            self.scheduler.download(self._worker_download_others, link, key=link, label=link)
         except Exception as e:
-            self._set_status(f"Error starting download thread: {e}")
-            self.downloading_channels.remove("others")
+            self._set_status(f"Error starting download: {e}")
+
+    def cancel_channel_download(self, channel):
+        if self.scheduler.cancel(channel["folder"]):
+            self._set_status(f"Cancelling download for {channel['name']}...")
+
+    def _was_cancelled(self):
+        """True inside a scheduler task the user has cancelled."""
+        task = current_task()
+        return task is not None and task.cancel_requested
+
+    def _poll_scheduler(self):
+        """Mark channels whose work is waiting in the scheduler's queue, once a second."""
+        queued = {task["key"] for task in self.scheduler.status() if task["state"] == "queued"}
+        for key, (button, idle_text) in self.channel_buttons.items():
+            job = self.jobs.get(key)
+            if job and job.active:
+                continue  # _render_progress owns the button while it downloads
+            text = f"{idle_text.replace('Download ', '', 1)} · queued" if key in queued else idle_text
+            if button.cget("text") != text:
+                button.configure(text=text)
+        self.after(1000, self._poll_scheduler)
 
     def play_others(self):
         """Play the latest video in the 'other' folder."""
@@ -507,8 +547,10 @@ class YoutubeWeeklyGUI(tk.Tk):
     def _worker_download_others(self, link):
         folder = os.path.join(self.base_path, "other")
         try:
-            error = download_video(link, folder, self.others_quality_var.get(), progress_hook=self.progress_hook)
-            if error:
+            error = download_video(link, folder, self.others_quality_var.get(), progress_hook=self._progress_hook_for(folder))
+            if error and self._was_cancelled():
+                self._set_status("Download cancelled.")
+            elif error:
                 self._set_status(f"Error downloading: {error}")
                 self._send_notification("Download Error", f"Failed to download video from link: {link}\n{error}", on_click=self.bring_to_foreground)
                 messagebox.showerror(
@@ -526,8 +568,7 @@ class YoutubeWeeklyGUI(tk.Tk):
                 f"Failed to download video:\n{e}"
             )
         finally:
-            if "others" in self.downloading_channels:
-                self.downloading_channels.remove("others")
+            self._end_job(folder)
 
     def _worker_play_others(self):
         """Worker function to find and play the latest video in the 'other' folder."""
@@ -555,8 +596,10 @@ class YoutubeWeeklyGUI(tk.Tk):
             self._set_status(f"Launched video player for Others.")
 
     def _worker_download(self, channel):
-        """Worker function that runs off the main UI thread."""
+        """Resolver stage: find the video and hand it to the download stage."""
         name = channel["name"]
+        handed_off = False
+        session = None
         try:
             fmt = channel["date_format"]
 
@@ -573,8 +616,15 @@ class YoutubeWeeklyGUI(tk.Tk):
             else:
                 next_sat = get_next_saturday(date_format=fmt)
 
-            # Step 2: Locate the video URL
-            url, match_info = find_video_url(channel["url"], next_sat, date_format=fmt)
+            # Step 2: Locate the video URL, in a yt-dlp session the download will reuse
+            channel_folder = os.path.join(self.base_path, channel["folder"])
+            quality_pref = self.channel_quality_vars.get(name, tk.StringVar()).get()
+            session = open_download_session(channel_folder, quality_pref, self._progress_hook_for(channel_folder))
+            url, match_info = find_video_url(
+                channel["url"], next_sat, date_format=fmt,
+                cache_ttl_minutes=self.settings.get("channel_cache_ttl_minutes", DEFAULT_CACHE_TTL_MINUTES),
+                session=session
+            )
             if not url:
                 self._set_status(f"No video found for {name} on {next_sat}.")
                 self._send_notification("Video Not Found", f"No video found for {name} on {next_sat}.", on_click=self.bring_to_foreground)
@@ -582,39 +632,22 @@ class YoutubeWeeklyGUI(tk.Tk):
 
             # If fuzzy match, ask user to confirm (must run dialog on main thread)
             if match_info and match_info["type"] == "fuzzy":
-                result = [None]
-                event = threading.Event()
-
-                def ask_on_main_thread():
-                    result[0] = messagebox.askyesno(
-                        "Possible Match Found",
-                        f"No exact match for {name} on {next_sat}.\n\n"
-                        f"Found a similar video:\n\"{match_info['title']}\"\n\n"
-                        f"Reason: {match_info['reason']}\n\n"
-                        f"Download this video?"
-                    )
-                    event.set()
-
-                self.after(0, ask_on_main_thread)
-                event.wait()
-
-                if not result[0]:
+                confirmed = self._ask_yes_no(
+                    "Possible Match Found",
+                    f"No exact match for {name} on {next_sat}.\n\n"
+                    f"Found a similar video:\n\"{match_info['title']}\"\n\n"
+                    f"Reason: {match_info['reason']}\n\n"
+                    f"Download this video?"
+                )
+                if not confirmed:
                     self._set_status(f"Download cancelled for {name}.")
                     return
 
             # Prepare channel-specific folder
-            channel_folder = os.path.join(self.base_path, channel["folder"])
             os.makedirs(channel_folder, exist_ok=True)
 
             # Step 3: Check if that exact video is already downloaded
-            numeric = next_sat.lower()
-            date_obj = datetime.strptime(next_sat, fmt).date()
-            romanian = format_romanian_date(date_obj).lower()
-
-            existing = [
-                f for f in os.listdir(channel_folder)
-                if numeric in f.lower() or romanian in f.lower()
-            ]
+            existing = self._existing_videos_for_date(channel_folder, next_sat, fmt)
             if existing:
                 existing_titles = ", ".join(existing)
                 self._set_status(
@@ -622,16 +655,178 @@ class YoutubeWeeklyGUI(tk.Tk):
                 )
                 return
 
-            # Step 4: Delete previous (in channel folder) only if no custom date selected
-            if not selected_date or selected_date == "automat":
-                delete_old_videos(channel_folder, keep_old=self.settings.get("keep_old_videos", False))
+            # Step 4: Queue the transfer in the download stage
+            delete_old = not selected_date or selected_date == "automat"
+            self._set_status(f"Downloading from {name} ({quality_pref})...")
+            self.scheduler.download(self._worker_download_video, channel, url, channel_folder, quality_pref, delete_old, session,
+                                    key=channel["folder"], label=name,
+                                    on_cancel=lambda: self._release_dropped_download(name, channel_folder, session))
+            handed_off = True
+        finally:
+            if not handed_off and session:
+                session.close()
+
+    def _release_dropped_download(self, name, channel_folder, session):
+        """Clean up a transfer cancelled while still queued; its worker never runs to do it."""
+        session.close()
+        self._end_job(channel_folder)
+        self._set_status(f"Download cancelled for {name}.")
+
+    def _ask_yes_no(self, title, message):
+        """Show a yes/no dialog on the main thread and wait for the answer."""
+        result = [None]
+        event = threading.Event()
+
+        def ask_on_main_thread():
+            result[0] = messagebox.askyesno(title, message)
+            event.set()
+
+        self.after(0, ask_on_main_thread)
+        event.wait()
+        return result[0]
+
+    def _existing_videos_for_date(self, channel_folder, date_str, fmt):
+        """Return files in channel_folder whose name contains the date (numeric or Romanian)."""
+        numeric = date_str.lower()
+        romanian = format_romanian_date(datetime.strptime(date_str, fmt).date()).lower()
+        return [
+            f for f in os.listdir(channel_folder)
+            if numeric in f.lower() or romanian in f.lower()
+        ]
 
-            # Step 5: Download into channel folder
+    def _show_channel_menu(self, event, channel):
+        menu = tk.Menu(self, tearoff=0)
+        menu.add_command(
+            label="Download all weeks since selected date",
+            command=lambda: self.download_range_for_channel(channel)
+        )
+        menu.add_command(
+            label="Cancel download",
+            command=lambda: self.cancel_channel_download(channel),
+            state="normal" if self.scheduler.is_active(channel["folder"]) else "disabled"
+        )
+        menu.tk_popup(event.x_root, event.y_root)
+
+    def download_range_for_channel(self, channel):
+        """Queue a single lookup for every Sabbath from the selected date to the latest one."""
+        channel_name = channel["name"]
+        if self.scheduler.is_active(channel["folder"]):
+            self._set_status(f"A download for {channel_name} is already in progress.")
+            return
+
+        selected_date = self.channel_date_vars[channel_name].get()
+        sabbaths = [d for d in self.recent_sabbaths_per_channel[channel_name] if d != "automat"]
+        if selected_date not in sabbaths:
+            self._set_status(f"Select the oldest missed week for {channel_name} in the date list first.")
+            return
+
+        # The list is newest first, so everything up to the selected date is in range
+        dates = sabbaths[:sabbaths.index(selected_date) + 1]
+        try:
+            self.scheduler.resolve(self._worker_download_range, channel, dates, key=channel["folder"], label=channel_name)
+        except Exception as e:
+            self._set_status(f"Error starting download: {e}")
+
+    def _worker_download_range(self, channel, dates):
+        """Resolver stage for a range of weeks: one channel scan for all dates."""
+        name = channel["name"]
+        handed_off = False
+        session = None
+        try:
+            fmt = channel["date_format"]
+            channel_dates = [datetime.strptime(d, "%d.%m.%Y").strftime(fmt) for d in dates]
+            channel_folder = os.path.join(self.base_path, channel["folder"])
             quality_pref = self.channel_quality_vars.get(name, tk.StringVar()).get()
-            self._set_status(f"Downloading from {name} ({quality_pref})...")
-            try:
-                error = download_video(url, channel_folder, quality_pref, protect=self.settings.get("keep_old_videos", False), progress_hook=self.progress_hook)
+
+            self._set_status(f"Finding {len(channel_dates)} weeks for {name}...")
+            session = open_download_session(channel_folder, quality_pref, self._progress_hook_for(channel_folder))
+            found = find_video_urls(
+                channel["url"], channel_dates, date_format=fmt,
+                cache_ttl_minutes=self.settings.get("channel_cache_ttl_minutes", DEFAULT_CACHE_TTL_MINUTES),
+                session=session
+            )
+
+            os.makedirs(channel_folder, exist_ok=True)
+
+            urls, fuzzy_titles, missing = [], [], []
+            # Oldest week first, so the videos arrive in viewing order
+            for date_str in reversed(channel_dates):
+                url, match_info = found[date_str]
+                if not url:
+                    missing.append(date_str)
+                elif not self._existing_videos_for_date(channel_folder, date_str, fmt) and url not in urls:
+                    urls.append(url)
+                    if match_info["type"] == "fuzzy":
+                        fuzzy_titles.append((url, match_info["title"]))
+
+            if fuzzy_titles:
+                confirmed = self._ask_yes_no(
+                    "Possible Matches Found",
+                    f"Some weeks for {name} have no exact match. Similar videos:\n\n"
+                    + "\n".join(f"\"{title}\"" for _, title in fuzzy_titles)
+                    + "\n\nDownload these videos too?"
+                )
+                if not confirmed:
+                    skipped = {url for url, _ in fuzzy_titles}
+                    urls = [url for url in urls if url not in skipped]
+
+            if missing:
+                self._send_notification("Video Not Found", f"No video found for {name} on {', '.join(missing)}.", on_click=self.bring_to_foreground)
+            if not urls:
+                self._set_status(f"Nothing new to download for {name}.")
+                return
+
+            self._set_status(f"Downloading {len(urls)} videos from {name} ({quality_pref})...")
+            self.scheduler.download(self._worker_download_videos, channel, urls, channel_folder, quality_pref, session,
+                                    key=channel["folder"], label=name,
+                                    on_cancel=lambda: self._release_dropped_download(name, channel_folder, session))
+            handed_off = True
+        finally:
+            if not handed_off and session:
+                session.close()
+
+    def _worker_download_videos(self, channel, urls, channel_folder, quality_pref, session=None):
+        """Download stage for a range of weeks: transfer each video in turn."""
+        name = channel["name"]
+        failed = []
+        try:
+            for i, url in enumerate(urls, 1):
+                self._set_status(f"Downloading {name} {i}/{len(urls)} ({quality_pref})...")
+                try:
+                    error = download_video(url, channel_folder, quality_pref, protect=self.settings.get("keep_old_videos", False), progress_hook=self._progress_hook_for(channel_folder), session=session)
+                except Exception as e:
+                    error = e
                 if error:
+                    failed.append(f"{url}: {error}")
+                    self._end_job(channel_folder)
+                if self._was_cancelled():
+                    break
+
+            if self._was_cancelled():
+                self._set_status(f"Download cancelled for {name}.")
+            elif failed:
+                self._set_status(f"Error downloading {len(failed)} of {len(urls)} videos for {name}.")
+                self._send_notification("Download Error", f"Failed to download {len(failed)} videos for {name}.", on_click=self.bring_to_foreground)
+                messagebox.showerror(
+                    "Download Error",
+                    f"Failed to download {len(failed)} videos for {name}:\n" + "\n".join(failed)
+                )
+            else:
+                self._send_notification("Download Complete", f"Finished downloading {len(urls)} videos for {name}.", on_click=self.bring_to_foreground)
+        finally:
+            self._end_job(channel_folder)
+            if session:
+                session.close()
+
+    def _worker_download_video(self, channel, url, channel_folder, quality_pref, delete_old, session=None):
+        """Download stage: transfer the resolved video into the channel folder."""
+        name = channel["name"]
+        try:
+            try:
+                error = download_video(url, channel_folder, quality_pref, protect=self.settings.get("keep_old_videos", False), progress_hook=self._progress_hook_for(channel_folder), session=session)
+                if error and self._was_cancelled():
+                    self._set_status(f"Download cancelled for {name}.")
+                elif error:
                     self._set_status(f"Error downloading {name}: {error}")
                     self._send_notification("Download Error", f"Failed to download video for {name}: {error}", on_click=self.bring_to_foreground)
                     messagebox.showerror(
@@ -639,6 +834,9 @@ class YoutubeWeeklyGUI(tk.Tk):
                         f"Failed to download {name}:\n{error}"
                     )
                 else:
+                    # Clean up older videos only if no custom date was selected
+                    if delete_old:
+                        apply_retention(channel_folder, self.settings)
                     self._send_notification("Download Complete", f"Finished downloading video for {name}.", on_click=self.bring_to_foreground)
             except Exception as e:
                 self._set_status(f"Error downloading {name}: {e}")
@@ -648,8 +846,24 @@ class YoutubeWeeklyGUI(tk.Tk):
                     f"Failed to download {name}:\n{e}"
                 )
         finally:
-            if name in self.downloading_channels:
-                self.downloading_channels.remove(name)
+            self._end_job(channel_folder)
+            if session:
+                session.close()
+
+    def _resume_partial_downloads(self):
+        """Queue every interrupted download that left a .part file behind."""
+        queue_resumable_downloads(self.scheduler, self._worker_resume_download, self.settings)
+
+    def _worker_resume_download(self, item):
+        folder_name = os.path.basename(item["folder"])
+        self._set_status(f"Resuming interrupted download in {folder_name}...")
+        error = download_video(item["url"], item["folder"], item["quality"], protect=item.get("protect", False), progress_hook=self._progress_hook_for(item["folder"]))
+        if error:
+            self._end_job(item["folder"])
+            self._set_status(f"Error resuming download in {folder_name}: {error}")
+            self._send_notification("Download Error", f"Failed to resume download in {folder_name}: {error}", on_click=self.bring_to_foreground)
+        else:
+            self._send_notification("Download Complete", f"Finished interrupted download in {folder_name}.", on_click=self.bring_to_foreground)
 
     def play_latest(self, channel):
         """Play the latest video for a given channel."""
@@ -709,58 +923,81 @@ class YoutubeWeeklyGUI(tk.Tk):
 
     
 
-    def _reset_download_progress(self):
-        """Reset download progress state for a new download."""
-        self.download_stage = 1
-        self.last_progress_value = 0
-
     def progress_hook(self, d):
-        # Ensure UI updates happen on main thread
-        def update_ui():
-            # Make the progress bar visible when download starts (space already reserved)
-            self.progress_bar.configure(style="Thin.Horizontal.TProgressbar")  # Switch to visible thin style
-        
-        # Schedule showing the progress bar on the main thread
-        self.after(0, update_ui)
-
-        if d['status'] == 'downloading':
-            total_bytes = d.get('total_bytes') or d.get('total_bytes_estimate')
-            if total_bytes:
-                percent = (d['downloaded_bytes'] / total_bytes) * 100
-                unified_percent = 0
-                if self.download_stage == 1: # Video part (0-50%)
-                    unified_percent = percent / 2
-                elif self.download_stage == 2: # Audio part (50-100%)
-                    unified_percent = 50 + (percent / 2)
-                
-                # Ratchet logic: only update if progress has increased
-                if unified_percent > self.last_progress_value:
-                    self.last_progress_value = unified_percent
-                    # Schedule UI update on the main thread
-                    def update_progress():
-                        self._set_status(f"Downloading... {unified_percent:.1f}%")
-                        self.progress_bar.configure(value=unified_percent)
-                    self.after(0, update_progress)
-
-        elif d['status'] == 'finished':
-            def handle_finished():
-                if self.download_stage == 1:
-                    self.download_stage = 2 # Move to audio stage
-                    # Ensure the bar hits 50% exactly
-                    if self.last_progress_value < 50:
-                        self.last_progress_value = 50
-                        self._set_status(f"Downloading... 50.0%")
-                        self.progress_bar.configure(value=50)
-                else:
-                    # Ensure the bar hits 100% exactly
-                    self.progress_bar.configure(value=100)
-                    self._set_status("Download complete.")
-                    # Hide progress bar after a delay
-                    self.after(2000, lambda: self.progress_bar.configure(style="Invisible.Horizontal.TProgressbar"))
-                    self.download_stage = 0 # Reset to idle
-                    self.last_progress_value = 0
-            
-            self.after(0, handle_finished)
+        """yt-dlp progress hook; runs on download threads and only queues the event."""
+        info = d.get('info_dict') or {}
+        key = d.get('channel') or info.get('id') or d.get('filename')
+        # Events are aggregated over the video and audio streams (see AggregateProgress),
+        # so downloaded/total bytes already cover the whole download
+        job = self.jobs.update(key, d)
+        if job:
+            self.progress_dispatcher.submit(key, {'status': job.status})
+
+    def _progress_hook_for(self, folder):
+        """Return a progress hook that reports into the job of the given channel folder."""
+        key = os.path.basename(os.path.normpath(folder))
+        return lambda d: self.progress_hook(dict(d, channel=key))
+
+    def _end_job(self, folder):
+        """Close the folder's job if its download stopped without a "finished" event."""
+        self._progress_hook_for(folder)({'status': 'error'})
+
+    def _render_progress(self, updates):
+        """Redraw the channels whose jobs changed; called by the dispatcher on the main thread."""
+        finished_any = False
+        for key, events in updates.items():
+            job = self.jobs.get(key)
+            if job and job.active:
+                self._set_channel_progress(key, job)
+                continue
+            finished_any = finished_any or any(e['status'] == 'finished' for e in events)
+            self._set_channel_progress(key, None)
+            self.jobs.remove(key)
+
+        active = self.jobs.active_jobs()
+        if active:
+            if not self.progress_visible:
+                # Make the progress bar visible when download starts (space already reserved)
+                self.progress_bar.configure(style="Thin.Horizontal.TProgressbar")
+                self.progress_visible = True
+            downloaded, total, speed = self.jobs.totals()
+            label = "Downloading..." if len(active) == 1 else f"Downloading {len(active)} videos..."
+            if total:
+                percent = min(100.0, downloaded / total * 100)
+                self.progress_bar.configure(value=percent)
+                label = f"{label} {percent:.1f}%"
+            if speed:
+                label = f"{label} · {_format_speed(speed)}"
+            self._set_status(label)
+        elif finished_any:
+            # Ensure the bar hits 100% exactly
+            self.progress_bar.configure(value=100)
+            self._set_status("Download complete.")
+            # Hide progress bar after a delay unless another download started
+            self.after(2000, self._hide_progress_if_idle)
+        elif self.progress_visible:
+            self._hide_progress_if_idle()
+
+    def _set_channel_progress(self, key, job):
+        """Show a job's progress on its channel's download button, or restore the button."""
+        if key not in self.channel_buttons:
+            return
+        button, idle_text = self.channel_buttons[key]
+        if job is None:
+            button.configure(text=idle_text)
+            return
+        parts = [idle_text.replace("Download ", "", 1)]
+        if job.percent is not None:
+            parts.append(f"{job.percent:.0f}%")
+        if job.eta:
+            parts.append(_format_eta(job.eta))
+        button.configure(text=" · ".join(parts))
+
+    def _hide_progress_if_idle(self):
+        if not self.jobs.active_jobs():
+            self.progress_bar.configure(style="Invisible.Horizontal.TProgressbar")
+            self.progress_visible = False
+
     def _cleanup_update_artifacts(self):
         """Remove leftover .bak files and old update ZIPs."""
         def _try_delete(path):
@@ -947,7 +1184,7 @@ if __name__ == "__main__":
             messagebox.showerror("Error", "Could not connect to the running instance.")
         sys.exit()
 
-
+    init_app_dirs()
     app = YoutubeWeeklyGUI()
 
     def ipc_server():
@@ -0,0 +1,53 @@
+import threading
+
+DEFAULT_REFRESH_MS = 100  # 10 Hz
+
+
+class ProgressDispatcher:
+    """Hands progress events from worker threads to the Tk main loop at a fixed rate.
+
+    Worker threads only record the latest event per download under a lock;
+    consecutive "downloading" events for the same download replace each other.
+    A single after() loop on the main thread passes whatever changed since the
+    last frame to `render` as {key: [events, oldest first]}.
+    """
+
+    def __init__(self, widget, render, interval_ms=DEFAULT_REFRESH_MS):
+        self._widget = widget
+        self._render = render
+        self._interval_ms = interval_ms
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._after_id = None
+
+    def submit(self, key, event):
+        """Record an event for download `key`. Safe to call from any thread."""
+        with self._lock:
+            events = self._pending.setdefault(key, [])
+            # Only the newest in-progress event matters; status changes are kept in order
+            if events and events[-1].get("status") == "downloading" and event.get("status") == "downloading":
+                events[-1] = event
+            else:
+                events.append(event)
+
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self._widget.after(self._interval_ms, self._tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            self._widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def flush(self):
+        """Render everything submitted since the last frame. Main thread only."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if pending:
+            self._render(pending)
+
+    def _tick(self):
+        try:
+            self.flush()
+        finally:
+            self._after_id = self._widget.after(self._interval_ms, self._tick)
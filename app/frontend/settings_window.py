@@ -3,9 +3,9 @@ import sys
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import json
-from app.backend.config import save_settings, load_default_settings
+from app.backend.config import save_settings, load_default_settings, load_channel_list, get_base_path
+from app.backend.retention import retention_report, format_report
 from app.frontend.help_window import HelpWindow
-from screeninfo import get_monitors
 from app.backend.startup_manager import add_to_startup, remove_from_startup, is_in_startup
 
 class SettingsWindow(tk.Toplevel):
@@ -102,9 +102,15 @@ class SettingsWindow(tk.Toplevel):
         main_frame.pack(padx=10, pady=10, fill="both", expand=True)
 
         # Keep old videos
+        keep_frame = ttk.Frame(main_frame, style="Dark.TFrame")
+        keep_frame.pack(fill="x", pady=5)
+
         self.keep_old_videos_var = tk.BooleanVar(value=self.settings.get("keep_old_videos", False))
-        keep_videos_check = ttk.Checkbutton(main_frame, text="Keep old videos", variable=self.keep_old_videos_var, style="Dark.TCheckbutton")
-        keep_videos_check.pack(anchor="w", pady=5)
+        keep_videos_check = ttk.Checkbutton(keep_frame, text="Keep old videos", variable=self.keep_old_videos_var, style="Dark.TCheckbutton")
+        keep_videos_check.pack(side="left")
+
+        preview_button = ttk.Button(keep_frame, text="Preview Cleanup", command=self.preview_cleanup, style="Dark.TButton")
+        preview_button.pack(side="right")
 
         # Video folder
         folder_frame = ttk.Frame(main_frame, style="Dark.TFrame")
@@ -186,6 +192,7 @@ class SettingsWindow(tk.Toplevel):
         monitor_frame.pack(fill="x", pady=5)
         ttk.Label(monitor_frame, text="MPV Monitor:", style="Dark.TLabel").pack(side="left")
         self.mpv_screen_var = tk.StringVar(value=self.settings.get("mpv_screen", "Default"))
+        from screeninfo import get_monitors  # only needed once Settings is opened
         self.monitor_options = ["Default"] + [str(i) for i, _ in enumerate(get_monitors())]
         mpv_screen_combo = ttk.Combobox(monitor_frame, textvariable=self.mpv_screen_var, values=self.monitor_options, width=10, state="readonly", style="Dark.TCombobox")
         mpv_screen_combo.pack(side="left", padx=5)
@@ -237,6 +244,17 @@ class SettingsWindow(tk.Toplevel):
 
     
 
+    def preview_cleanup(self):
+        """Show what the retention policies would delete, without deleting anything."""
+        settings = dict(self.settings, keep_old_videos=self.keep_old_videos_var.get())
+        video_folder = self.video_folder_var.get()
+        if not os.path.isabs(video_folder):
+            video_folder = os.path.join(get_base_path(), video_folder)
+
+        folders = [os.path.join(video_folder, channel["folder"]) for channel in load_channel_list()]
+        reports = [retention_report(folder, settings) for folder in folders if os.path.isdir(folder)]
+        messagebox.showinfo("Cleanup Preview", format_report(reports) or "No downloaded videos yet.", parent=self)
+
     def browse_folder(self):
         folder_selected = filedialog.askdirectory()
         if folder_selected:
@@ -263,7 +281,7 @@ class SettingsWindow(tk.Toplevel):
 
     def on_closing(self):
         self.settings["settings_window_geometry"] = self.geometry()
-        save_settings(self.settings)
+        save_settings(self.settings, defer=True)
         self.destroy()
 
     def open_help(self):
@@ -1,15 +1,7 @@
-from app.backend.config import load_settings, load_channels
-from app.backend.downloader import get_next_saturday, find_video_url, download_video, delete_old_videos
+import sys
 
-settings, _ = load_settings()
-channels = load_channels()
+from app.backend.__main__ import main
 
-channel_url = channels["channel_1"]["url"]
-expected_date = get_next_saturday()
-video_url, match_info = find_video_url(channel_url, expected_date)
-
-if video_url:
-    delete_old_videos(settings["video_folder"], settings["keep_old_videos"])
-    download_video(video_url, settings["video_folder"])
-else:
-    print("No video found for next Saturday.")
+# Kept for old shortcuts and scripts; same as `python -m app.backend --once`
+if __name__ == "__main__":
+    sys.exit(main(["--once", *sys.argv[1:]]))
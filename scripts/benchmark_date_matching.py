@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmarks title date matching on a synthetic 5,000-title channel.
+
+Compares the original per-variant substring loop against DateMatcher and
+checks that both classify every title identically.
+
+Usage: python scripts/benchmark_date_matching.py [--titles N] [--repeat N]
+"""
+import os
+import sys
+import random
+import argparse
+import timeit
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.backend.downloader import (
+    DateMatcher, format_romanian_date, _build_date_variants, _normalize_date_in_text
+)
+
+EXPECTED_DATE = date(2024, 7, 13)
+
+
+def legacy_classify(title, exact_parts, date_variants):
+    """The matching loop find_video_url used before DateMatcher."""
+    title_lower = title.lower()
+    if "diaspora" in title_lower:
+        return None
+    if any(part in title_lower for part in exact_parts):
+        return {"type": "exact", "offset": 0}
+    normalized_title = _normalize_date_in_text(title_lower)
+    for variant, offset in date_variants.items():
+        if variant in title_lower or variant in normalized_title:
+            reason = []
+            if offset != 0:
+                reason.append(f"date is off by {abs(offset)} day ({'before' if offset < 0 else 'after'} Sabbath)")
+            if variant in normalized_title and variant not in title_lower:
+                reason.append("delimiter mismatch in date format")
+            if offset == 0 and variant not in exact_parts and not reason:
+                reason.append("non-standard date format")
+            if reason:
+                return {"type": "fuzzy", "offset": offset, "reason": "; ".join(reason)}
+    return None
+
+
+def make_titles(count, seed=42):
+    """Titles for a weekly channel going back `count` uploads, with mixed date styles."""
+    rng = random.Random(seed)
+    templates = [
+        "Serviciu divin {date} | Biserica Adventista",
+        "Studiu biblic - {date}",
+        "{date} - Predica de Sabat",
+        "Program Diaspora {date}",
+        "Concert de muzica crestina",
+        "Live {date} Tineret",
+    ]
+    titles = []
+    for i in range(count):
+        d = EXPECTED_DATE - timedelta(days=i // 2 + rng.choice([-1, 0, 0, 0, 1]))
+        styles = [
+            d.strftime("%d.%m.%Y"),
+            f"{d.day}.{d.month}.{d.year}",
+            format_romanian_date(d).capitalize(),
+            d.strftime("%d %m %Y"),
+            d.strftime("%d,%m.%Y"),
+        ]
+        titles.append(rng.choice(templates).format(date=rng.choice(styles)))
+    return titles
+
+
+def run_benchmark(title_count=5000, repeat=5):
+    titles = make_titles(title_count)
+    date_format = "%d.%m.%Y"
+    exact_parts = {EXPECTED_DATE.strftime(date_format).lower(), format_romanian_date(EXPECTED_DATE).lower()}
+    date_variants = _build_date_variants(EXPECTED_DATE)
+    matcher = DateMatcher(EXPECTED_DATE, date_format)
+
+    legacy = [legacy_classify(t, exact_parts, date_variants) for t in titles]
+    current = [matcher.classify(t) for t in titles]
+    mismatches = sum(1 for a, b in zip(legacy, current) if a != b)
+
+    legacy_time = min(timeit.repeat(
+        lambda: [legacy_classify(t, exact_parts, date_variants) for t in titles], number=1, repeat=repeat))
+    matcher_time = min(timeit.repeat(
+        lambda: [matcher.classify(t) for t in titles], number=1, repeat=repeat))
+
+    print("=" * 60)
+    print("YoutubeWeekly Date Matching Benchmark")
+    print("=" * 60)
+    print(f"Titles:        {title_count}")
+    print(f"Matches:       {sum(1 for r in current if r)}")
+    print(f"Legacy loop:   {legacy_time * 1000:.1f} ms")
+    print(f"DateMatcher:   {matcher_time * 1000:.1f} ms")
+    print(f"Speed-up:      {legacy_time / matcher_time:.2f}x")
+    print(f"Mismatches:    {mismatches}")
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--titles", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    sys.exit(0 if run_benchmark(args.titles, args.repeat) else 1)
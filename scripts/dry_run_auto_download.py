@@ -77,7 +77,7 @@ def run_dry_run(day_name="friday"):
              patch("app.backend.auto_downloader.AUTO_DOWNLOAD_LOG_FILE", log_path), \
              patch("app.backend.auto_downloader.find_video_url") as mock_find, \
              patch("app.backend.auto_downloader.download_video") as mock_download, \
-             patch("app.backend.auto_downloader.delete_old_videos"):
+             patch("app.backend.auto_downloader.apply_retention"):
 
             mock_find.return_value = ("https://youtube.com/watch?v=fake123", {"type": "exact", "title": "Fake Video"})
             mock_download.return_value = None  # Success
@@ -96,11 +96,16 @@ def run_dry_run():
 
     # Step 5: Executable paths
     print("\n[Bonus] Checking executable paths...")
-    paths, path_warnings = get_default_executable_paths()
+    from app.backend.executables import get_executable_info
+    paths, path_warnings = get_default_executable_paths(settings)
     print(f"  mpv: {paths['mpv_path'] or '(not found)'}")
     print(f"  ffmpeg: {paths['ffmpeg_path'] or '(not found)'}")
     for w in path_warnings:
         print(f"  INFO: {w}")
+    for name in ("mpv", "ffmpeg"):
+        info = get_executable_info(name, settings.get(f"{name}_path"))
+        if info:
+            print(f"  {name} ({info['source']}): {info['version'] or '(version unknown)'}")
 
     print("\n" + "=" * 60)
     print("DRY RUN PASSED")
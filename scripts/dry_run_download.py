@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Dry-run simulation of the download pipeline.
-Tests find_video_url → download_video → delete_old_videos with mocked yt-dlp.
+Tests find_video_url → download_video → apply_retention with mocked yt-dlp.
 
 Usage: python scripts/dry_run_download.py [--channel colecta|scoala_de_sabat|all]
 """
@@ -9,13 +9,15 @@ import argparse
 import os
 import sys
 import tempfile
+import time
 from unittest.mock import patch, MagicMock
 
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.backend.config import load_settings, load_channels
-from app.backend.downloader import find_video_url, get_next_saturday, delete_old_videos, format_romanian_date
+from app.backend.downloader import find_video_url, get_next_saturday, format_romanian_date
+from app.backend.retention import apply_retention
 from datetime import datetime
 
 
@@ -82,14 +84,16 @@ def run_dry_run(channel_filter="all"):
             "title": f"Weekly Video {expected_date}",
         })
 
+    cache_dir = tempfile.mkdtemp(prefix="ytw_dry_run_cache_")
     for i, ch in enumerate(channels):
         print(f"\n  --- {ch['name']} ---")
         fmt = ch["date_format"]
         expected_date = get_next_saturday(date_format=fmt)
         print(f"  Looking for date: {expected_date}")
 
-        # Mock yt-dlp
-        with patch("app.backend.downloader.yt_dlp.YoutubeDL") as mock_ydl_class:
+        # Mock yt-dlp, keeping the simulated listing out of the real channel cache
+        with patch("yt_dlp.YoutubeDL") as mock_ydl_class, \
+             patch("app.backend.channel_cache.CHANNEL_CACHE_DIR", cache_dir):
             mock_ydl = MagicMock()
             mock_ydl_class.return_value.__enter__.return_value = mock_ydl
             mock_ydl.extract_info.return_value = {"entries": [fake_entries[i]]}
@@ -107,14 +111,16 @@ def run_dry_run(channel_filter="all"):
         print(f"  Would use quality: {settings.get('default_quality', '1080p')}")
 
     # Step 5: Test delete logic with temp dir
-    print("\n[5/5] Testing delete_old_videos logic...")
+    print("\n[5/5] Testing apply_retention logic...")
     with tempfile.TemporaryDirectory() as tmpdir:
-        # Create dummy files
-        for name in ["old1.mp4", "old2.mp4", "keep.txt"]:
+        # Create dummy files; new.mp4 is the newest and is kept
+        for name in ["old1.mp4", "old2.mp4", "keep.txt", "new.mp4"]:
             open(os.path.join(tmpdir, name), "w").close()
+        stamp = time.time() + 60
+        os.utime(os.path.join(tmpdir, "new.mp4"), (stamp, stamp))
 
         before = os.listdir(tmpdir)
-        delete_old_videos(tmpdir, keep_old=False)
+        apply_retention(tmpdir, {"keep_old_videos": False})
         after = os.listdir(tmpdir)
 
         deleted = set(before) - set(after)
@@ -123,10 +129,10 @@ def run_dry_run(channel_filter="all"):
         print(f"  Kept: {kept}")
 
         if "keep.txt" not in kept:
-            print(f"  FAIL: Non-mp4 file was deleted!")
+            print(f"  FAIL: Non-video file was deleted!")
             return 1
         if deleted != {"old1.mp4", "old2.mp4"}:
-            print(f"  FAIL: Expected to delete mp4 files only")
+            print(f"  FAIL: Expected to delete every video but the newest")
             return 1
         print("  OK - Delete logic works correctly")
 
@@ -56,7 +56,7 @@ def run_dry_run():
     mock_response.json.return_value = mock_release
     mock_response.raise_for_status = MagicMock()
 
-    with patch("app.backend.updater.requests.get", return_value=mock_response):
+    with patch("requests.get", return_value=mock_response):
         is_new, version, url, assets = check_for_updates()
 
     if not is_new:
@@ -87,7 +87,7 @@ def run_dry_run():
         mock_dl_response.raise_for_status = MagicMock()
 
         progress_values = []
-        with patch("app.backend.updater.requests.get", return_value=mock_dl_response):
+        with patch("requests.get", return_value=mock_dl_response):
             result = download_update(asset_url, dest, progress_callback=progress_values.append)
 
         if not os.path.exists(result):
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Reports how long importing the GUI module takes and which modules cost the most.
+
+Runs `python -X importtime -c "import app.frontend.gui"` in a fresh interpreter
+and summarizes its output. Heavy third-party packages (yt-dlp, requests,
+screeninfo, PIL, pystray, plyer) are imported when first needed, so they should
+not show up here; any that do are listed as a warning.
+
+Usage: python scripts/import_time_report.py [--module NAME] [--top N]
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Packages that must not be loaded before the window is shown
+HEAVY_MODULES = ("yt_dlp", "requests", "screeninfo", "PIL", "pystray", "plyer")
+
+
+def measure_imports(module):
+    """Import `module` in a fresh interpreter; returns [(self_us, cumulative_us, name)]."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue  # the header line
+        timings.append((self_us, cumulative_us, fields[2].strip()))
+    return timings
+
+
+def heavy_modules_loaded(timings):
+    return sorted({name.split(".")[0] for _, _, name in timings if name.split(".")[0] in HEAVY_MODULES})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report import time of the GUI module")
+    parser.add_argument("--module", default="app.frontend.gui", help="module to import")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest modules to list")
+    args = parser.parse_args()
+
+    timings = measure_imports(args.module)
+    total_us = sum(self_us for self_us, _, _ in timings)
+    print(f"import {args.module}: {total_us / 1000:.1f} ms, {len(timings)} modules")
+    print()
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    for self_us, cumulative_us, name in sorted(timings, reverse=True)[:args.top]:
+        print(f"{self_us / 1000:9.1f} {cumulative_us / 1000:9.1f}  {name}")
+
+    heavy = heavy_modules_loaded(timings)
+    if heavy:
+        print()
+        print(f"WARNING: loaded at import time: {', '.join(heavy)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,39 @@
 import sys
+import pytest
 from unittest.mock import MagicMock
 
 # Mock pystray before any test imports gui.py, to avoid Xlib dependency in headless environments
 if 'pystray' not in sys.modules:
     sys.modules['pystray'] = MagicMock()
     sys.modules['pystray._base'] = MagicMock()
+
+
+@pytest.fixture(autouse=True)
+def isolated_channel_cache(tmp_path, monkeypatch):
+    """Keep the on-disk channel listing cache out of the user's config dir."""
+    monkeypatch.setattr("app.backend.channel_cache.CHANNEL_CACHE_DIR", str(tmp_path / "channel_cache"))
+
+
+@pytest.fixture(autouse=True)
+def isolated_download_archive(tmp_path, monkeypatch):
+    """Keep per-folder download archives out of the user's config dir."""
+    monkeypatch.setattr("app.backend.download_archive.DOWNLOAD_ARCHIVE_DIR", str(tmp_path / "download_archive"))
+
+
+@pytest.fixture(autouse=True)
+def isolated_executable_info(tmp_path, monkeypatch):
+    """Keep probed ffmpeg/mpv info out of the user's config dir."""
+    monkeypatch.setattr("app.backend.executables.EXECUTABLE_INFO_FILE", str(tmp_path / "executables.json"))
+    monkeypatch.setattr("app.backend.executables._info_cache", None)
+
+
+@pytest.fixture(autouse=True)
+def isolated_protected_videos(tmp_path, monkeypatch):
+    """Keep the protected-videos index out of the user's config dir.
+
+    The file starts out empty so the one-time migration never touches the real settings.json.
+    """
+    index_path = tmp_path / "protected_videos.json"
+    index_path.write_text("{}")
+    monkeypatch.setattr("app.backend.protected_videos.PROTECTED_VIDEOS_FILE", str(index_path))
+    monkeypatch.setattr("app.backend.protected_videos._loaded", None)
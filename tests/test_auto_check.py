@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from app.backend.auto_check import AutoCheckScheduler, check_interval, DEFAULT_AUTO_CHECK_SCHEDULE, MAX_BACKOFF_MINUTES
+
+
+@pytest.mark.parametrize("now, expected", [
+    (datetime(2025, 7, 16, 9, 0), None),      # Wednesday
+    (datetime(2025, 7, 18, 9, 0), 30),        # Friday
+    (datetime(2025, 7, 19, 8, 0), 10),        # Saturday morning
+    (datetime(2025, 7, 19, 12, 0), 30),       # Saturday afternoon
+])
+def test_default_schedule(now, expected):
+    assert check_interval(DEFAULT_AUTO_CHECK_SCHEDULE, now) == expected
+
+
+def test_invalid_rule_is_skipped():
+    schedule = [{"day": "friday", "every_minutes": "often"}, {"day": "friday", "every_minutes": 5}]
+    assert check_interval(schedule, datetime(2025, 7, 18, 9, 0)) == 5
+
+
+class _Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def checks():
+    clock = _Clock(datetime(2025, 7, 18, 9, 0))
+    calls = []
+
+    def fake_run(settings, channels, notify, should_check=None, announce=True, **kwargs):
+        checked = [key for key in ("colecta", "scoala_de_sabat") if should_check(key)]
+        calls.append((checked, announce))
+        return {key: ("downloaded" if key == "scoala_de_sabat" else "not_found") for key in checked}
+
+    with patch("app.backend.auto_check.run_automatic_checks", side_effect=fake_run), \
+         patch("app.backend.auto_check.load_settings", return_value=({}, [])), \
+         patch("app.backend.auto_check.get_current_sabbath_date", return_value="2025-07-19"):
+        yield AutoCheckScheduler([], lambda *a, **k: None, clock=clock), clock, calls
+
+
+def test_not_found_channels_back_off(checks):
+    scheduler, clock, calls = checks
+
+    for _ in range(8):
+        scheduler.run_once(30)
+        clock.now += timedelta(minutes=30)
+
+    # Looked up after 0, 30, 90 and 210 minutes; the found channel is not retried by the scheduler itself
+    colecta_runs = [i for i, (checked, _) in enumerate(calls) if "colecta" in checked]
+    assert colecta_runs == [0, 1, 3, 7]
+    # Only the first run of the week notifies that checks started
+    assert [announce for _, announce in calls] == [True] + [False] * 7
+
+
+def test_backoff_is_capped_and_reset_by_new_week(checks):
+    scheduler, clock, calls = checks
+    scheduler.run_once(30)
+    scheduler._backoff["colecta"] = (10, None)
+    scheduler.run_once(30)
+    failures, not_before = scheduler._backoff["colecta"]
+    assert failures == 11
+    assert timedelta(minutes=MAX_BACKOFF_MINUTES - 1) < not_before - clock.now <= timedelta(minutes=MAX_BACKOFF_MINUTES)
+
+    with patch("app.backend.auto_check.get_current_sabbath_date", return_value="2025-07-26"):
+        scheduler.run_once(30)
+    assert calls[-1] == (["colecta", "scoala_de_sabat"], True)
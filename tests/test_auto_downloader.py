@@ -3,6 +3,7 @@ from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
 import json
 import os
+import threading
 
 from app.backend.auto_downloader import (
     load_auto_download_log,
@@ -180,4 +181,149 @@ def test_run_automatic_checks_saturday_partial_download(mock_download_video, moc
 
     log = load_auto_download_log()
     assert log["2025-07-19"]["colecta"] == "downloaded"
-    assert log["2025-07-19"]["scoala_de_sabat"] == "downloaded"
\ No newline at end of file
+    assert log["2025-07-19"]["scoala_de_sabat"] == "downloaded"
+
+
+@patch("app.backend.auto_downloader.apply_retention")
+@patch("app.backend.auto_downloader.find_video_url")
+@patch("app.backend.auto_downloader.download_video")
+def test_run_automatic_checks_processes_channels_in_parallel(mock_download_video, mock_find_video_url, mock_delete,
+                                                             mock_settings_file, mock_auto_download_log_file, mock_channels_data,
+                                                             mock_send_notification, monkeypatch):
+    monkeypatch.setattr("app.backend.config.SETTINGS_FILE", str(mock_settings_file))
+
+    mock_today = datetime(2025, 7, 18) # Friday
+    class MockDatetime(datetime):
+        @classmethod
+        def now(cls):
+            return mock_today
+    monkeypatch.setattr("app.backend.auto_downloader.datetime", MockDatetime)
+
+    settings = load_settings_from_path(mock_settings_file)
+    settings["max_parallel_channels"] = 2
+    save_settings_to_path(mock_settings_file, settings)
+
+    # Both downloads must be in flight at once for the barrier to release
+    barrier = threading.Barrier(2, timeout=5)
+    progress_events = []
+
+    def fake_download(url, folder, quality, protect=False, progress_hook=None, session=None):
+        barrier.wait()
+        progress_hook({"status": "finished"})
+        return None
+
+    mock_find_video_url.side_effect = lambda url, date, **kwargs: (url + "/watch", {"type": "exact", "title": "Video"})
+    mock_download_video.side_effect = fake_download
+
+    run_automatic_checks(settings, mock_channels_data, mock_send_notification, progress_hook=progress_events.append)
+
+    assert sorted(e["channel"] for e in progress_events) == ["colecta", "scoala_de_sabat"]
+    log = load_auto_download_log()
+    assert log["2025-07-19"] == {"colecta": "downloaded", "scoala_de_sabat": "downloaded"}
+    title, message = mock_send_notification.call_args.args[:2]
+    assert title == "Auto Download Complete"
+
+
+@patch("app.backend.auto_downloader.apply_retention")
+@patch("app.backend.auto_downloader.find_video_url")
+@patch("app.backend.auto_downloader.download_video")
+def test_run_automatic_checks_survives_cancelled_download(mock_download_video, mock_find_video_url, mock_retention,
+                                                          mock_settings_file, mock_auto_download_log_file, mock_channels_data,
+                                                          mock_send_notification, monkeypatch):
+    from app.backend.scheduler import DownloadScheduler
+    monkeypatch.setattr("app.backend.config.SETTINGS_FILE", str(mock_settings_file))
+    # A scheduler of its own: idle workers left by other tests would run the queued download
+    scheduler = DownloadScheduler(max_downloads=1)
+    monkeypatch.setattr("app.backend.auto_downloader.get_scheduler", lambda: scheduler)
+
+    mock_today = datetime(2025, 7, 18) # Friday
+    class MockDatetime(datetime):
+        @classmethod
+        def now(cls):
+            return mock_today
+    monkeypatch.setattr("app.backend.auto_downloader.datetime", MockDatetime)
+
+    settings = load_settings_from_path(mock_settings_file)
+    settings["max_parallel_channels"] = 1
+    save_settings_to_path(mock_settings_file, settings)
+
+    def queued_download(key):
+        return any(t["key"] == key and t["stage"] == "download" and t["state"] == "queued" for t in scheduler.status())
+
+    def fake_download(url, folder, quality, protect=False, progress_hook=None, session=None):
+        other = ("auto", "scoala_de_sabat" if folder.endswith("colecta") else "colecta")
+        for _ in range(500):
+            if queued_download(other):
+                break
+            threading.Event().wait(0.01)
+        # Cancelling the channel in the window leaves the automatic check's work alone
+        assert not scheduler.cancel(other[1])
+        assert scheduler.cancel(other)
+        return None
+
+    mock_find_video_url.side_effect = lambda url, date, **kwargs: (url + "/watch", {"type": "exact", "title": "Video"})
+    mock_download_video.side_effect = fake_download
+
+    statuses = run_automatic_checks(settings, mock_channels_data, mock_send_notification)
+
+    assert sorted(statuses.values()) == ["cancelled", "downloaded"]
+    assert load_settings_from_path(mock_settings_file)["last_sabbath_checked"] == "2025-07-19"
+    assert mock_send_notification.call_args.args[0] == "Auto Download Partially Complete"
+
+
+@patch("app.backend.auto_downloader.find_video_url")
+@patch("app.backend.auto_downloader.download_video")
+def test_run_automatic_checks_keeps_settings_saved_during_the_run(mock_download_video, mock_find_video_url,
+                                                                  mock_settings_file, mock_auto_download_log_file,
+                                                                  mock_channels_data, mock_send_notification, monkeypatch):
+    monkeypatch.setattr("app.backend.config.SETTINGS_FILE", str(mock_settings_file))
+
+    mock_today = datetime(2025, 7, 18) # Friday
+    class MockDatetime(datetime):
+        @classmethod
+        def now(cls):
+            return mock_today
+    monkeypatch.setattr("app.backend.auto_downloader.datetime", MockDatetime)
+
+    settings = load_settings_from_path(mock_settings_file)
+
+    def download_while_user_edits(url, folder, quality, protect=False, progress_hook=None, session=None):
+        # The Settings window saves while the run is downloading
+        edited = load_settings_from_path(mock_settings_file)
+        edited["default_quality"] = "720p"
+        save_settings(edited)
+        return None
+
+    mock_find_video_url.side_effect = lambda url, date, **kwargs: (url + "/watch", {"type": "exact", "title": "Video"})
+    mock_download_video.side_effect = download_while_user_edits
+
+    run_automatic_checks(settings, mock_channels_data, mock_send_notification)
+
+    updated_settings = load_settings_from_path(mock_settings_file)
+    assert updated_settings["last_sabbath_checked"] == "2025-07-19"
+    assert updated_settings["default_quality"] == "720p"
+
+
+@patch("app.backend.auto_downloader.find_video_url")
+@patch("app.backend.auto_downloader.download_video")
+def test_run_automatic_checks_reports_unreachable_channels(mock_download_video, mock_find_video_url,
+                                                           mock_settings_file, mock_auto_download_log_file,
+                                                           mock_channels_data, mock_send_notification, monkeypatch):
+    monkeypatch.setattr("app.backend.config.SETTINGS_FILE", str(mock_settings_file))
+
+    mock_today = datetime(2025, 7, 18) # Friday
+    class MockDatetime(datetime):
+        @classmethod
+        def now(cls):
+            return mock_today
+    monkeypatch.setattr("app.backend.auto_downloader.datetime", MockDatetime)
+
+    mock_find_video_url.return_value = (None, {"type": "unreachable", "reason": "offline"})
+
+    statuses = run_automatic_checks(load_settings_from_path(mock_settings_file), mock_channels_data,
+                                    mock_send_notification, announce=False)
+
+    assert statuses == {"colecta": "unreachable", "scoala_de_sabat": "unreachable"}
+    mock_download_video.assert_not_called()
+    # Like "not found", being offline is retried quietly
+    mock_send_notification.assert_not_called()
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+from concurrent.futures import Future
+from unittest.mock import patch
+
+import pytest
+
+from app.backend import __main__ as headless
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_headless_mode_never_imports_gui_modules():
+    code = (
+        "import sys, app.backend.__main__; "
+        "print(','.join(m for m in ('tkinter', 'PIL', 'pystray', 'plyer', 'app.frontend') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+@pytest.mark.parametrize("results, exit_code", [
+    ({"colecta": "downloaded"}, 0), ({"colecta": "not_found"}, 0), ({"colecta": "error"}, 1), ({"colecta": "unreachable"}, 1)
+])
+def test_once_runs_a_single_check(tmp_path, results, exit_code):
+    with patch.object(headless, "setup_logger") as mock_logger, \
+         patch.object(headless, "load_settings", return_value=({"enable_auto_download": True}, [])), \
+         patch.object(headless, "load_channel_list", return_value=[]), \
+         patch("app.backend.downloader.find_resumable_downloads", return_value=[]), \
+         patch.object(headless.AutoCheckScheduler, "run_once", return_value=results) as mock_run, \
+         patch.object(headless.AutoCheckScheduler, "run_forever") as mock_forever:
+        assert headless.main(["--once", "--log-folder", str(tmp_path)]) == exit_code
+
+    mock_logger.assert_called_once_with(str(tmp_path))
+    mock_run.assert_called_once()
+    mock_forever.assert_not_called()
+
+
+@pytest.mark.parametrize("cancelled, exit_code", [(True, 0), (False, 1)])
+def test_once_ignores_cancelled_resume_tasks(tmp_path, cancelled, exit_code):
+    future = Future()
+    if cancelled:
+        future.cancel()
+        future.set_running_or_notify_cancel()
+    else:
+        future.set_result("error")
+    with patch.object(headless, "setup_logger"), \
+         patch.object(headless, "load_settings", return_value=({"enable_auto_download": True}, [])), \
+         patch.object(headless, "load_channel_list", return_value=[]), \
+         patch.object(headless, "_resume_partial_downloads", return_value=[future]), \
+         patch.object(headless.AutoCheckScheduler, "run_once", return_value={}):
+        assert headless.main(["--once", "--log-folder", str(tmp_path)]) == exit_code
@@ -0,0 +1,74 @@
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+
+from app.backend.bandwidth import TokenBucket, BandwidthManager, BackgroundTransfer, limit_for_time
+
+
+SETTINGS = {
+    "background_speed_limit_kb_s": 100,
+    "background_speed_windows": [
+        {"start": "23:00", "end": "07:00", "limit_kb_s": 0},
+        {"start": "08:00", "end": "18:00", "limit_kb_s": 500},
+    ],
+}
+
+
+def test_limit_follows_time_windows():
+    assert limit_for_time(SETTINGS, datetime(2024, 7, 15, 2, 30)) is None  # overnight window wraps midnight
+    assert limit_for_time(SETTINGS, datetime(2024, 7, 15, 12, 0)) == 500 * 1024
+    assert limit_for_time(SETTINGS, datetime(2024, 7, 15, 20, 0)) == 100 * 1024
+    assert limit_for_time({}, datetime(2024, 7, 15, 12, 0)) is None
+
+
+def test_invalid_window_is_skipped():
+    settings = {"background_speed_limit_kb_s": 50, "background_speed_windows": [{"start": "noon"}]}
+    assert limit_for_time(settings, datetime(2024, 7, 15, 12, 0)) == 50 * 1024
+
+
+def test_token_bucket_sleeps_off_overdraft():
+    clock = [100.0]
+    sleeps = []
+    with patch("app.backend.bandwidth.time.monotonic", side_effect=lambda: clock[0]), \
+         patch("app.backend.bandwidth.time.sleep", side_effect=sleeps.append):
+        bucket = TokenBucket(1000)
+        bucket.consume(1000)  # the initial one-second burst is free
+        bucket.consume(500)
+        bucket.consume(500)
+    # Two callers drawing on one bucket both wait, so their combined rate is the cap
+    assert sleeps == [0.5, 1.0]
+
+
+def test_transfer_charges_only_new_bytes_per_stream():
+    manager = MagicMock()
+    transfer = BackgroundTransfer(manager)
+    transfer({"status": "downloading", "downloaded_bytes": 100, "info_dict": {"format_id": "137"}})
+    transfer({"status": "downloading", "downloaded_bytes": 40, "info_dict": {"format_id": "140"}})
+    transfer({"status": "downloading", "downloaded_bytes": 250, "info_dict": {"format_id": "137"}})
+    transfer({"status": "finished", "downloaded_bytes": 250, "info_dict": {"format_id": "137"}})
+    assert [c.args[0] for c in manager.consume.call_args_list] == [100, 40, 150]
+
+
+def test_manager_shares_one_bucket_between_running_downloads():
+    clock = [100.0]
+    sleeps = []
+    with patch("app.backend.bandwidth.load_settings", return_value=({"background_speed_limit_kb_s": 1000}, [])), \
+         patch("app.backend.bandwidth.time.monotonic", side_effect=lambda: clock[0]), \
+         patch("app.backend.bandwidth.time.sleep", side_effect=sleeps.append):
+        manager = BandwidthManager()
+        first = manager.transfer()
+        second = manager.transfer()
+        first({"status": "downloading", "downloaded_bytes": 1000 * 1024, "filename": "a"})
+        second({"status": "downloading", "downloaded_bytes": 1000 * 1024, "filename": "b"})
+        # A second later the refilled bucket is all there for whichever download draws on it
+        clock[0] += 1
+        second({"status": "downloading", "downloaded_bytes": 2000 * 1024, "filename": "b"})
+    assert sleeps == [1.0, 1.0]
+
+
+def test_manager_unlimited_never_sleeps():
+    with patch("app.backend.bandwidth.load_settings", return_value=({}, [])), \
+         patch("app.backend.bandwidth.time.sleep") as mock_sleep:
+        manager = BandwidthManager()
+        manager.transfer()
+        manager.consume(10 ** 9)
+    mock_sleep.assert_not_called()
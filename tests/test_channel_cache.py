@@ -0,0 +1,183 @@
+import time
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+from app.backend.channel_cache import (
+    load_channel_cache,
+    save_channel_cache,
+    is_fresh,
+    evict_video,
+    FULL_REFRESH_DAYS,
+)
+from app.backend.downloader import find_video_url, download_video
+
+CHANNEL = "http://example.com/channel"
+
+
+def _entries(*pairs):
+    return [{"id": vid, "title": title, "upload_date": None} for vid, title in pairs]
+
+
+@pytest.fixture
+def mock_ydl():
+    with patch("yt_dlp.YoutubeDL") as mock_ydl_class:
+        instance = MagicMock()
+        mock_ydl_class.return_value.__enter__.return_value = instance
+        instance.opts = lambda: mock_ydl_class.call_args.args[0]
+        yield instance
+
+
+def test_save_and_load_roundtrip():
+    entries = _entries(("a", "Video 15.07.2024"))
+    save_channel_cache(CHANNEL, entries)
+    cache = load_channel_cache(CHANNEL)
+    assert cache["entries"] == entries
+    assert is_fresh(cache, ttl_minutes=30)
+
+
+def test_load_missing_cache_returns_none():
+    assert load_channel_cache("http://example.com/unknown") is None
+
+
+def test_stale_cache_is_not_fresh():
+    cache = save_channel_cache(CHANNEL, [])
+    cache["fetched_at"] = time.time() - 31 * 60
+    assert not is_fresh(cache, ttl_minutes=30)
+
+
+def test_fresh_cache_exact_match_skips_network(mock_ydl):
+    save_channel_cache(CHANNEL, _entries(("a", "Video 15.07.2024")))
+    url, match_info = find_video_url(CHANNEL, "15.07.2024")
+    assert url == "https://www.youtube.com/watch?v=a"
+    assert match_info["type"] == "exact"
+    mock_ydl.extract_info.assert_not_called()
+
+
+def test_cache_miss_reads_only_new_uploads(mock_ydl):
+    old = _entries(*[(f"old{i}", f"Old video {i}") for i in range(5)])
+    save_channel_cache(CHANNEL, old)
+    consumed = []
+
+    def listing():
+        for entry in _entries(("new", "Video 15.07.2024")) + old:
+            consumed.append(entry["id"])
+            yield entry
+
+    mock_ydl.extract_info.return_value = {"entries": listing()}
+
+    url, _ = find_video_url(CHANNEL, "15.07.2024")
+
+    assert url == "https://www.youtube.com/watch?v=new"
+    # Reading stops as soon as the cached listing is reached
+    assert consumed == ["new", "old0"]
+    assert [e["id"] for e in load_channel_cache(CHANNEL)["entries"]] == ["new"] + [e["id"] for e in old]
+
+
+def test_lookup_stops_at_first_match(mock_ydl):
+    consumed = []
+
+    def listing():
+        for i, title in enumerate(["Other", "Video 15.07.2024", "Older", "Oldest"]):
+            consumed.append(i)
+            yield {"id": f"v{i}", "title": title}
+
+    mock_ydl.extract_info.return_value = {"entries": listing()}
+
+    url, match_info = find_video_url(CHANNEL, "15.07.2024")
+
+    assert url == "https://www.youtube.com/watch?v=v1"
+    assert consumed == [0, 1]
+    assert mock_ydl.extract_info.call_args.kwargs["process"] is False
+    assert mock_ydl.opts()["lazy_playlist"] is True
+    assert load_channel_cache(CHANNEL)["complete"] is False
+
+
+def test_lookup_depth_grows_with_target_age(mock_ydl, monkeypatch):
+    monkeypatch.setattr("app.backend.downloader.LOOKUP_BASE_ENTRIES", 5)
+    monkeypatch.setattr("app.backend.downloader.LOOKUP_ENTRIES_PER_WEEK", 5)
+    consumed = []
+
+    def listing():
+        for i in range(100):
+            consumed.append(i)
+            yield {"id": f"v{i}", "title": f"Unrelated {i}"}
+
+    mock_ydl.extract_info.side_effect = lambda *args, **kwargs: {"entries": listing()}
+
+    today = datetime.today().date()
+    find_video_url(CHANNEL, today.strftime("%d.%m.%Y"))
+    assert len(consumed) == 5
+
+    consumed.clear()
+    save_channel_cache(CHANNEL, [])  # Forget the listing so the second lookup starts over
+    find_video_url(CHANNEL, (today - timedelta(weeks=4)).strftime("%d.%m.%Y"))
+    assert len(consumed) == 25
+
+
+def test_exhausted_listing_is_marked_complete(mock_ydl):
+    mock_ydl.extract_info.return_value = {"entries": _entries(("a", "Unrelated"))}
+    url, _ = find_video_url(CHANNEL, "15.07.2024")
+    assert url is None
+    assert load_channel_cache(CHANNEL)["complete"] is True
+
+
+def test_offline_falls_back_to_stale_cache(mock_ydl):
+    cache_entries = _entries(("a", "Video 14.07.2024"))
+    save_channel_cache(CHANNEL, cache_entries)
+    mock_ydl.extract_info.side_effect = Exception("offline")
+
+    url, match_info = find_video_url(CHANNEL, "15.07.2024")
+
+    assert url == "https://www.youtube.com/watch?v=a"
+    assert match_info["type"] == "fuzzy"
+
+
+def test_offline_without_cache_is_reported(mock_ydl):
+    mock_ydl.extract_info.side_effect = Exception("offline")
+
+    url, match_info = find_video_url(CHANNEL, "15.07.2024")
+
+    assert url is None
+    assert match_info == {"type": "unreachable", "reason": "offline"}
+
+
+
+def test_old_listing_is_read_from_scratch(mock_ydl):
+    # "gone" was deleted from the channel after it was cached
+    save_channel_cache(CHANNEL, _entries(("new", "Other"), ("gone", "Video 15.07.2024")), complete=True,
+                       refreshed_at=time.time() - (FULL_REFRESH_DAYS + 1) * 24 * 3600)
+    mock_ydl.extract_info.return_value = {"entries": iter(_entries(("new", "Other"), ("older", "Unrelated")))}
+
+    url, _ = find_video_url(CHANNEL, "15.07.2024")
+
+    assert url is None
+    cache = load_channel_cache(CHANNEL)
+    assert [e["id"] for e in cache["entries"]] == ["new", "older"]
+    assert time.time() - cache["refreshed_at"] < 60
+
+
+def test_merge_keeps_refresh_time(mock_ydl):
+    refreshed_at = time.time() - 24 * 3600
+    save_channel_cache(CHANNEL, _entries(("old", "Other")), refreshed_at=refreshed_at)
+    mock_ydl.extract_info.return_value = {"entries": iter(_entries(("new", "Video 15.07.2024"), ("old", "Other")))}
+    find_video_url(CHANNEL, "15.07.2024")
+    assert load_channel_cache(CHANNEL)["refreshed_at"] == refreshed_at
+
+
+def test_unavailable_video_is_evicted(mock_ydl, tmp_path):
+    import yt_dlp
+    save_channel_cache(CHANNEL, _entries(("abc", "Video 15.07.2024"), ("def", "Other")))
+    mock_ydl.extract_info.side_effect = yt_dlp.utils.DownloadError("ERROR: [youtube] abc: Video unavailable")
+
+    error = download_video("https://www.youtube.com/watch?v=abc", str(tmp_path / "videos"))
+
+    assert "Video unavailable" in error
+    assert [e["id"] for e in load_channel_cache(CHANNEL)["entries"]] == ["def"]
+
+
+def test_evict_video_leaves_other_listings_alone():
+    save_channel_cache(CHANNEL, _entries(("abc", "Video")))
+    save_channel_cache("http://example.com/other", _entries(("def", "Video")))
+    evict_video("abc")
+    assert load_channel_cache(CHANNEL)["entries"] == []
+    assert len(load_channel_cache("http://example.com/other")["entries"]) == 1
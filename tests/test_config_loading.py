@@ -1,5 +1,10 @@
 import pytest
 import json
+import os
+import sys
+import subprocess
+from unittest.mock import patch
+from app.backend import config
 from app.backend.config import load_settings, load_channels, save_settings
 
 # Mock settings file for testing
@@ -107,3 +112,81 @@ def test_load_channels():
     channels = load_channels()
     assert "channel_1" in channels, "Missing 'channel_1' in channels"
     assert "url" in channels["channel_1"], "Channel URL is missing"
+
+
+def test_importing_config_touches_no_files(tmp_path):
+    home = tmp_path / "home"
+    home.mkdir()
+    env = dict(os.environ, HOME=str(home), APPDATA=str(home))
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    subprocess.run([sys.executable, "-c", "import app.backend.config"], cwd=root, env=env, check=True)
+    assert list(home.iterdir()) == []
+
+def test_init_app_dirs_copies_defaults_once(tmp_path, monkeypatch):
+    config_dir = tmp_path / "config"
+    monkeypatch.setattr(config, "CONFIG_DIR", str(config_dir))
+    monkeypatch.setattr(config, "AUTO_DOWNLOAD_LOG_FILE", str(config_dir / "auto_download_log.json"))
+    monkeypatch.setattr(config, "_app_dirs_ready", False)
+
+    assert config.init_app_dirs() == str(config_dir)
+    assert (config_dir / "settings.json").exists()
+    assert (config_dir / "channels.json").exists()
+    assert (config_dir / "auto_download_log.json").exists()
+
+    # Later calls do nothing, even if a file went missing in between
+    (config_dir / "channels.json").unlink()
+    config.init_app_dirs()
+    assert not (config_dir / "channels.json").exists()
+
+def test_settings_store_batches_deferred_saves(tmp_path, monkeypatch):
+    settings_path = tmp_path / "settings.json"
+    settings_path.write_text(json.dumps({"main_window_geometry": None}))
+    monkeypatch.setattr(config, "SETTINGS_FILE", str(settings_path))
+    store = config.SettingsStore(write_delay=60)
+
+    settings = store.get()
+    with patch.object(config.os, "replace", wraps=os.replace) as replace:
+        for x in range(3):
+            settings["main_window_geometry"] = f"500x400+{x}+0"
+            store.save(settings, defer=True)
+        # Reads see the change before it reaches the file
+        assert store.get()["main_window_geometry"] == "500x400+2+0"
+        assert json.loads(settings_path.read_text())["main_window_geometry"] is None
+
+        store.flush()
+    assert replace.call_count == 1
+    assert json.loads(settings_path.read_text())["main_window_geometry"] == "500x400+2+0"
+    assert not (tmp_path / "settings.json.tmp").exists()
+
+def test_settings_store_reloads_edited_file_and_notifies(tmp_path, monkeypatch):
+    settings_path = tmp_path / "settings.json"
+    settings_path.write_text(json.dumps({"max_parallel_channels": 2}))
+    monkeypatch.setattr(config, "SETTINGS_FILE", str(settings_path))
+    store = config.SettingsStore()
+    changes = []
+    store.subscribe(changes.append)
+
+    assert store.get()["max_parallel_channels"] == 2
+    assert changes == []
+
+    settings_path.write_text(json.dumps({"max_parallel_channels": 4, "edited": True}))
+    os.utime(settings_path, ns=(0, 0))
+    assert store.get()["max_parallel_channels"] == 4
+    assert changes == [{"max_parallel_channels": 4, "edited": True}]
+
+    store.save({"max_parallel_channels": 1})
+    assert changes[-1] == {"max_parallel_channels": 1}
+    assert json.loads(settings_path.read_text()) == {"max_parallel_channels": 1}
+
+def test_update_settings_changes_only_the_given_keys(tmp_path, monkeypatch):
+    settings_path = tmp_path / "settings.json"
+    settings_path.write_text(json.dumps({"default_quality": "720p", "last_sabbath_checked": "2025-07-12"}))
+    monkeypatch.setattr(config, "SETTINGS_FILE", str(settings_path))
+    monkeypatch.setattr(config, "_settings_store", config.SettingsStore())
+
+    assert config.update_settings(last_sabbath_checked="2025-07-19")
+    assert json.loads(settings_path.read_text()) == {"default_quality": "720p", "last_sabbath_checked": "2025-07-19"}
+
+    with patch.object(config.os, "replace") as replace:
+        assert not config.update_settings(last_sabbath_checked="2025-07-19")
+    replace.assert_not_called()
@@ -0,0 +1,95 @@
+import pytest
+import yt_dlp
+from unittest.mock import patch
+
+from app.backend.disk_space import DiskSpaceGuard, estimate_size, required_space
+from app.backend.downloader import QUALITY_FORMATS, _downloaded_filename
+
+MB = 1024 ** 2
+GB = 1024 ** 3
+SETTINGS = {"keep_old_videos": True, "min_free_space_mb": 0}
+
+
+def _format(format_id, height, size, video=True):
+    return {
+        "format_id": format_id, "url": f"https://example.invalid/{format_id}", "protocol": "https",
+        "ext": "mp4" if video else "m4a", "vcodec": "avc1" if video else "none",
+        "acodec": "none" if video else "mp4a", "height": height if video else None, "filesize": size,
+    }
+
+
+def _info():
+    return {
+        "id": "abc", "title": "Colecta", "extractor": "generic", "extractor_key": "Generic",
+        "webpage_url": "https://example.invalid/watch",
+        "formats": [_format("audio", None, 100 * MB, video=False), _format("v480", 480, 200 * MB), _format("v1080", 1080, 3 * GB)],
+    }
+
+
+def _run(free_bytes, settings=SETTINGS, quality="1080p", result=None):
+    """Run yt-dlp's format selection on _info() with the guard active; returns (guard, processed infos)."""
+    processed = []
+
+    def process_info(info, *args, **kwargs):
+        # Like the real process_info, which records where the file was written
+        info["filepath"] = f"/videos/colecta/{info['format_id']}.{info['ext']}"
+        processed.append(info)
+
+    with yt_dlp.YoutubeDL({"format": QUALITY_FORMATS[quality], "quiet": True}) as ydl:
+        ydl.process_info = process_info
+        with patch("app.backend.disk_space.free_space", return_value=free_bytes), \
+             DiskSpaceGuard(ydl, "/videos/colecta", quality, settings, QUALITY_FORMATS) as guard:
+            info = ydl.process_ie_result(_info(), download=True)
+    if result is not None:
+        result.append(info)
+    return guard, processed
+
+
+def test_estimate_uses_filesize_or_approx():
+    info = {"requested_formats": [{"filesize": 10}, {"filesize_approx": 5}]}
+    assert estimate_size(info) == 15
+    assert estimate_size({"format_id": "18"}) is None
+    # Merging needs room for the streams and the merged file
+    assert required_space(info, min_free_mb=1) == 30 + MB
+
+
+def test_download_that_fits_is_unchanged():
+    guard, processed = _run(free_bytes=10 * GB)
+    assert guard.quality == "1080p"
+    assert [f["format_id"] for f in processed[0]["requested_formats"]] == ["v1080", "audio"]
+
+
+def test_falls_back_down_the_ladder():
+    with patch("app.backend.disk_space.apply_retention", return_value={"freed_bytes": 0}) as retention:
+        guard, processed = _run(free_bytes=2 * GB)
+    retention.assert_called_once()
+    assert guard.quality == "720p"
+    assert [f["format_id"] for f in processed[0]["requested_formats"]] == ["v480", "audio"]
+
+
+def test_fallback_keeps_the_written_filename():
+    result = []
+    with patch("app.backend.disk_space.apply_retention", return_value={"freed_bytes": 0}):
+        _run(free_bytes=2 * GB, result=result)
+    assert _downloaded_filename(result[0]) == "v480+audio.mp4"
+
+
+def test_nothing_fits_fails_before_download():
+    with patch("app.backend.disk_space.apply_retention", return_value={"freed_bytes": 0}):
+        with pytest.raises(yt_dlp.utils.DownloadError, match="Not enough disk space"):
+            _run(free_bytes=100 * MB)
+
+
+def test_ladder_setting_limits_fallback():
+    settings = dict(SETTINGS, quality_fallback_ladder=["1080p"])
+    with patch("app.backend.disk_space.apply_retention", return_value={"freed_bytes": 0}):
+        with pytest.raises(yt_dlp.utils.DownloadError):
+            _run(free_bytes=2 * GB, settings=settings)
+
+
+def test_retention_that_frees_enough_keeps_quality():
+    with patch("app.backend.disk_space.apply_retention", return_value={"freed_bytes": 5 * GB}), \
+         patch("app.backend.disk_space.free_space", side_effect=[2 * GB, 8 * GB]):
+        guard = DiskSpaceGuard(None, "/videos/colecta", "1080p", SETTINGS, QUALITY_FORMATS)
+        info = {"requested_formats": [{"filesize": 3 * GB}, {"filesize": 100 * MB}]}
+        assert guard.admit(info) is info
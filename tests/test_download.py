@@ -4,7 +4,7 @@ from app.backend.downloader import download_video
 
 @pytest.fixture
 def mock_yt_dlp():
-    with patch("app.backend.downloader.yt_dlp.YoutubeDL") as mock_yt_dlp_class:
+    with patch("yt_dlp.YoutubeDL") as mock_yt_dlp_class:
         mock_yt_dlp_instance = MagicMock()
         mock_yt_dlp_class.return_value = mock_yt_dlp_instance
         yield mock_yt_dlp_instance
@@ -15,5 +15,5 @@ def test_download_video(mock_yt_dlp):
 
     download_video(video_url, video_folder)
 
-    # Check if yt-dlp download method was called
-    mock_yt_dlp.__enter__.return_value.download.assert_called_once()
+    # Check that yt-dlp downloaded the video through extract_info
+    mock_yt_dlp.__enter__.return_value.extract_info.assert_called_once_with(video_url, download=True)
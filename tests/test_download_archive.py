@@ -0,0 +1,151 @@
+import os
+import pytest
+from unittest.mock import patch, MagicMock
+
+from app.backend.download_archive import (
+    video_id_from_url, find_archived, record_download, record_pending, pending_downloads,
+    archived_durations, archived_video_ids, record_pending_stem
+)
+from app.backend.downloader import (
+    download_video, find_resumable_downloads, MAX_RESUME_ATTEMPTS, _recording_output_stem
+)
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://www.youtube.com/watch?v=abc123&t=10", "abc123"),
+    ("https://youtu.be/abc123?si=x", "abc123"),
+    ("https://www.youtube.com/shorts/abc123", "abc123"),
+    ("https://www.youtube.com/@Channel", None),
+])
+def test_video_id_from_url(url, expected):
+    assert video_id_from_url(url) == expected
+
+
+def test_record_and_find(tmp_path):
+    (tmp_path / "Weekly 15.07.2024.mp4").write_text("video")
+    record_download(str(tmp_path), "abc", "Weekly 15.07.2024.mp4")
+    assert find_archived(str(tmp_path), "abc") == "Weekly 15.07.2024.mp4"
+    assert find_archived(str(tmp_path), "other") is None
+
+
+def test_archived_durations(tmp_path):
+    (tmp_path / "a.mp4").write_text("video")
+    (tmp_path / "b.mp4").write_text("video")
+    record_download(str(tmp_path), "abc", "a.mp4", duration=3600)
+    record_download(str(tmp_path), "def", "b.mp4")
+    assert archived_durations(str(tmp_path)) == {"a.mp4": 3600}
+
+
+def test_renamed_file_is_still_found(tmp_path):
+    (tmp_path / "Weekly.mp4").write_text("video content")
+    record_download(str(tmp_path), "abc", "Weekly.mp4")
+    (tmp_path / "Weekly.mp4").rename(tmp_path / "Renamed by user.mp4")
+
+    assert find_archived(str(tmp_path), "abc") == "Renamed by user.mp4"
+    # The entry now points at the new name
+    assert find_archived(str(tmp_path), "abc") == "Renamed by user.mp4"
+
+
+def test_archived_video_ids_follow_renamed_files(tmp_path):
+    (tmp_path / "a.mp4").write_text("video a")
+    (tmp_path / "b.mp4").write_text("video bb")
+    record_download(str(tmp_path), "abc", "a.mp4")
+    record_download(str(tmp_path), "def", "b.mp4")
+    (tmp_path / "a.mp4").rename(tmp_path / "Renamed by user.mp4")
+    (tmp_path / "extra.mp4").write_text("not archived")
+
+    assert archived_video_ids(str(tmp_path)) == {"Renamed by user.mp4": "abc", "b.mp4": "def"}
+    assert find_archived(str(tmp_path), "abc") == "Renamed by user.mp4"
+
+
+def test_deleted_file_drops_entry(tmp_path):
+    (tmp_path / "Weekly.mp4").write_text("video content")
+    record_download(str(tmp_path), "abc", "Weekly.mp4")
+    (tmp_path / "Weekly.mp4").unlink()
+    assert find_archived(str(tmp_path), "abc") is None
+
+
+def test_download_video_records_and_skips_duplicates(tmp_path):
+    video_url = "https://www.youtube.com/watch?v=abc"
+    with patch("yt_dlp.YoutubeDL") as mock_ydl_class:
+        ydl = mock_ydl_class.return_value.__enter__.return_value
+
+        def fake_download(url, download):
+            (tmp_path / "Weekly.mp4").write_text("video")
+            return {"id": "abc", "requested_downloads": [{"filepath": str(tmp_path / "Weekly.mp4")}]}
+        ydl.extract_info.side_effect = fake_download
+
+        assert download_video(video_url, str(tmp_path)) is None
+        assert download_video(video_url, str(tmp_path)) is None
+
+    assert ydl.extract_info.call_count == 1
+
+
+def test_interrupted_download_is_resumable(tmp_path):
+    video_url = "https://www.youtube.com/watch?v=abc"
+    with patch("yt_dlp.YoutubeDL") as mock_ydl_class:
+        ydl = mock_ydl_class.return_value.__enter__.return_value
+
+        def interrupted(url, download):
+            (tmp_path / "Weekly.f137.mp4.part").write_text("half")
+            raise Exception("Connection reset")
+        ydl.extract_info.side_effect = interrupted
+
+        assert download_video(video_url, str(tmp_path), "4k") == "Connection reset"
+
+    opts = mock_ydl_class.call_args.args[0]
+    assert opts["continuedl"] is True
+    assert opts["concurrent_fragment_downloads"] >= 1
+    resumable = find_resumable_downloads()
+    assert [(r["video_id"], r["url"], r["quality"]) for r in resumable] == [("abc", video_url, "4k")]
+
+
+def test_pending_without_partial_files_is_dropped(tmp_path):
+    record_pending(str(tmp_path), "abc", "https://www.youtube.com/watch?v=abc", "1080p")
+    assert find_resumable_downloads() == []
+    assert pending_downloads() == []
+
+
+def test_resume_only_counts_the_videos_own_partial_files(tmp_path):
+    (tmp_path / "Other video.f137.mp4.part").write_text("half")
+    record_pending(str(tmp_path), "abc", "https://www.youtube.com/watch?v=abc", "1080p")
+    record_pending_stem(str(tmp_path), "abc", "Weekly 15.07.2024")
+    assert find_resumable_downloads() == []
+
+    record_pending(str(tmp_path), "abc", "https://www.youtube.com/watch?v=abc", "1080p")
+    record_pending_stem(str(tmp_path), "abc", "Weekly 15.07.2024")
+    (tmp_path / "Weekly 15.07.2024.f137.mp4.part").write_text("half")
+    assert [r["video_id"] for r in find_resumable_downloads()] == ["abc"]
+
+
+def test_output_stem_is_recorded_before_the_transfer(tmp_path):
+    import yt_dlp
+    record_pending(str(tmp_path), "abc", "https://www.youtube.com/watch?v=abc", "1080p")
+    ydl = yt_dlp.YoutubeDL({"outtmpl": os.path.join(str(tmp_path), "%(title)s.%(ext)s")})
+    ydl.process_info = lambda info: "transferred"
+    with _recording_output_stem(ydl, str(tmp_path), "abc"):
+        assert ydl.process_info({"id": "abc", "title": "Weekly 15.07.2024", "ext": "mp4"}) == "transferred"
+    assert pending_downloads()[0]["stem"] == "Weekly 15.07.2024"
+    assert ydl.process_info({}) == "transferred"
+
+
+def test_cancelled_download_is_not_resumed(tmp_path):
+    video_url = "https://www.youtube.com/watch?v=abc"
+    task = MagicMock(cancel_requested=True, priority=0)
+    with patch("yt_dlp.YoutubeDL") as mock_ydl_class, patch("app.backend.downloader.current_task", return_value=task):
+        ydl = mock_ydl_class.return_value.__enter__.return_value
+
+        def cancelled(url, download):
+            (tmp_path / "Weekly.f137.mp4.part").write_text("half")
+            raise Exception("Download cancelled")
+        ydl.extract_info.side_effect = cancelled
+
+        assert download_video(video_url, str(tmp_path), "1080p") == "Download cancelled"
+    assert pending_downloads() == []
+
+
+def test_resume_gives_up_after_max_attempts(tmp_path):
+    (tmp_path / "Weekly.mp4.part").write_text("half")
+    for _ in range(MAX_RESUME_ATTEMPTS):
+        record_pending(str(tmp_path), "abc", "https://www.youtube.com/watch?v=abc", "1080p")
+    assert find_resumable_downloads() == []
@@ -0,0 +1,48 @@
+from app.backend.download_jobs import DownloadJobRegistry
+
+
+def test_jobs_are_tracked_per_key():
+    jobs = DownloadJobRegistry()
+    jobs.update("colecta", {"status": "downloading", "downloaded_bytes": 10, "total_bytes": 100, "speed": 5, "eta": 18})
+    jobs.update("other", {"status": "downloading", "downloaded_bytes": 50, "total_bytes_estimate": 200})
+
+    colecta = jobs.get("colecta")
+    assert (colecta.percent, colecta.speed, colecta.eta) == (10.0, 5, 18)
+    assert jobs.get("other").total_bytes == 200
+    assert [job.key for job in jobs.active_jobs()] == ["colecta", "other"]
+    assert jobs.totals() == (60, 300, 5)
+
+
+def test_finished_and_error_end_a_job():
+    jobs = DownloadJobRegistry()
+    jobs.update("a", {"status": "downloading", "downloaded_bytes": 10})
+    finished = jobs.update("a", {"status": "finished"})
+    assert finished.status == "finished"
+    assert finished.total_bytes == finished.downloaded_bytes == 10
+
+    # An error after the download finished, or for one that never started, changes nothing
+    assert jobs.update("a", {"status": "error"}) is None
+    assert jobs.update("b", {"status": "error"}) is None
+    assert jobs.active_jobs() == []
+
+    jobs.remove("a")
+    assert jobs.get("a") is None
+
+
+def test_new_download_restarts_a_finished_job():
+    jobs = DownloadJobRegistry()
+    jobs.update("a", {"status": "downloading", "downloaded_bytes": 100, "total_bytes": 100})
+    jobs.update("a", {"status": "finished"})
+    jobs.update("a", {"status": "downloading", "downloaded_bytes": 5, "total_bytes": 50})
+
+    # remove() only drops jobs that are done, so the next week's progress survives
+    jobs.remove("a")
+    assert jobs.get("a").percent == 10.0
+
+
+def test_returned_jobs_are_snapshots():
+    jobs = DownloadJobRegistry()
+    jobs.update("a", {"status": "downloading", "downloaded_bytes": 1})
+    snapshot = jobs.get("a")
+    jobs.update("a", {"status": "downloading", "downloaded_bytes": 2})
+    assert snapshot.downloaded_bytes == 1
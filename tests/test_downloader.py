@@ -1,6 +1,7 @@
 import pytest
 import os
 import json
+import time
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
 from app.backend.downloader import (
@@ -9,14 +10,20 @@ from app.backend.downloader import (
     get_next_saturday,
     format_romanian_date,
     find_video_url,
-    delete_old_videos,
+    find_video_urls,
     download_video,
-    get_recent_sabbaths
+    get_recent_sabbaths,
+    DateMatcher,
+    get_date_matcher
 )
+from scripts.benchmark_date_matching import legacy_classify, make_titles
+from app.backend.retention import apply_retention
+from app.backend.scheduler import PRIORITY_BACKGROUND, PRIORITY_MANUAL
+from app.backend import protected_videos
 
 # Fixture for mocking settings.json
 @pytest.fixture
-def mock_settings_file(tmp_path):
+def mock_settings_file(tmp_path, monkeypatch):
     settings_dir = tmp_path / "config"
     settings_dir.mkdir()
     settings_path = settings_dir / "settings.json"
@@ -28,32 +35,30 @@ def mock_settings_file(tmp_path):
     with open(settings_path, "w", encoding="utf-8") as f:
         json.dump(initial_settings, f)
 
-    with patch('app.backend.downloader.SETTINGS_FILE', str(settings_path)):
-        yield settings_path
+    # Protected videos are migrated out of settings.json on first use
+    monkeypatch.setattr("app.backend.config.SETTINGS_FILE", str(settings_path))
+    os.remove(protected_videos.PROTECTED_VIDEOS_FILE)
+    yield settings_path
 
 # Test for load_protected_videos
 def test_load_protected_videos(mock_settings_file):
     protected = load_protected_videos()
     assert protected == {"channel1": ["video_a.mp4"]}
+    with open(mock_settings_file, "r", encoding="utf-8") as f:
+        assert "protected_videos" not in json.load(f)
 
 # Test for add_protected_video
 def test_add_protected_video_new_video(mock_settings_file):
     add_protected_video("channel1", "video_b.mp4")
-    with open(mock_settings_file, "r", encoding="utf-8") as f:
-        settings = json.load(f)
-    assert "video_b.mp4" in settings["protected_videos"]["channel1"]
+    assert "video_b.mp4" in load_protected_videos()["channel1"]
 
 def test_add_protected_video_existing_video(mock_settings_file):
     add_protected_video("channel1", "video_a.mp4") # Add existing video
-    with open(mock_settings_file, "r", encoding="utf-8") as f:
-        settings = json.load(f)
-    assert settings["protected_videos"]["channel1"].count("video_a.mp4") == 1
+    assert load_protected_videos()["channel1"].count("video_a.mp4") == 1
 
 def test_add_protected_video_new_channel(mock_settings_file):
     add_protected_video("channel2", "video_c.mp4")
-    with open(mock_settings_file, "r", encoding="utf-8") as f:
-        settings = json.load(f)
-    assert "video_c.mp4" in settings["protected_videos"]["channel2"]
+    assert "video_c.mp4" in load_protected_videos()["channel2"]
 
 # Test for get_next_saturday
 @pytest.mark.parametrize("today_weekday, expected_days_ahead", [
@@ -87,7 +92,7 @@ def test_format_romanian_date(date_obj, expected_format):
 
 # Test for find_video_url
 def test_find_video_url_found(monkeypatch):
-    with patch('app.backend.downloader.yt_dlp.YoutubeDL') as MockYoutubeDL:
+    with patch('yt_dlp.YoutubeDL') as MockYoutubeDL:
         MockYoutubeDL.return_value.__enter__.return_value.extract_info.return_value = {
             "entries": [
                 {"id": "video1", "title": "Video Title 15.07.2024"},
@@ -100,7 +105,7 @@ def test_find_video_url_found(monkeypatch):
         assert match_info["type"] == "exact"
 
 def test_find_video_url_not_found(monkeypatch):
-    with patch('app.backend.downloader.yt_dlp.YoutubeDL') as MockYoutubeDL:
+    with patch('yt_dlp.YoutubeDL') as MockYoutubeDL:
         MockYoutubeDL.return_value.__enter__.return_value.extract_info.return_value = {
             "entries": [
                 {"id": "video1", "title": "Video Title 10.07.2024"},
@@ -110,7 +115,7 @@ def test_find_video_url_not_found(monkeypatch):
         assert url is None
 
 def test_find_video_url_diaspora_excluded(monkeypatch):
-    with patch('app.backend.downloader.yt_dlp.YoutubeDL') as MockYoutubeDL:
+    with patch('yt_dlp.YoutubeDL') as MockYoutubeDL:
         MockYoutubeDL.return_value.__enter__.return_value.extract_info.return_value = {
             "entries": [
                 {"id": "video1", "title": "Video Title 15.07.2024 diaspora"},
@@ -120,7 +125,7 @@ def test_find_video_url_diaspora_excluded(monkeypatch):
         assert url is None
 
 def test_find_video_url_extraction_error(monkeypatch):
-    with patch('app.backend.downloader.yt_dlp.YoutubeDL') as MockYoutubeDL:
+    with patch('yt_dlp.YoutubeDL') as MockYoutubeDL:
         MockYoutubeDL.return_value.__enter__.return_value.extract_info.side_effect = Exception("Extraction failed")
         url, _ = find_video_url("http://example.com/channel", "15.07.2024")
         assert url is None
@@ -129,53 +134,86 @@ def test_find_video_url_invalid_date_format(monkeypatch):
     url, _ = find_video_url("http://example.com/channel", "invalid-date")
     assert url is None
 
-# Test for delete_old_videos
-def test_delete_old_videos_no_keep_old(monkeypatch, tmp_path):
+def test_find_video_urls_scans_listing_once():
+    with patch('yt_dlp.YoutubeDL') as MockYoutubeDL:
+        ydl = MockYoutubeDL.return_value.__enter__.return_value
+        ydl.extract_info.return_value = {
+            "entries": [
+                {"id": "video1", "title": "Serviciu 15.07.2024"},
+                {"id": "video2", "title": "Serviciu 8 iulie 2024"},
+                {"id": "video3", "title": "Serviciu 30 06 2024"},
+            ]
+        }
+        results = find_video_urls("http://example.com/channel", ["15.07.2024", "08.07.2024", "01.07.2024", "30.06.2024", "bad"])
+
+    assert ydl.extract_info.call_count == 1
+    assert results["15.07.2024"] == ("https://www.youtube.com/watch?v=video1", {"type": "exact", "title": "Serviciu 15.07.2024"})
+    assert results["08.07.2024"][0] == "https://www.youtube.com/watch?v=video2"
+    assert results["30.06.2024"][1]["type"] == "fuzzy"
+    assert results["01.07.2024"][1]["reason"].startswith("date is off by 1 day")
+    assert results["bad"] == (None, None)
+
+def test_date_matcher_classifies_exact_and_fuzzy():
+    matcher = DateMatcher(datetime(2024, 7, 15).date())
+    assert matcher.classify("Serviciu 15 iulie 2024") == {"type": "exact", "offset": 0}
+    assert matcher.classify("Serviciu 15 07 2024") == {
+        "type": "fuzzy", "offset": 0, "reason": "delimiter mismatch in date format"}
+    assert matcher.classify("Serviciu 14.07.2024")["offset"] == -1
+    assert matcher.classify("Serviciu 15.07.2024 Diaspora") is None
+    assert matcher.classify("Concert") is None
+
+@pytest.mark.parametrize("date_format", ["%d.%m.%Y", "%d.%m", "%Y"])
+def test_date_matcher_matches_legacy_loop(date_format):
+    from app.backend.downloader import _build_date_variants
+    expected = datetime(2024, 7, 13).date()
+    exact_parts = {expected.strftime(date_format).lower(), format_romanian_date(expected).lower()}
+    variants = _build_date_variants(expected)
+    matcher = DateMatcher(expected, date_format)
+    titles = make_titles(2000) + ["13.07.2024", "x 1 3.07.2024", "113 07 2024", "12,7,2024 / 13.7.2024"]
+    for title in titles:
+        assert matcher.classify(title) == legacy_classify(title, exact_parts, variants), title
+
+def test_get_date_matcher_is_cached():
+    day = datetime(2024, 7, 13).date()
+    assert get_date_matcher(day, "%d.%m.%Y") is get_date_matcher(day, "%d.%m.%Y")
+
+# Tests for removing old videos after a download
+def _make_newest(path):
+    # scan_media orders by the later of mtime and ctime; a future mtime makes this file the newest
+    stamp = time.time() + 60
+    os.utime(path, (stamp, stamp))
+
+def test_apply_retention_no_keep_old(tmp_path):
     video_folder = tmp_path / "test_channel"
     video_folder.mkdir()
     (video_folder / "old_video.mp4").write_text("content")
     (video_folder / "protected_video.mp4").write_text("content")
     (video_folder / "other_file.txt").write_text("content")
+    (video_folder / "new_video.mp4").write_text("content")
+    _make_newest(video_folder / "new_video.mp4")
 
-    monkeypatch.setattr('app.backend.downloader.os.listdir', lambda x: ["old_video.mp4", "protected_video.mp4", "other_file.txt"])
-    monkeypatch.setattr('app.backend.downloader.os.path.basename', lambda x: "test_channel")
-    mock_os_remove = MagicMock()
-    monkeypatch.setattr('app.backend.downloader.os.remove', mock_os_remove)
-    monkeypatch.setattr('app.backend.downloader.load_protected_videos', lambda: {"test_channel": ["protected_video.mp4"]})
+    add_protected_video("test_channel", "protected_video.mp4")
 
-    delete_old_videos(str(video_folder), keep_old=False)
-    # delete_old_videos deletes ALL .mp4 files when keep_old=False (ignores protected)
-    assert mock_os_remove.call_count == 2
-    called_with_files = [args[0] for args, kwargs in mock_os_remove.call_args_list]
-    assert str(video_folder / "old_video.mp4") in called_with_files
-    assert str(video_folder / "protected_video.mp4") in called_with_files
+    apply_retention(str(video_folder), {"keep_old_videos": False})
+    # Only the newest video, protected ones and non-media files are kept
+    assert sorted(os.listdir(video_folder)) == ["new_video.mp4", "other_file.txt", "protected_video.mp4"]
 
-def test_delete_old_videos_keep_old(monkeypatch, tmp_path):
+def test_apply_retention_keep_old(tmp_path):
     video_folder = tmp_path / "test_channel"
     video_folder.mkdir()
     (video_folder / "old_video.mp4").write_text("content")
+    (video_folder / "new_video.mp4").write_text("content")
+    _make_newest(video_folder / "new_video.mp4")
 
-    monkeypatch.setattr('app.backend.downloader.os.listdir', lambda x: ["old_video.mp4"])
-    monkeypatch.setattr('app.backend.downloader.os.path.basename', lambda x: "test_channel")
-    mock_os_remove = MagicMock()
-    monkeypatch.setattr('app.backend.downloader.os.remove', mock_os_remove)
-    monkeypatch.setattr('app.backend.downloader.load_protected_videos', lambda: {})
+    apply_retention(str(video_folder), {"keep_old_videos": True})
+    assert sorted(os.listdir(video_folder)) == ["new_video.mp4", "old_video.mp4"]
 
-    delete_old_videos(str(video_folder), keep_old=True)
-    mock_os_remove.assert_not_called()
-
-def test_delete_old_videos_no_videos(monkeypatch, tmp_path):
+def test_apply_retention_no_videos(tmp_path):
     video_folder = tmp_path / "test_channel"
     video_folder.mkdir()
 
-    monkeypatch.setattr('app.backend.downloader.os.listdir', lambda x: [])
-    monkeypatch.setattr('app.backend.downloader.os.path.basename', lambda x: "test_channel")
-    mock_os_remove = MagicMock()
-    monkeypatch.setattr('app.backend.downloader.os.remove', mock_os_remove)
-    monkeypatch.setattr('app.backend.downloader.load_protected_videos', lambda: {})
-
-    delete_old_videos(str(video_folder), keep_old=False)
-    mock_os_remove.assert_not_called()
+    report = apply_retention(str(video_folder), {"keep_old_videos": False})
+    assert report["remove"] == []
 
 # Test for download_video
 @pytest.fixture
@@ -192,7 +230,7 @@ def mock_download_dependencies(monkeypatch):
     monkeypatch.setattr('app.backend.downloader.os.listdir', mock_os_listdir)
     monkeypatch.setattr('app.backend.downloader.os.makedirs', mock_os_makedirs)
     monkeypatch.setattr('app.backend.downloader.add_protected_video', mock_add_protected_video)
-    monkeypatch.setattr('app.backend.downloader.yt_dlp.YoutubeDL', mock_ydl)
+    monkeypatch.setattr('yt_dlp.YoutubeDL', mock_ydl)
     monkeypatch.setattr('app.backend.downloader.load_settings', lambda: ({"ffmpeg_path": "/usr/bin/ffmpeg"}, []))
 
     return {
@@ -209,10 +247,11 @@ def test_download_video_invalid_folder(mock_download_dependencies):
     mock_download_dependencies["mock_os_makedirs"].assert_not_called()
     mock_download_dependencies["mock_ydl"].assert_not_called()
 
-def test_download_video_already_exists(mock_download_dependencies):
-    mock_download_dependencies["mock_os_path_exists"].return_value = True
-    mock_download_dependencies["mock_os_listdir"].return_value = ["some_video_id.mp4"]
+def test_download_video_already_exists(mock_download_dependencies, monkeypatch):
+    mock_find_archived = MagicMock(return_value="Some Video.mp4")
+    monkeypatch.setattr('app.backend.downloader.find_archived', mock_find_archived)
     download_video("http://example.com/video?v=some_video_id", "/tmp/videos")
+    mock_find_archived.assert_called_once_with("/tmp/videos", "some_video_id")
     mock_download_dependencies["mock_os_makedirs"].assert_not_called()
     mock_download_dependencies["mock_ydl"].assert_not_called()
 
@@ -222,7 +261,7 @@ def test_download_video_1080p(mock_download_dependencies):
     args, kwargs = mock_download_dependencies["mock_ydl"].call_args
     assert args[0]['format'] == 'bestvideo[height<=1080]+bestaudio/best[height<=1080]'
     assert args[0]['merge_output_format'] == 'mp4'
-    mock_download_dependencies["mock_ydl_instance"].download.assert_called_once_with(["http://example.com/video"])
+    mock_download_dependencies["mock_ydl_instance"].extract_info.assert_called_once_with("http://example.com/video", download=True)
 
 def test_download_video_mp3(mock_download_dependencies):
     download_video("http://example.com/video", "/tmp/videos", quality_pref="mp3")
@@ -231,7 +270,7 @@ def test_download_video_mp3(mock_download_dependencies):
     assert args[0]['format'] == 'bestaudio/best'
     assert args[0]['merge_output_format'] == 'mp3'
     assert args[0]['postprocessors'][0]['key'] == 'FFmpegExtractAudio'
-    mock_download_dependencies["mock_ydl_instance"].download.assert_called_once_with(["http://example.com/video"])
+    mock_download_dependencies["mock_ydl_instance"].extract_info.assert_called_once_with("http://example.com/video", download=True)
 
 def test_download_video_protect(mock_download_dependencies):
     mock_download_dependencies["mock_os_listdir"].return_value = ["video_to_protect.mp4"]
@@ -240,15 +279,34 @@ def test_download_video_protect(mock_download_dependencies):
         'ext': 'mp4'
     }
     download_video("http://example.com/video?v=video_to_protect", "/tmp/videos", protect=True)
-    mock_download_dependencies["mock_add_protected_video"].assert_called_once_with("videos", "video_to_protect.mp4")
+    mock_download_dependencies["mock_add_protected_video"].assert_called_once_with("videos", "video_to_protect.mp4", "video_to_protect")
 
 def test_download_video_download_failure(mock_download_dependencies):
-    mock_download_dependencies["mock_ydl_instance"].download.side_effect = Exception("Download error")
-    download_video("http://example.com/video", "/tmp/videos")
-    mock_download_dependencies["mock_ydl_instance"].download.assert_called_once()
+    mock_download_dependencies["mock_ydl_instance"].extract_info.side_effect = Exception("Download error")
+    error = download_video("http://example.com/video", "/tmp/videos")
+    mock_download_dependencies["mock_ydl_instance"].extract_info.assert_called_once()
+    assert error == "Download error"
     # Assert that logging.error was called, but mocking logging is more complex.
     # For now, just ensure no other unexpected calls or crashes.
 
+@pytest.mark.parametrize("priority, throttled", [(PRIORITY_BACKGROUND, True), (PRIORITY_MANUAL, False)])
+def test_download_video_caps_only_background_work(mock_download_dependencies, priority, throttled):
+    manager = MagicMock()
+    ydl = mock_download_dependencies["mock_ydl_instance"]
+    ydl.params = {}
+    seen = {}
+    ydl.extract_info.side_effect = lambda url, download: seen.update(ydl.params)
+
+    with patch("app.backend.downloader.get_bandwidth_manager", return_value=manager):
+        with patch("app.backend.downloader.current_task", return_value=MagicMock(priority=priority, cancel_requested=False)):
+            download_video("http://example.com/video", "/tmp/videos")
+
+    assert manager.transfer.called is throttled
+    # The cap is enforced by the shared bucket alone, not by a fixed yt-dlp ratelimit
+    assert seen == {}
+    assert ydl.params == {}
+
+
 # Test for get_recent_sabbaths
 @pytest.mark.parametrize("n, expected_sabbaths", [
     (1, ["13.07.2024"]), # Assuming today is 15.07.2024 (Monday)
@@ -267,7 +325,7 @@ def test_get_recent_sabbaths(monkeypatch, n, expected_sabbaths):
 
 
 def test_find_video_url_fuzzy_one_day_off(monkeypatch):
-    with patch('app.backend.downloader.yt_dlp.YoutubeDL') as MockYoutubeDL:
+    with patch('yt_dlp.YoutubeDL') as MockYoutubeDL:
         MockYoutubeDL.return_value.__enter__.return_value.extract_info.return_value = {
             "entries": [
                 {"id": "video1", "title": "Video Title 14.07.2024"},  # One day before 15.07.2024
@@ -279,7 +337,7 @@ def test_find_video_url_fuzzy_one_day_off(monkeypatch):
         assert "1 day" in match_info["reason"]
 
 def test_find_video_url_fuzzy_delimiter_mismatch(monkeypatch):
-    with patch('app.backend.downloader.yt_dlp.YoutubeDL') as MockYoutubeDL:
+    with patch('yt_dlp.YoutubeDL') as MockYoutubeDL:
         MockYoutubeDL.return_value.__enter__.return_value.extract_info.return_value = {
             "entries": [
                 {"id": "video1", "title": "Video Title 15 07.2024"},  # Space instead of dot
@@ -1,7 +1,9 @@
 import os
+import time
 import pytest
 from unittest.mock import patch, MagicMock
-from app.backend.downloader import download_video, delete_old_videos, find_video_url
+from app.backend.downloader import download_video, find_video_url
+from app.backend.retention import apply_retention
 from datetime import datetime
 
 @pytest.fixture
@@ -11,16 +13,16 @@ def mock_load_protected_videos(monkeypatch):
     monkeypatch.setattr("app.backend.downloader.load_protected_videos", mock_func)
 
 # Edge cases for download_video
-@patch("app.backend.downloader.yt_dlp.YoutubeDL")
+@patch("yt_dlp.YoutubeDL")
 def test_download_video_invalid_url(mock_yt_dlp, caplog):
     mock_ydl_instance = MagicMock()
     mock_yt_dlp.return_value.__enter__.return_value = mock_ydl_instance
-    mock_ydl_instance.download.side_effect = Exception("Invalid URL")
+    mock_ydl_instance.extract_info.side_effect = Exception("Invalid URL")
 
     download_video("invalid_url", "data/videos")
     assert any("An unexpected error occurred during download" in record.message for record in caplog.records)
 
-@patch("app.backend.downloader.yt_dlp.YoutubeDL")
+@patch("yt_dlp.YoutubeDL")
 def test_download_video_empty_folder(mock_yt_dlp, caplog):
     mock_ydl_instance = MagicMock()
     mock_yt_dlp.return_value.__enter__.return_value = mock_ydl_instance
@@ -29,25 +31,27 @@ def test_download_video_empty_folder(mock_yt_dlp, caplog):
 
     assert any("Video folder path is empty or invalid." in record.message for record in caplog.records)
 
-# Edge cases for delete_old_videos
-def test_delete_old_videos_empty_folder(tmp_path, mock_load_protected_videos):
-    delete_old_videos(str(tmp_path), keep_old=False)
+# Edge cases for apply_retention
+def test_apply_retention_empty_folder(tmp_path, mock_load_protected_videos):
+    apply_retention(str(tmp_path), {"keep_old_videos": False})
     # No error should occur
 
-def test_delete_old_videos_non_mp4_files(tmp_path, mock_load_protected_videos):
+def test_apply_retention_non_media_files(tmp_path, mock_load_protected_videos):
     file_path = tmp_path / "file.txt"
     file_path.write_text("Not a video")
-    delete_old_videos(str(tmp_path), keep_old=False)
+    (tmp_path / "video.mp4").write_text("Video content")
+    apply_retention(str(tmp_path), {"keep_old_videos": False})
     assert file_path.exists()
 
-def test_delete_old_videos_keep_old(tmp_path, mock_load_protected_videos):
+def test_apply_retention_keep_old(tmp_path, mock_load_protected_videos):
     file_path = tmp_path / "video.mp4"
     file_path.write_text("Video content")
-    delete_old_videos(str(tmp_path), keep_old=True)
+    (tmp_path / "newer.mp4").write_text("Video content")
+    apply_retention(str(tmp_path), {"keep_old_videos": True})
     assert file_path.exists()
 
 # Edge cases for find_video_url
-@patch("app.backend.downloader.yt_dlp.YoutubeDL")
+@patch("yt_dlp.YoutubeDL")
 def test_find_video_url_no_videos(mock_yt_dlp):
     mock_ydl_instance = MagicMock()
     mock_yt_dlp.return_value.__enter__.return_value = mock_ydl_instance
@@ -56,7 +60,7 @@ def test_find_video_url_no_videos(mock_yt_dlp):
     url, _ = find_video_url("https://www.youtube.com/c/SomeChannel", "12.04.2025")
     assert url is None
 
-@patch("app.backend.downloader.yt_dlp.YoutubeDL")
+@patch("yt_dlp.YoutubeDL")
 def test_find_video_url_multiple_videos_same_date(mock_yt_dlp):
     mock_ydl_instance = MagicMock()
     mock_yt_dlp.return_value.__enter__.return_value = mock_ydl_instance
@@ -70,7 +74,7 @@ def test_find_video_url_multiple_videos_same_date(mock_yt_dlp):
     url, _ = find_video_url("https://www.youtube.com/c/SomeChannel", "12.04.2025")
     assert url == "https://www.youtube.com/watch?v=id1"
 
-@patch("app.backend.downloader.yt_dlp.YoutubeDL")
+@patch("yt_dlp.YoutubeDL")
 def test_find_video_url_invalid_channel(mock_yt_dlp):
     mock_ydl_instance = MagicMock()
     mock_yt_dlp.return_value.__enter__.return_value = mock_ydl_instance
@@ -80,7 +84,7 @@ def test_find_video_url_invalid_channel(mock_yt_dlp):
     assert url is None
 
 # Integration test simulating full workflow
-@patch("app.backend.downloader.yt_dlp.YoutubeDL")
+@patch("yt_dlp.YoutubeDL")
 def test_integration_workflow(mock_yt_dlp, tmp_path, mock_load_protected_videos):
     mock_ydl_instance = MagicMock()
     mock_yt_dlp.return_value.__enter__.return_value = mock_ydl_instance
@@ -96,12 +100,17 @@ def test_integration_workflow(mock_yt_dlp, tmp_path, mock_load_protected_videos)
 
     # Step 2: Download video
     download_video(video_url, str(tmp_path))
-    mock_ydl_instance.download.assert_called_once()
+    mock_ydl_instance.extract_info.assert_called_with(video_url, download=True)
 
-    # Create a dummy old video file to test deletion
+    # Create a dummy old video file and the downloaded one to test deletion
     old_video = tmp_path / "old_video.mp4"
     old_video.write_text("old video content")
+    new_video = tmp_path / "Weekly Video 12.04.2025.mp4"
+    new_video.write_text("new video content")
+    stamp = time.time() + 60
+    os.utime(new_video, (stamp, stamp))
 
     # Step 3: Delete old videos
-    delete_old_videos(str(tmp_path), keep_old=False)
+    apply_retention(str(tmp_path), {"keep_old_videos": False})
     assert not old_video.exists()
+    assert new_video.exists()
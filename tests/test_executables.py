@@ -0,0 +1,84 @@
+import os
+import json
+import pytest
+from unittest.mock import patch
+
+from app.backend import executables
+from app.backend.executables import resolve_executable, get_executable_info
+
+
+def _make_executable(path):
+    path.write_text("#!/bin/sh\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(executables, "_resolved", {})
+
+
+@pytest.fixture
+def bundled(tmp_path):
+    paths = {"ffmpeg": _make_executable(tmp_path / "bundled_ffmpeg"), "mpv": str(tmp_path / "missing_mpv")}
+    with patch("app.backend.executables.get_bundled_executable_paths", return_value=paths):
+        yield paths
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses POSIX executable bits")
+def test_configured_path_wins_over_bundled(tmp_path, bundled):
+    configured = _make_executable(tmp_path / "my_ffmpeg")
+    assert resolve_executable("ffmpeg", configured) == (configured, "settings")
+    assert resolve_executable("ffmpeg", str(tmp_path / "gone")) == (bundled["ffmpeg"], "bundled")
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses POSIX executable bits")
+def test_falls_back_to_path(tmp_path, bundled):
+    on_path = _make_executable(tmp_path / "mpv")
+    with patch("app.backend.executables.shutil.which", return_value=on_path) as which:
+        assert resolve_executable("mpv") == (on_path, "path")
+        assert resolve_executable("mpv") == (on_path, "path")
+    which.assert_called_once()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses POSIX executable bits")
+def test_cached_until_file_changes(tmp_path, bundled):
+    with patch("app.backend.executables._is_executable", wraps=executables._is_executable) as probe:
+        resolve_executable("ffmpeg")
+        resolve_executable("ffmpeg")
+        assert probe.call_count == 2  # settings (empty) + bundled, once
+
+        os.utime(bundled["ffmpeg"], ns=(0, 0))
+        resolve_executable("ffmpeg")
+        assert probe.call_count == 4
+
+
+def test_not_found_returns_empty(bundled):
+    with patch("app.backend.executables.shutil.which", return_value=None):
+        assert resolve_executable("mpv") == ("", None)
+        assert get_executable_info("mpv") is None
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses POSIX executable bits")
+def test_ffmpeg_info_is_probed_once_and_stored(bundled):
+    outputs = {
+        "-version": "ffmpeg version 7.0.2-static https://johnvansickle.com/ffmpeg/\nbuilt with gcc 8\n",
+        "-hwaccels": "Hardware acceleration methods:\nvdpau\nvaapi\n\n",
+        "-encoders": "Encoders:\n V..... = Video\n ------\n V....D libx264              libx264 H.264\n A....D aac                  AAC\n",
+    }
+    with patch("app.backend.executables._run", side_effect=lambda args: outputs[args[-1]]) as run:
+        info = get_executable_info("ffmpeg")
+        assert get_executable_info("ffmpeg") == info
+    assert run.call_count == 3
+    assert info["version"].startswith("ffmpeg version 7.0.2")
+    assert info["hwaccels"] == ["vdpau", "vaapi"]
+    assert info["encoders"] == ["libx264", "aac"]
+    assert info["source"] == "bundled"
+
+    with open(executables.EXECUTABLE_INFO_FILE, encoding="utf-8") as f:
+        assert json.load(f)[bundled["ffmpeg"]]["info"]["encoders"] == ["libx264", "aac"]
+
+
+def test_parse_mpv_hwdec():
+    output = "Valid values (with alternative full names):\n  vaapi\n  nvdec (nvdec-copy)\n  auto\n"
+    assert executables._parse_mpv_hwdec(output) == ["vaapi", "nvdec", "auto"]
@@ -0,0 +1,139 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from app.backend.folder_watcher import SETTLE_DELAY, FolderWatcher, diff_snapshots, is_partial, iter_folder, scan_folder, _load_inotify
+
+
+def test_is_partial():
+    assert is_partial("video.mp4.part")
+    assert is_partial("video.f137.mp4.part-Frag12")
+    assert is_partial("video.mp4.ytdl")
+    assert is_partial("video.temp.mp4")
+    assert not is_partial("video.mp4")
+
+
+def test_scan_folder_lists_finished_files(tmp_path):
+    tmp_path = tmp_path / "channel"
+    tmp_path.mkdir()
+    (tmp_path / "video.mp4").write_bytes(b"abc")
+    (tmp_path / "next.mp4.part").write_bytes(b"x")
+    (tmp_path / "subdir").mkdir()
+    files = scan_folder(str(tmp_path))
+    assert list(files) == ["video.mp4"]
+    assert files["video.mp4"]["size"] == 3
+
+
+def test_scan_folder_missing(tmp_path):
+    assert scan_folder(str(tmp_path / "missing")) == {}
+
+
+def test_diff_snapshots():
+    old = {"a": {"name": "a", "size": 1, "mtime": 1}, "b": {"name": "b", "size": 1, "mtime": 1}}
+    new = {"a": {"name": "a", "size": 2, "mtime": 2}, "c": {"name": "c", "size": 1, "mtime": 1}}
+    added, removed, changed = diff_snapshots(old, new)
+    assert set(added) == {"c"}
+    assert removed == {"b"}
+    assert set(changed) == {"a"}
+
+
+def _wait_for(watcher_folder, use_inotify, action):
+    changes = []
+    event = threading.Event()
+
+    def on_change(added, removed, changed):
+        changes.append((added, removed, changed))
+        event.set()
+
+    watcher = FolderWatcher(watcher_folder, on_change, poll_interval=0.05, use_inotify=use_inotify)
+    watcher.start()
+    try:
+        time.sleep(0.1)
+        action()
+        assert event.wait(5)
+    finally:
+        watcher.stop()
+    return changes
+
+
+def test_watcher_polling_reports_new_file(tmp_path):
+    (tmp_path / "old.mp4").write_bytes(b"a")
+    changes = _wait_for(str(tmp_path), False, lambda: os.rename(tmp_path / "old.mp4", tmp_path / "new.mp4"))
+    added, removed, _ = changes[0]
+    assert set(added) == {"new.mp4"}
+    assert removed == {"old.mp4"}
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux") or _load_inotify() is None, reason="needs inotify")
+def test_watcher_inotify_reports_new_file(tmp_path):
+    changes = _wait_for(str(tmp_path), True, lambda: (tmp_path / "video.mp4").write_bytes(b"abc"))
+    added, removed, _ = changes[0]
+    assert set(added) == {"video.mp4"}
+    assert not removed
+
+
+def test_watcher_ignores_partial_files(tmp_path):
+    changes = []
+    watcher = FolderWatcher(str(tmp_path), lambda *c: changes.append(c))
+    (tmp_path / "video.mp4.part").write_bytes(b"a")
+    watcher.rescan()
+    assert changes == []
+
+
+def test_iter_folder_yields_chunks(tmp_path):
+    for i in range(5):
+        (tmp_path / f"v{i}.mp4").write_bytes(b"a")
+    chunks = list(iter_folder(str(tmp_path), chunk_size=2))
+    assert [len(chunk) for chunk in chunks[:2]] == [2, 2]
+    names = {entry["name"] for chunk in chunks for entry in chunk}
+    assert {f"v{i}.mp4" for i in range(5)} <= names
+
+
+def test_update_looks_only_at_named_files(tmp_path):
+    (tmp_path / "kept.mp4").write_bytes(b"a")
+    (tmp_path / "gone.mp4").write_bytes(b"a")
+    changes = []
+    watcher = FolderWatcher(str(tmp_path), lambda *c: changes.append(c))
+    os.remove(tmp_path / "gone.mp4")
+    (tmp_path / "new.mp4").write_bytes(b"abc")
+    (tmp_path / "kept.mp4").write_bytes(b"longer")
+
+    watcher.update({"gone.mp4", "new.mp4"})
+    added, removed, changed = changes[0]
+    assert set(added) == {"new.mp4"}
+    assert removed == {"gone.mp4"}
+    assert changed == {}  # kept.mp4 was not named
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux") or _load_inotify() is None, reason="needs inotify")
+def test_watcher_inotify_ignores_partial_churn_without_rescanning(tmp_path, monkeypatch):
+    changes = []
+    event = threading.Event()
+
+    def on_change(*c):
+        changes.append(c)
+        event.set()
+
+    watcher = FolderWatcher(str(tmp_path), on_change, snapshot={})
+
+    def no_rescan(folder):
+        raise AssertionError("folder listed again")
+    monkeypatch.setattr("app.backend.folder_watcher.scan_folder", no_rescan)
+    watcher.start()
+    try:
+        time.sleep(0.1)
+        for i in range(20):
+            (tmp_path / "video.f137.mp4.part").write_bytes(b"x" * i)
+        (tmp_path / "video.f137.mp4.part-Frag1").write_bytes(b"x")
+        time.sleep(SETTLE_DELAY + 0.6)
+        assert changes == []
+
+        (tmp_path / "video.mp4").write_bytes(b"abc")
+        assert event.wait(5)
+    finally:
+        watcher.stop()
+    added, removed, _ = changes[0]
+    assert set(added) == {"video.mp4"}
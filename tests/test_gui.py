@@ -1,9 +1,12 @@
 import pytest
 import os
 import sys
-from unittest.mock import patch, MagicMock, call
+from unittest.mock import patch, MagicMock, call, ANY
 import tkinter as tk
 from app.frontend.gui import YoutubeWeeklyGUI
+from app.frontend.progress_dispatcher import ProgressDispatcher
+from app.backend.download_jobs import DownloadJobRegistry
+from app.backend.scheduler import PRIORITY_BACKGROUND
 
 
 @pytest.fixture
@@ -29,10 +32,13 @@ def gui(monkeypatch):
         g.status_label = MagicMock()
         g.progress_bar = MagicMock()
         g.tray_icon = MagicMock()
-        g.downloading_channels = set()
+        g.scheduler = MagicMock()
+        g.scheduler.is_active.return_value = False
         g.open_file_viewers = {}
-        g.download_stage = 0
-        g.last_progress_value = 0
+        g.jobs = DownloadJobRegistry()
+        g.channel_buttons = {}
+        g.progress_visible = False
+        g.progress_dispatcher = ProgressDispatcher(g, g._render_progress)
 
         g.channel_quality_vars = {"Test Channel": MagicMock()}
         g.channel_quality_vars["Test Channel"].get.return_value = "1080p"
@@ -86,14 +92,14 @@ def test_set_status(gui, text, expected_color):
 
 def test_send_notification_disabled(gui):
     gui.settings["enable_notifications"] = False
-    with patch('app.frontend.gui.notification.notify') as mock_notify:
+    with patch('plyer.notification.notify') as mock_notify:
         gui._send_notification("Title", "Message")
         mock_notify.assert_not_called()
 
 
 def test_send_notification_error(gui):
     gui.settings["enable_notifications"] = True
-    with patch('app.frontend.gui.notification.notify', side_effect=Exception("fail")):
+    with patch('plyer.notification.notify', side_effect=Exception("fail")):
         with patch('builtins.print') as mock_print:
             gui._send_notification("Title", "Message")
             mock_print.assert_called_once_with("Error sending notification: fail")
@@ -103,20 +109,51 @@ def test_send_notification_error(gui):
 
 def test_download_for_channel(gui):
     channel = {"name": "Test Channel", "url": "http://example.com", "folder": "test_channel"}
-    with patch('app.frontend.gui.threading.Thread') as mock_thread:
-        gui.download_for_channel(channel)
-        mock_thread.assert_called_once()
-        assert mock_thread.call_args.kwargs['target'] == gui._worker_download
-        assert mock_thread.call_args.kwargs['args'] == (channel,)
-        mock_thread.return_value.start.assert_called_once()
+    gui.download_for_channel(channel)
+    gui.scheduler.resolve.assert_called_once_with(gui._worker_download, channel, key="test_channel", label="Test Channel")
 
 
 def test_download_for_channel_already_downloading(gui):
-    gui.downloading_channels.add("Test Channel")
+    gui.scheduler.is_active.return_value = True
     gui._set_status = MagicMock()
     channel = {"name": "Test Channel", "url": "http://example.com", "folder": "test_channel"}
     gui.download_for_channel(channel)
     gui._set_status.assert_called_once_with("A download for Test Channel is already in progress.")
+    gui.scheduler.is_active.assert_called_once_with("test_channel")
+    gui.scheduler.resolve.assert_not_called()
+
+
+def test_cancel_channel_download(gui):
+    gui._set_status = MagicMock()
+    gui.scheduler.cancel.return_value = True
+    gui.cancel_channel_download({"name": "Test Channel", "folder": "test_channel"})
+    gui.scheduler.cancel.assert_called_once_with("test_channel")
+    gui._set_status.assert_called_once_with("Cancelling download for Test Channel...")
+
+
+def test_cancelled_download_shows_no_error(gui, tmp_path):
+    gui._set_status = MagicMock()
+    gui._send_notification = MagicMock()
+    channel = {"name": "Test Channel", "url": "http://example.com", "folder": "test_channel"}
+    task = MagicMock(cancel_requested=True)
+
+    with patch('app.frontend.gui.download_video', return_value="Download cancelled"):
+        with patch('app.frontend.gui.current_task', return_value=task):
+            with patch('app.frontend.gui.messagebox.showerror') as mock_error:
+                gui._worker_download_video(channel, "http://youtube.com/watch?v=found", str(tmp_path), "720p", False)
+    mock_error.assert_not_called()
+    gui._set_status.assert_called_with("Download cancelled for Test Channel.")
+
+
+def test_poll_scheduler_marks_queued_channels(gui):
+    button = MagicMock()
+    button.cget.return_value = "Download Colecta"
+    gui.channel_buttons = {"colecta": (button, "Download Colecta")}
+    gui.scheduler.status.return_value = [{"key": "colecta", "state": "queued"}]
+
+    gui._poll_scheduler()
+    button.configure.assert_called_once_with(text="Colecta · queued")
+    gui.after.assert_called_once_with(1000, gui._poll_scheduler)
 
 
 # --- Download others tests ---
@@ -130,15 +167,10 @@ def test_download_others_no_link(gui):
 
 def test_download_others_with_link(gui):
     gui._set_status = MagicMock()
-    with patch('app.frontend.gui.threading.Thread') as mock_thread:
-        gui.download_others()
-        gui._set_status.assert_called_with("Starting download...")
-        mock_thread.assert_called_once_with(
-            target=gui._worker_download_others,
-            args=(gui.others_link_var.get(),),
-            daemon=True
-        )
-        mock_thread.return_value.start.assert_called_once()
+    gui.download_others()
+    gui._set_status.assert_called_with("Starting download...")
+    link = gui.others_link_var.get()
+    gui.scheduler.download.assert_called_once_with(gui._worker_download_others, link, key=link, label=link)
 
 
 # --- Play tests ---
@@ -270,6 +302,206 @@ def test_worker_download_channel_already_exists(gui, tmp_path):
                 gui._set_status.assert_any_call("Video for Test Channel already exists: video_15.07.2024.mp4")
 
 
+def test_worker_download_channel_hands_off_to_download_stage(gui, tmp_path):
+    gui.base_path = str(tmp_path)
+    gui._set_status = MagicMock()
+    channel = {"name": "Test Channel", "url": "http://example.com", "folder": "test_channel", "date_format": "%d.%m.%Y"}
+
+    session = MagicMock()
+    with patch('app.frontend.gui.get_next_saturday', return_value="15.07.2024"):
+        with patch('app.frontend.gui.find_video_url', return_value=("http://youtube.com/watch?v=found", {"type": "exact", "title": "Found Video"})) as mock_find:
+            with patch('app.frontend.gui.open_download_session', return_value=session):
+                with patch('app.frontend.gui.tk.StringVar', MagicMock):
+                    gui._worker_download(channel)
+
+    # The lookup's yt-dlp session is handed to the download stage still open
+    assert mock_find.call_args.kwargs["session"] is session
+    gui.scheduler.download.assert_called_once_with(
+        gui._worker_download_video, channel, "http://youtube.com/watch?v=found",
+        str(tmp_path / "test_channel"), "1080p", True, session,
+        key="test_channel", label="Test Channel", on_cancel=ANY
+    )
+    session.close.assert_not_called()
+
+    # Cancelled while queued: the worker never runs, so on_cancel releases the session
+    gui.progress_hook = MagicMock()
+    gui.scheduler.download.call_args.kwargs["on_cancel"]()
+    session.close.assert_called_once()
+    gui.progress_hook.assert_called_once_with({"status": "error", "channel": "test_channel"})
+    gui._set_status.assert_called_with("Download cancelled for Test Channel.")
+
+
+def test_worker_download_video_closes_session(gui, tmp_path):
+    gui._set_status = MagicMock()
+    gui._send_notification = MagicMock()
+    channel = {"name": "Test Channel", "url": "http://example.com", "folder": "test_channel"}
+
+    session = MagicMock()
+    with patch('app.frontend.gui.download_video', return_value=None) as mock_download:
+        with patch('app.frontend.gui.apply_retention') as mock_delete:
+            gui._worker_download_video(channel, "http://youtube.com/watch?v=found", str(tmp_path), "720p", False, session)
+            mock_delete.assert_not_called()
+    assert mock_download.call_args.kwargs["session"] is session
+    session.close.assert_called_once()
+
+
+def test_worker_download_video_applies_retention_after_success(gui, tmp_path):
+    gui._set_status = MagicMock()
+    gui._send_notification = MagicMock()
+    channel = {"name": "Test Channel", "url": "http://example.com", "folder": "test_channel"}
+
+    with patch('app.frontend.gui.download_video', return_value=None), \
+         patch('app.frontend.gui.apply_retention') as mock_retention:
+        gui._worker_download_video(channel, "http://youtube.com/watch?v=found", str(tmp_path), "720p", True)
+    mock_retention.assert_called_once_with(str(tmp_path), gui.settings)
+
+    with patch('app.frontend.gui.download_video', return_value="boom"), \
+         patch('app.frontend.gui.messagebox'), \
+         patch('app.frontend.gui.apply_retention') as mock_retention:
+        gui._worker_download_video(channel, "http://youtube.com/watch?v=found", str(tmp_path), "720p", True)
+    mock_retention.assert_not_called()
+
+
+def test_download_range_for_channel_requires_selected_date(gui):
+    gui._set_status = MagicMock()
+    channel = {"name": "Test Channel", "url": "http://example.com", "folder": "test_channel", "date_format": "%d.%m.%Y"}
+
+    gui.download_range_for_channel(channel)
+    gui.scheduler.resolve.assert_not_called()
+
+
+def test_download_range_for_channel(gui):
+    gui.recent_sabbaths_per_channel["Test Channel"] = ["automat", "22.07.2024", "15.07.2024", "08.07.2024"]
+    gui.channel_date_vars["Test Channel"].get.return_value = "15.07.2024"
+    channel = {"name": "Test Channel", "url": "http://example.com", "folder": "test_channel", "date_format": "%d.%m.%Y"}
+
+    gui.download_range_for_channel(channel)
+    gui.scheduler.resolve.assert_called_once_with(gui._worker_download_range, channel, ["22.07.2024", "15.07.2024"],
+                                                  key="test_channel", label="Test Channel")
+
+
+def test_worker_download_range_skips_existing_and_missing(gui, tmp_path):
+    gui.base_path = str(tmp_path)
+    gui._set_status = MagicMock()
+    gui._send_notification = MagicMock()
+    (tmp_path / "test_channel").mkdir()
+    (tmp_path / "test_channel" / "Serviciu 22.07.2024.mp4").write_text("content")
+    channel = {"name": "Test Channel", "url": "http://example.com", "folder": "test_channel", "date_format": "%d.%m.%Y"}
+    found = {
+        "22.07.2024": ("http://youtube.com/watch?v=new", {"type": "exact", "title": "Serviciu 22.07.2024"}),
+        "15.07.2024": ("http://youtube.com/watch?v=mid", {"type": "exact", "title": "Serviciu 15.07.2024"}),
+        "08.07.2024": (None, None),
+    }
+
+    session = MagicMock()
+    with patch('app.frontend.gui.find_video_urls', return_value=found) as mock_find:
+        with patch('app.frontend.gui.open_download_session', return_value=session):
+            with patch('app.frontend.gui.tk.StringVar', MagicMock):
+                gui._worker_download_range(channel, ["22.07.2024", "15.07.2024", "08.07.2024"])
+
+    assert mock_find.call_count == 1
+    gui.scheduler.download.assert_called_once_with(
+        gui._worker_download_videos, channel, ["http://youtube.com/watch?v=mid"],
+        str(tmp_path / "test_channel"), "1080p", session,
+        key="test_channel", label="Test Channel", on_cancel=ANY
+    )
+    gui._send_notification.assert_called_once()
+
+
+def test_worker_download_videos_downloads_each(gui, tmp_path):
+    gui._set_status = MagicMock()
+    gui._send_notification = MagicMock()
+    channel = {"name": "Test Channel", "url": "http://example.com", "folder": "test_channel"}
+
+    with patch('app.frontend.gui.download_video', return_value=None) as mock_download:
+        gui._worker_download_videos(channel, ["http://a", "http://b"], str(tmp_path), "720p")
+    assert mock_download.call_count == 2
+
+
+def test_resume_partial_downloads_queues_each(gui):
+    items = [{"folder": "/videos/colecta", "video_id": "abc", "url": "http://a", "quality": "4k", "protect": False},
+             {"folder": "/videos/colecta", "video_id": "def", "url": "http://d", "quality": "4k", "protect": False}]
+    with patch('app.backend.downloader.find_resumable_downloads', return_value=items):
+        gui._resume_partial_downloads()
+    # Resumes are background work: anything the user clicks runs first.
+    # Each video has its own key, so two in one folder are not deduplicated
+    assert gui.scheduler.download.call_args_list == [
+        call(gui._worker_resume_download, item, key=("colecta", item["video_id"]),
+             label="colecta", priority=PRIORITY_BACKGROUND)
+        for item in items
+    ]
+
+
+def test_worker_resume_download(gui):
+    gui._set_status = MagicMock()
+    gui._send_notification = MagicMock()
+    item = {"folder": "/videos/colecta", "video_id": "abc", "url": "http://a", "quality": "4k", "protect": False}
+    with patch('app.frontend.gui.download_video', return_value=None) as mock_download:
+        gui._worker_resume_download(item)
+    mock_download.assert_called_once_with("http://a", "/videos/colecta", "4k", protect=False, progress_hook=ANY)
+    gui._set_status.assert_any_call("Resuming interrupted download in colecta...")
+
+    # The resumed download reports into the channel's own job
+    gui.progress_dispatcher.submit = MagicMock()
+    mock_download.call_args.kwargs["progress_hook"]({"status": "downloading", "downloaded_bytes": 1, "total_bytes": 10})
+    assert gui.jobs.get("colecta").downloaded_bytes == 1
+
+
+def test_progress_hook_uses_aggregate_bytes(gui):
+    gui._set_status = MagicMock()
+
+    gui.progress_hook({"status": "downloading", "downloaded_bytes": 250, "total_bytes": 1000, "channel": "colecta"})
+    # Nothing is drawn from the download thread; the dispatcher renders on its next frame
+    gui.progress_bar.configure.assert_not_called()
+    gui.progress_dispatcher.flush()
+    gui.progress_bar.configure.assert_called_with(value=25.0)
+
+    gui.progress_hook({"status": "finished", "downloaded_bytes": 1000, "total_bytes": 1000, "channel": "colecta"})
+    gui.progress_dispatcher.flush()
+    gui._set_status.assert_called_with("Download complete.")
+    gui.progress_bar.configure.assert_any_call(value=100)
+
+
+def test_progress_for_concurrent_downloads_is_combined(gui):
+    gui._set_status = MagicMock()
+
+    for i in range(100):
+        gui.progress_hook({"status": "downloading", "downloaded_bytes": i, "total_bytes": 100, "channel": "colecta"})
+    gui.progress_hook({"status": "downloading", "downloaded_bytes": 50, "total_bytes": 300, "channel": "scoala_de_sabat",
+                       "speed": 2 * 1024 * 1024})
+    gui.progress_dispatcher.flush()
+
+    # Hundreds of events collapse into one render per frame
+    gui._set_status.assert_called_once_with("Downloading 2 videos... 37.2% · 2.0 MB/s")
+
+
+def test_each_channel_shows_its_own_progress(gui):
+    gui._set_status = MagicMock()
+    colecta, sabat = MagicMock(), MagicMock()
+    gui.channel_buttons = {"colecta": (colecta, "Download Colecta"), "scoala_de_sabat": (sabat, "Download Sabat")}
+
+    colecta_hook = gui._progress_hook_for("/videos/colecta")
+    sabat_hook = gui._progress_hook_for("/videos/scoala_de_sabat")
+    colecta_hook({"status": "downloading", "downloaded_bytes": 25, "total_bytes": 100, "eta": 75})
+    sabat_hook({"status": "downloading", "downloaded_bytes": 90, "total_bytes": 100})
+    gui.progress_dispatcher.flush()
+    colecta.configure.assert_called_with(text="Colecta · 25% · 1:15")
+    sabat.configure.assert_called_with(text="Sabat · 90%")
+
+    # One channel finishing leaves the other's job untouched
+    sabat_hook({"status": "finished", "downloaded_bytes": 100, "total_bytes": 100})
+    gui.progress_dispatcher.flush()
+    sabat.configure.assert_called_with(text="Download Sabat")
+    assert gui.jobs.get("colecta").downloaded_bytes == 25
+    gui._set_status.assert_called_with("Downloading... 25.0%")
+
+    # A failed download closes its row without reporting completion
+    gui._end_job("/videos/colecta")
+    gui.progress_dispatcher.flush()
+    colecta.configure.assert_called_with(text="Download Colecta")
+    assert gui.jobs.active_jobs() == []
+
+
 # --- Open folder tests ---
 
 def test_open_channel_folder(gui):
@@ -0,0 +1,25 @@
+import os
+import sys
+import subprocess
+
+from scripts.import_time_report import HEAVY_MODULES
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _modules_loaded_by(module):
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return [m for m in result.stdout.strip().split(",") if m]
+
+
+def test_gui_import_does_not_load_heavy_modules():
+    assert _modules_loaded_by("app.frontend.gui") == []
+
+
+def test_headless_mode_does_not_load_heavy_modules():
+    assert _modules_loaded_by("app.backend.__main__") == []
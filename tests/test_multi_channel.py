@@ -1,8 +1,9 @@
 import pytest
 from unittest.mock import patch, MagicMock
 from app.backend.downloader import find_video_url, download_video
+from app.backend.download_archive import record_download
 
-@patch("app.backend.downloader.yt_dlp.YoutubeDL")
+@patch("yt_dlp.YoutubeDL")
 def test_find_video_url_first_channel_format(mock_yt_dlp):
     mock_ydl_instance = MagicMock()
     mock_yt_dlp.return_value.__enter__.return_value = mock_ydl_instance
@@ -14,7 +15,7 @@ def test_find_video_url_first_channel_format(mock_yt_dlp):
     url, _ = find_video_url("https://www.youtube.com/c/Channel1", "2025-04-12", date_format="%Y-%m-%d")
     assert url == "https://www.youtube.com/watch?v=id1"
 
-@patch("app.backend.downloader.yt_dlp.YoutubeDL")
+@patch("yt_dlp.YoutubeDL")
 def test_find_video_url_second_channel_format(mock_yt_dlp):
     mock_ydl_instance = MagicMock()
     mock_yt_dlp.return_value.__enter__.return_value = mock_ydl_instance
@@ -26,22 +27,23 @@ def test_find_video_url_second_channel_format(mock_yt_dlp):
     url, _ = find_video_url("https://www.youtube.com/@ScoalaDeSabat", "10.05.2025", date_format="%d.%m.%Y")
     assert url == "https://www.youtube.com/watch?v=id2"
 
-@patch("app.backend.downloader.yt_dlp.YoutubeDL")
+@patch("yt_dlp.YoutubeDL")
 def test_download_video_already_exists(mock_yt_dlp, tmp_path):
     mock_ydl_instance = MagicMock()
     mock_yt_dlp.return_value.__enter__.return_value = mock_ydl_instance
 
-    # Create a dummy file that simulates existing video
-    existing_file = tmp_path / "id3.mp4"
+    # Create a dummy file that simulates an archived download
+    existing_file = tmp_path / "Weekly video.mp4"
     existing_file.write_text("dummy content")
+    record_download(str(tmp_path), "id3", "Weekly video.mp4")
 
     video_url = "https://www.youtube.com/watch?v=id3"
     download_video(video_url, str(tmp_path))
 
     # The download method should not be called because video exists
-    mock_ydl_instance.download.assert_not_called()
+    mock_ydl_instance.extract_info.assert_not_called()
 
-@patch("app.backend.downloader.yt_dlp.YoutubeDL")
+@patch("yt_dlp.YoutubeDL")
 def test_find_video_url_no_matching_date(mock_yt_dlp):
     mock_ydl_instance = MagicMock()
     mock_yt_dlp.return_value.__enter__.return_value = mock_ydl_instance
@@ -53,13 +55,13 @@ def test_find_video_url_no_matching_date(mock_yt_dlp):
     url, _ = find_video_url("https://www.youtube.com/c/Channel1", "2025-04-12", date_format="%Y-%m-%d")
     assert url is None
 
-@patch("app.backend.downloader.yt_dlp.YoutubeDL")
+@patch("yt_dlp.YoutubeDL")
 def test_integration_multi_channel_workflow(mock_yt_dlp, tmp_path):
     mock_ydl_instance = MagicMock()
     mock_yt_dlp.return_value.__enter__.return_value = mock_ydl_instance
 
     # Setup extract_info to return videos for both channels
-    def extract_info_side_effect(url, download):
+    def extract_info_side_effect(url, download, **kwargs):
         if "ScoalaDeSabat" in url:
             return {
                 "entries": [
@@ -85,5 +87,6 @@ def test_integration_multi_channel_workflow(mock_yt_dlp, tmp_path):
     download_video(url1, str(tmp_path))
     download_video(url2, str(tmp_path))
 
-    # Check that download was called twice
-    assert mock_ydl_instance.download.call_count == 2
+    # Check that both videos were downloaded
+    downloads = [c for c in mock_ydl_instance.extract_info.call_args_list if c.kwargs.get("download") is True]
+    assert len(downloads) == 2
@@ -1,7 +1,8 @@
 import os
+import time
 import pytest
 from unittest.mock import patch, MagicMock
-from app.backend.downloader import delete_old_videos
+from app.backend.retention import apply_retention
 
 @pytest.fixture
 def mock_load_protected_videos(monkeypatch):
@@ -17,11 +18,14 @@ def create_mock_video_file(tmp_path):
         return file_path
     return _create_mock_video
 
-def test_delete_old_videos(create_mock_video_file, mock_load_protected_videos):
+def test_apply_retention_deletes_old_video(create_mock_video_file, mock_load_protected_videos):
     video_file = create_mock_video_file()
+    new_file = create_mock_video_file("new_video.mp4", "New video content")
+    stamp = time.time() + 60
+    os.utime(new_file, (stamp, stamp))
     video_folder = str(video_file.parent)
-    keep_old_videos = False
 
-    delete_old_videos(video_folder, keep_old_videos)
-    
+    apply_retention(video_folder, {"keep_old_videos": False})
+
     assert not video_file.exists(), "Old video was not deleted"
+    assert new_file.exists(), "Newest video was deleted"
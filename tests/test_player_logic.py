@@ -1,9 +1,14 @@
 import pytest
 import os
 import sys
-from unittest.mock import patch, MagicMock, call
+import queue
+import threading
+from unittest.mock import patch, MagicMock, call, ANY
 from app.frontend.gui import YoutubeWeeklyGUI
 from app.frontend.file_viewer import FileViewer
+from app.backend.folder_watcher import iter_folder
+from app.backend.download_archive import record_download
+from app.backend.protected_videos import protect_video, is_protected, all_protected
 import tkinter as tk
 
 
@@ -23,7 +28,6 @@ def gui(tmp_path):
         }
         g.base_path = g.settings["video_folder"]
         g._set_status = MagicMock()
-        g.downloading_channels = set()
         yield g
 
 
@@ -47,6 +51,22 @@ def file_viewer():
         fv.selected_file_path = None
         fv.on_close_callback = MagicMock()
         fv.file_tree = MagicMock()
+        fv.file_tree.winfo_height.return_value = 400  # 15 rows
+        fv.file_tree.insert.side_effect = lambda parent, index, iid: iid
+        fv.file_tree.selection.return_value = ()
+        fv.scrollbar = MagicMock()
+        fv.rows = {}
+        fv.order = []
+        fv._order_stale = False
+        fv.top = 0
+        fv._slots = []
+        fv._slot_names = {}
+        fv._name_slots = {}
+        fv.durations = {}
+        fv.watcher = None
+        fv._poll_id = None
+        fv._closed = threading.Event()
+        fv.after_cancel = MagicMock()
         fv.geometry = MagicMock(return_value="800x600+100+100")
         fv.destroy = MagicMock()
         yield fv
@@ -151,7 +171,7 @@ def test_file_viewer_load_position_default(file_viewer):
 def test_file_viewer_on_closing(file_viewer):
     with patch('app.frontend.file_viewer.save_settings') as mock_save:
         file_viewer.on_closing()
-        mock_save.assert_called_once_with(file_viewer.settings)
+        mock_save.assert_called_once_with(file_viewer.settings, defer=True)
         file_viewer.on_close_callback.assert_called_once_with(file_viewer.channel_folder)
         file_viewer.destroy.assert_called_once()
 
@@ -175,24 +195,189 @@ def test_file_viewer_populate_files_with_files(file_viewer, tmp_path):
     assert file_viewer.file_tree.insert.call_count == 2
 
 
+def test_file_viewer_populate_files_applies_only_changes(file_viewer, tmp_path):
+    folder = tmp_path / "channel"
+    folder.mkdir()
+    (folder / "old.mp4").write_text("a")
+    (folder / "gone.mp4").write_text("b")
+    (folder / "new.mp4.part").write_text("c")
+    file_viewer.channel_folder = str(folder)
+    file_viewer.populate_files()
+    file_viewer.file_tree.reset_mock()
+
+    os.remove(folder / "gone.mp4")
+    os.rename(folder / "new.mp4.part", folder / "new.mp4")
+    os.utime(folder / "old.mp4", (1000, 1000))
+    os.utime(folder / "new.mp4", (2000, 2000))
+    file_viewer.populate_files()
+
+    # Same number of rows, so the two slots are refilled rather than rebuilt
+    file_viewer.file_tree.insert.assert_not_called()
+    file_viewer.file_tree.delete.assert_not_called()
+    assert file_viewer.order == ["new.mp4", "old.mp4"]
+
+
+def test_file_viewer_shows_archived_duration(file_viewer, tmp_path):
+    folder = tmp_path / "channel"
+    folder.mkdir()
+    (folder / "video.mp4").write_text("a")
+    file_viewer.channel_folder = str(folder)
+    with patch('app.frontend.file_viewer.archived_durations', return_value={"video.mp4": 3725}):
+        file_viewer.populate_files()
+    values = file_viewer.file_tree.item.call_args.kwargs["values"]
+    assert values[0] == "video.mp4"
+    assert values[2] == "1:02:05"
+
+
+def test_file_viewer_on_closing_stops_watcher(file_viewer):
+    file_viewer.watcher = MagicMock()
+    file_viewer._poll_id = "after#1"
+    with patch('app.frontend.file_viewer.save_settings'):
+        file_viewer.on_closing()
+    file_viewer.watcher.stop.assert_called_once()
+    file_viewer.after_cancel.assert_called_once_with("after#1")
+
+
 def test_file_viewer_populate_files_nonexistent(file_viewer):
     file_viewer.channel_folder = "/nonexistent/path"
     file_viewer.populate_files()
     file_viewer.file_tree.insert.assert_not_called()
 
 
+def _fill(file_viewer, count):
+    file_viewer.rows = {f"v{i}.mp4": {"name": f"v{i}.mp4", "size": 1, "mtime": count - i} for i in range(count)}
+    file_viewer.order = list(file_viewer.rows)
+    file_viewer._render()
+
+
 def test_file_viewer_on_file_select(file_viewer):
-    file_viewer.file_tree.focus.return_value = "I001"
-    file_viewer.file_tree.item.return_value = {"values": ["video.mp4", ""]}
-    file_viewer.file_tree.get_children.return_value = ["I001"]
     file_viewer.channel_folder = "/path/to/channel"
+    _fill(file_viewer, 3)
+    file_viewer.file_tree.selection.return_value = ("slot0",)
+    file_viewer.on_file_select(None)
+    assert file_viewer.selected_file_path == os.path.join("/path/to/channel", "v0.mp4")
+    file_viewer.file_tree.set.assert_called_once_with("slot0", "selected", "✓")
+
+    # Only the old and the new row are touched
+    file_viewer.file_tree.set.reset_mock()
+    file_viewer.file_tree.selection.return_value = ("slot2",)
     file_viewer.on_file_select(None)
-    assert file_viewer.selected_file_path == os.path.join("/path/to/channel", "video.mp4")
-    file_viewer.file_tree.set.assert_any_call("I001", "selected", "✓")
+    assert file_viewer.selected_file_path == os.path.join("/path/to/channel", "v2.mp4")
+    assert file_viewer.file_tree.set.call_count == 2
+    file_viewer.file_tree.set.assert_any_call("slot0", "selected", "")
 
 
 def test_file_viewer_on_file_select_none(file_viewer):
-    file_viewer.file_tree.focus.return_value = ""
-    file_viewer.file_tree.get_children.return_value = []
+    file_viewer.file_tree.selection.return_value = ()
     file_viewer.on_file_select(None)
     assert file_viewer.selected_file_path is None
+
+
+def test_file_viewer_renders_only_visible_rows(file_viewer):
+    _fill(file_viewer, 10000)
+    assert file_viewer.file_tree.insert.call_count == 15
+    assert file_viewer._slot_names["slot0"] == "v0.mp4"
+
+    file_viewer._on_scrollbar("moveto", "0.5")
+    assert file_viewer.top == 5000
+    assert file_viewer._slot_names["slot0"] == "v5000.mp4"
+    assert file_viewer.file_tree.insert.call_count == 15
+    file_viewer.scrollbar.set.assert_called_with(0.5, 0.5015)
+
+    file_viewer._on_scrollbar("moveto", "1.0")
+    assert file_viewer.top == 10000 - 15
+
+
+def test_file_viewer_selection_survives_scrolling(file_viewer):
+    file_viewer.channel_folder = "/path/to/channel"
+    _fill(file_viewer, 100)
+    file_viewer.file_tree.selection.return_value = ("slot1",)
+    file_viewer.on_file_select(None)
+
+    file_viewer._on_scrollbar("scroll", "1", "pages")
+    file_viewer.file_tree.selection.return_value = ()
+    file_viewer.on_file_select(None)
+    assert file_viewer.selected_file_path == os.path.join("/path/to/channel", "v1.mp4")
+    file_viewer.file_tree.selection_set.assert_called_with([])
+
+    file_viewer._on_scrollbar("moveto", "0")
+    file_viewer.file_tree.selection_set.assert_called_with(["slot1"])
+    file_viewer.file_tree.item.assert_any_call("slot1", values=("v1.mp4", "0 MB", "", ANY, "✓"))
+
+
+def test_file_viewer_keyboard_scrolls_past_last_visible_row(file_viewer):
+    _fill(file_viewer, 100)
+    file_viewer.selected_file_path = os.path.join(file_viewer.channel_folder, "v14.mp4")
+    file_viewer._render()
+    file_viewer._on_key(MagicMock(keysym="Down"))
+    assert file_viewer.top == 1
+    assert file_viewer._selected_name() == "v15.mp4"
+    file_viewer._on_key(MagicMock(keysym="End"))
+    assert file_viewer._selected_name() == "v99.mp4"
+    assert file_viewer.top == 85
+
+
+def test_file_viewer_streams_listing_in_chunks(file_viewer, tmp_path):
+    folder = tmp_path / "channel"
+    folder.mkdir()
+    for i in range(5):
+        (folder / f"v{i}.mp4").write_text("x")
+    file_viewer.channel_folder = str(folder)
+    file_viewer._changes = queue.Queue()
+    file_viewer.after = MagicMock()
+    with patch('app.frontend.file_viewer.iter_folder', side_effect=lambda f: iter_folder(f, chunk_size=2)), \
+         patch('app.frontend.file_viewer.FolderWatcher') as watcher_cls:
+        file_viewer._load_files_worker()
+    assert file_viewer._changes.qsize() == 3
+    assert len(watcher_cls.call_args.kwargs["snapshot"]) == 5
+    watcher_cls.return_value.start.assert_called_once()
+
+    file_viewer._poll_changes()
+    assert len(file_viewer.order) == 5
+    assert file_viewer.file_tree.insert.call_count == 5
+
+
+def test_file_viewer_delete_all_keeps_protected(file_viewer, tmp_path):
+    folder = tmp_path / "channel"
+    folder.mkdir()
+    (folder / "old.mp4").write_text("x")
+    (folder / "keep.mp4").write_text("x")
+    file_viewer.channel_folder = str(folder)
+    protect_video(str(folder), "keep.mp4")
+
+    with patch('app.frontend.file_viewer.messagebox.askyesno', return_value=True) as ask:
+        file_viewer.delete_all()
+    assert "Protected videos are kept" in ask.call_args.args[1]
+    assert sorted(os.listdir(folder)) == ["keep.mp4"]
+
+
+def test_file_viewer_delete_selected_unprotects(file_viewer, tmp_path):
+    folder = tmp_path / "channel"
+    folder.mkdir()
+    (folder / "keep.mp4").write_text("x")
+    file_viewer.channel_folder = str(folder)
+    file_viewer.selected_file_path = str(folder / "keep.mp4")
+    protect_video(str(folder), "keep.mp4")
+
+    with patch('app.frontend.file_viewer.messagebox.askyesno', return_value=True) as ask:
+        file_viewer.delete_selected()
+    assert "protected" in ask.call_args.args[1]
+    assert not (folder / "keep.mp4").exists()
+    assert not is_protected(str(folder), "keep.mp4")
+
+
+def test_file_viewer_delete_selected_unprotects_renamed_file(file_viewer, tmp_path):
+    folder = tmp_path / "channel"
+    folder.mkdir()
+    (folder / "keep.mp4").write_text("x")
+    record_download(str(folder), "abc", "keep.mp4")
+    protect_video(str(folder), "keep.mp4", "abc")
+    (folder / "keep.mp4").rename(folder / "renamed.mp4")
+    file_viewer.channel_folder = str(folder)
+    file_viewer.selected_file_path = str(folder / "renamed.mp4")
+
+    with patch('app.frontend.file_viewer.messagebox.askyesno', return_value=True) as ask:
+        file_viewer.delete_selected()
+    assert "protected" in ask.call_args.args[1]
+    assert not (folder / "renamed.mp4").exists()
+    assert all_protected() == {}
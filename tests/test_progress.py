@@ -0,0 +1,42 @@
+from app.backend.progress import AggregateProgress
+
+
+def _event(status, format_id, downloaded, total=None, speed=None):
+    return {"status": status, "downloaded_bytes": downloaded, "total_bytes": total,
+            "speed": speed, "info_dict": {"format_id": format_id}}
+
+
+def test_aggregates_bytes_across_streams():
+    events = []
+    progress = AggregateProgress(events.append)
+    progress.expect([{"format_id": "137", "filesize": 900}, {"format_id": "140", "filesize_approx": 100}])
+
+    progress(_event("downloading", "137", 300, 900, speed=10))
+    assert (events[-1]["downloaded_bytes"], events[-1]["total_bytes"]) == (300, 1000)
+
+    progress(_event("downloading", "140", 50, 100, speed=5))
+    assert events[-1]["downloaded_bytes"] == 350
+    assert events[-1]["speed"] == 15
+    assert events[-1]["eta"] == 43
+
+
+def test_finished_only_when_every_stream_is_done():
+    events = []
+    progress = AggregateProgress(events.append)
+    progress.expect([{"format_id": "137"}, {"format_id": "140"}])
+
+    progress(_event("finished", "140", 100, 100))
+    assert events[-1]["status"] == "downloading"
+    progress(_event("finished", "137", 900, 900))
+    assert events[-1]["status"] == "finished"
+    assert events[-1]["downloaded_bytes"] == events[-1]["total_bytes"] == 1000
+
+
+def test_single_stream_without_expect():
+    events = []
+    progress = AggregateProgress(events.append)
+    progress({"status": "downloading", "downloaded_bytes": 10, "total_bytes_estimate": 40, "filename": "a.mp4"})
+    assert events[-1]["total_bytes"] == 40
+    assert "total_bytes_estimate" not in events[-1]
+    progress({"status": "finished", "downloaded_bytes": 40, "total_bytes": 40, "filename": "a.mp4"})
+    assert events[-1]["status"] == "finished"
@@ -0,0 +1,53 @@
+import threading
+from unittest.mock import MagicMock
+
+from app.frontend.progress_dispatcher import ProgressDispatcher
+
+
+def test_downloading_events_are_coalesced_per_key():
+    render = MagicMock()
+    dispatcher = ProgressDispatcher(MagicMock(), render)
+
+    for i in range(1000):
+        dispatcher.submit("a", {"status": "downloading", "downloaded_bytes": i})
+    dispatcher.submit("a", {"status": "finished"})
+    dispatcher.submit("b", {"status": "downloading", "downloaded_bytes": 1})
+    dispatcher.flush()
+
+    render.assert_called_once_with({
+        "a": [{"status": "downloading", "downloaded_bytes": 999}, {"status": "finished"}],
+        "b": [{"status": "downloading", "downloaded_bytes": 1}],
+    })
+    dispatcher.flush()
+    render.assert_called_once()
+
+
+def test_submit_from_many_threads():
+    render = MagicMock()
+    dispatcher = ProgressDispatcher(MagicMock(), render)
+
+    def worker(key):
+        for i in range(500):
+            dispatcher.submit(key, {"status": "downloading", "downloaded_bytes": i})
+    threads = [threading.Thread(target=worker, args=(f"k{n}",)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    dispatcher.flush()
+
+    updates = render.call_args.args[0]
+    assert {k: v[-1]["downloaded_bytes"] for k, v in updates.items()} == {f"k{n}": 499 for n in range(4)}
+
+
+def test_single_after_loop():
+    widget = MagicMock()
+    dispatcher = ProgressDispatcher(widget, MagicMock(), interval_ms=100)
+    dispatcher.start()
+    dispatcher.start()
+    widget.after.assert_called_once_with(100, dispatcher._tick)
+
+    dispatcher._tick()
+    assert widget.after.call_count == 2
+    dispatcher.stop()
+    widget.after_cancel.assert_called_once()
@@ -0,0 +1,49 @@
+import json
+import os
+
+from app.backend import protected_videos
+from app.backend.protected_videos import (
+    is_protected, protected_files, protect_video, unprotect_video, all_protected
+)
+
+
+def test_migrates_lists_from_settings(tmp_path, monkeypatch):
+    settings_path = tmp_path / "settings.json"
+    settings_path.write_text(json.dumps({"keep_old_videos": True, "protected_videos": {"colecta": ["a.mp4", "b.mp4"]}}))
+    monkeypatch.setattr("app.backend.config.SETTINGS_FILE", str(settings_path))
+    os.remove(protected_videos.PROTECTED_VIDEOS_FILE)
+
+    assert protected_files("/videos/colecta") == {"a.mp4", "b.mp4"}
+    assert json.loads(settings_path.read_text()) == {"keep_old_videos": True}
+    assert os.path.exists(protected_videos.PROTECTED_VIDEOS_FILE)
+
+
+def test_lookup_by_filename_or_video_id(tmp_path):
+    folder = str(tmp_path / "colecta")
+    protect_video(folder, "Colecta 13.07.2024.mp4", "abc123")
+
+    assert is_protected(folder, "Colecta 13.07.2024.mp4")
+    # A renamed file is still recognised by its video ID
+    assert is_protected(folder, "renamed.mp4", video_id="abc123")
+    assert not is_protected(folder, "other.mp4", video_id="zzz")
+    assert not is_protected(str(tmp_path / "scoala"), "Colecta 13.07.2024.mp4")
+
+
+def test_unprotect_removes_filename_and_id(tmp_path):
+    folder = str(tmp_path / "colecta")
+    protect_video(folder, "a.mp4", "abc")
+    unprotect_video(folder, "a.mp4")
+
+    assert not is_protected(folder, "a.mp4", video_id="abc")
+    assert all_protected() == {}
+
+
+def test_reloads_when_file_changes_on_disk(tmp_path):
+    folder = str(tmp_path / "colecta")
+    protect_video(folder, "a.mp4")
+
+    with open(protected_videos.PROTECTED_VIDEOS_FILE, "w", encoding="utf-8") as f:
+        json.dump({"colecta": {"b.mp4": {"video_id": None, "protected_at": None}}}, f)
+    os.utime(protected_videos.PROTECTED_VIDEOS_FILE, ns=(0, 0))
+
+    assert protected_files(folder) == {"b.mp4"}
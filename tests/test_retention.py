@@ -0,0 +1,96 @@
+import os
+import time
+
+from app.backend.download_archive import record_download
+from app.backend.protected_videos import protect_video
+from app.backend.retention import (
+    policy_for, scan_media, plan_retention, retention_report, apply_retention, format_report
+)
+
+GB = 1024 ** 3
+WEEK = 7 * 24 * 3600
+NOW = 1_750_000_000
+
+
+def _files(*specs):
+    # (name, size, age in weeks), newest first
+    return [{"name": name, "size": size, "time": NOW - weeks * WEEK} for name, size, weeks in specs]
+
+
+def _make(folder, name, age_seconds=0, size=1):
+    path = folder / name
+    path.write_bytes(b"x" * size)
+    stamp = time.time() - age_seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_policy_falls_back_to_keep_old_videos():
+    assert policy_for({"keep_old_videos": False}, "/videos/colecta") == {"keep_last": 1}
+    assert policy_for({"keep_old_videos": True}, "/videos/colecta") == {}
+
+
+def test_channel_policy_layers_over_default():
+    settings = {"retention_policies": {"default": {"keep_last": 4, "max_age_weeks": 8}, "colecta": {"keep_last": 2}}}
+    assert policy_for(settings, "/videos/colecta") == {"keep_last": 2, "max_age_weeks": 8}
+    assert policy_for(settings, "/videos/other") == {"keep_last": 4, "max_age_weeks": 8}
+
+
+def test_keep_last_skips_protected():
+    files = _files(("new.mp4", 1, 0), ("keep.mp4", 1, 1), ("mid.mp3", 1, 2), ("old.webm", 1, 3))
+    remove = plan_retention(files, {"keep_last": 2}, protected={"keep.mp4"}, now=NOW)
+    assert [(f["name"], reason) for f, reason in remove] == [("old.webm", "more than 2 newer videos")]
+
+
+def test_max_age_and_size_limits():
+    files = _files(("a.mp4", GB, 0), ("b.mp4", GB, 1), ("c.mp4", GB, 2), ("d.mp4", GB, 10))
+    assert [f["name"] for f, _ in plan_retention(files, {"max_age_weeks": 4}, now=NOW)] == ["d.mp4"]
+    assert [f["name"] for f, _ in plan_retention(files, {"max_size_gb": 2.5}, now=NOW)] == ["d.mp4", "c.mp4"]
+
+
+def test_newest_file_is_always_kept():
+    files = _files(("huge.mkv", 5 * GB, 30))
+    assert plan_retention(files, {"max_size_gb": 1, "max_age_weeks": 1, "keep_last": 0}, now=NOW) == []
+
+
+def test_scan_media_lists_media_newest_first(tmp_path):
+    _make(tmp_path, "old.mp4", age_seconds=3600)
+    _make(tmp_path, "new.mp3")
+    _make(tmp_path, "notes.txt")
+    _make(tmp_path, "partial.mp4.part")
+    assert [f["name"] for f in scan_media(str(tmp_path))] == ["new.mp3", "old.mp4"]
+
+
+def test_dry_run_reports_without_deleting(tmp_path):
+    folder = tmp_path / "colecta"
+    folder.mkdir()
+    _make(folder, "old.mp4", age_seconds=7200, size=10)
+    _make(folder, "older.mkv", age_seconds=9000, size=10)
+    _make(folder, "new.mp4", size=10)
+    protect_video(str(folder), "older.mkv")
+
+    report = apply_retention(str(folder), {"keep_old_videos": False}, dry_run=True)
+    assert [item["name"] for item in report["remove"]] == ["old.mp4"]
+    assert report["freed_bytes"] == 10
+    assert sorted(os.listdir(folder)) == ["new.mp4", "old.mp4", "older.mkv"]
+    assert "colecta: remove 1 of 3 files" in format_report([report])
+
+    apply_retention(str(folder), {"keep_old_videos": False})
+    assert sorted(os.listdir(folder)) == ["new.mp4", "older.mkv"]
+
+
+def test_renamed_protected_file_is_kept(tmp_path):
+    folder = tmp_path / "colecta"
+    folder.mkdir()
+    _make(folder, "Colecta.mp4", age_seconds=7200, size=10)
+    _make(folder, "new.mp4", size=20)
+    record_download(str(folder), "abc", "Colecta.mp4")
+    protect_video(str(folder), "Colecta.mp4", "abc")
+    os.rename(folder / "Colecta.mp4", folder / "Renamed by user.mp4")
+
+    assert retention_report(str(folder), {"keep_old_videos": False})["remove"] == []
+
+
+def test_keep_old_videos_keeps_everything(tmp_path):
+    _make(tmp_path, "a.mp4", age_seconds=60)
+    _make(tmp_path, "b.mp4")
+    assert retention_report(str(tmp_path), {"keep_old_videos": True})["remove"] == []
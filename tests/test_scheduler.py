@@ -0,0 +1,139 @@
+import threading
+import pytest
+from app.backend.scheduler import DownloadScheduler, PRIORITY_MANUAL, PRIORITY_BACKGROUND, current_task, get_scheduler
+
+
+def test_resolve_and_download_return_results():
+    scheduler = DownloadScheduler(max_downloads=1, max_lookups=2)
+    assert scheduler.resolve(lambda x: x * 2, 21).result(timeout=5) == 42
+    assert scheduler.download(lambda: "done").result(timeout=5) == "done"
+
+
+def test_lookups_do_not_wait_behind_downloads():
+    scheduler = DownloadScheduler(max_downloads=1, max_lookups=2)
+    release = threading.Event()
+
+    # Occupy the only download slot until the lookup has completed
+    blocked = scheduler.download(release.wait, 5)
+    lookup = scheduler.resolve(lambda: "resolved")
+    assert lookup.result(timeout=5) == "resolved"
+    assert not blocked.done()
+
+    release.set()
+    assert blocked.result(timeout=5) is True
+
+
+def test_download_stage_is_bounded():
+    scheduler = DownloadScheduler(max_downloads=2, max_lookups=1)
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+    release = threading.Event()
+
+    def job():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        release.wait(5)
+        with lock:
+            running[0] -= 1
+
+    futures = [scheduler.download(job) for _ in range(5)]
+    threading.Timer(0.2, release.set).start()
+    for future in futures:
+        future.result(timeout=5)
+    assert peak[0] == 2
+
+
+def test_task_exception_is_propagated():
+    scheduler = DownloadScheduler()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        scheduler.resolve(fail).result(timeout=5)
+
+
+def test_manual_work_runs_before_queued_background_work():
+    scheduler = DownloadScheduler(max_downloads=1)
+    release = threading.Event()
+    order = []
+
+    scheduler.download(release.wait, 5)
+    background = scheduler.download(order.append, "auto", priority=PRIORITY_BACKGROUND)
+    manual = scheduler.download(order.append, "click", priority=PRIORITY_MANUAL)
+    release.set()
+    background.result(timeout=5)
+    manual.result(timeout=5)
+    assert order == ["click", "auto"]
+
+
+def test_same_key_is_not_queued_twice():
+    scheduler = DownloadScheduler(max_downloads=1)
+    release = threading.Event()
+    calls = []
+
+    def job(url):
+        calls.append(url)
+        release.wait(5)
+
+    first = scheduler.download(job, "http://a", key="http://a")
+    assert scheduler.download(job, "http://a", key="http://a") is first
+    assert scheduler.is_active("http://a")
+    release.set()
+    first.result(timeout=5)
+
+    assert calls == ["http://a"]
+    assert not scheduler.is_active("http://a")
+
+
+def test_cancel_drops_queued_and_flags_running_tasks():
+    scheduler = DownloadScheduler(max_downloads=1)
+    started = threading.Event()
+    seen = []
+
+    def running():
+        started.set()
+        while not current_task().cancel_requested:
+            started.wait(0.01)
+        seen.append("stopped")
+
+    first = scheduler.download(running, key="colecta")
+    queued = scheduler.download(lambda: seen.append("ran"), key="other")
+    started.wait(5)
+
+    assert [(t["key"], t["state"]) for t in scheduler.status()] == [("colecta", "running"), ("other", "queued")]
+    assert scheduler.cancel("other")
+    assert queued.cancelled()
+    assert scheduler.cancel("colecta")
+    first.result(timeout=5)
+
+    assert seen == ["stopped"]
+    assert scheduler.status() == []
+    assert not scheduler.cancel("colecta")
+
+
+def test_current_task_is_only_set_inside_the_scheduler():
+    scheduler = DownloadScheduler()
+    task = scheduler.resolve(current_task, key="colecta", label="Colecta").result(timeout=5)
+    assert (task.key, task.label, task.stage) == ("colecta", "Colecta", "resolve")
+    assert current_task() is None
+
+
+def test_get_scheduler_is_shared():
+    assert get_scheduler() is get_scheduler()
+
+
+def test_on_cancel_runs_for_dropped_queued_tasks_only():
+    scheduler = DownloadScheduler(max_downloads=1)
+    release = threading.Event()
+    dropped = []
+
+    first = scheduler.download(release.wait, 5, key="colecta", on_cancel=lambda: dropped.append("colecta"))
+    queued = scheduler.download(lambda: None, key="other", on_cancel=lambda: dropped.append("other"))
+    assert scheduler.cancel("other")
+    assert queued.cancelled()
+    release.set()
+    first.result(timeout=5)
+    assert dropped == ["other"]
@@ -4,8 +4,10 @@ E2E smoke test — validates the full find→download→delete pipeline with moc
 import pytest
 import os
 import json
+import time
 from unittest.mock import patch, MagicMock
-from app.backend.downloader import find_video_url, download_video, delete_old_videos
+from app.backend.downloader import find_video_url, download_video
+from app.backend.retention import apply_retention
 from app.backend.config import load_settings, save_settings, load_channels
 
 
@@ -29,9 +31,13 @@ def test_full_download_pipeline(tmp_path, monkeypatch):
     channel_folder.mkdir(parents=True)
     old_video = channel_folder / "old_video_01.01.2025.mp4"
     old_video.write_text("old content")
+    newer_video = channel_folder / "Weekly Video 08.03.2025.mp4"
+    newer_video.write_text("newer content")
+    stamp = time.time() + 60
+    os.utime(newer_video, (stamp, stamp))
 
     # Mock yt-dlp for find_video_url
-    with patch("app.backend.downloader.yt_dlp.YoutubeDL") as mock_ydl_class:
+    with patch("yt_dlp.YoutubeDL") as mock_ydl_class:
         mock_ydl = MagicMock()
         mock_ydl_class.return_value.__enter__.return_value = mock_ydl
 
@@ -45,17 +51,17 @@ def test_full_download_pipeline(tmp_path, monkeypatch):
         url, _ = find_video_url("https://youtube.com/c/TestChannel", "15.03.2025")
         assert url == "https://www.youtube.com/watch?v=abc123"
 
-        # Step 2: delete_old_videos
-        delete_old_videos(str(channel_folder), keep_old=False)
+        # Step 2: apply_retention
+        apply_retention(str(channel_folder), settings_data)
         assert not old_video.exists(), "Old video should be deleted"
+        assert newer_video.exists(), "Newest video should be kept"
 
         # Step 3: download_video (mock the actual download)
-        mock_ydl.download.return_value = None
         mock_ydl.extract_info.return_value = {"title": "Weekly Video 15.03.2025", "ext": "mp4"}
 
         error = download_video(url, str(channel_folder), quality_pref="1080p")
         assert error is None
-        mock_ydl.download.assert_called_once_with([url])
+        mock_ydl.extract_info.assert_called_with(url, download=True)
 
 
 def test_channel_config_loads():
@@ -87,7 +93,7 @@ def test_settings_roundtrip(tmp_path, monkeypatch):
 
 def test_diaspora_exclusion():
     """Verify videos with 'diaspora' in title are excluded."""
-    with patch("app.backend.downloader.yt_dlp.YoutubeDL") as mock_ydl_class:
+    with patch("yt_dlp.YoutubeDL") as mock_ydl_class:
         mock_ydl = MagicMock()
         mock_ydl_class.return_value.__enter__.return_value = mock_ydl
         mock_ydl.extract_info.return_value = {
@@ -11,7 +11,7 @@ from app.backend.updater import (
 
 # --- check_for_updates tests ---
 
-@patch("app.backend.updater.requests.get")
+@patch("requests.get")
 def test_check_for_updates_new_version(mock_get):
     mock_response = MagicMock()
     mock_response.json.return_value = {
@@ -27,7 +27,7 @@ def test_check_for_updates_new_version(mock_get):
     assert len(assets) == 1
 
 
-@patch("app.backend.updater.requests.get")
+@patch("requests.get")
 def test_check_for_updates_up_to_date(mock_get):
     mock_response = MagicMock()
     mock_response.json.return_value = {
@@ -43,7 +43,7 @@ def test_check_for_updates_up_to_date(mock_get):
     assert assets == []
 
 
-@patch("app.backend.updater.requests.get")
+@patch("requests.get")
 def test_check_for_updates_network_error(mock_get):
     mock_get.side_effect = requests.exceptions.RequestException("Connection failed")
 
@@ -52,7 +52,7 @@ def test_check_for_updates_network_error(mock_get):
     assert assets == []
 
 
-@patch("app.backend.updater.requests.get")
+@patch("requests.get")
 def test_check_for_updates_malformed_response(mock_get):
     mock_response = MagicMock()
     mock_response.json.return_value = {"no_tag": "missing"}
@@ -62,7 +62,7 @@ def test_check_for_updates_malformed_response(mock_get):
     assert is_new is False
 
 
-@patch("app.backend.updater.requests.get")
+@patch("requests.get")
 def test_check_for_updates_version_prefix_stripping(mock_get):
     mock_response = MagicMock()
     mock_response.json.return_value = {
@@ -126,7 +126,7 @@ def test_get_asset_download_url_not_found():
 
 # --- download_update tests ---
 
-@patch("app.backend.updater.requests.get")
+@patch("requests.get")
 def test_download_update_success(mock_get, tmp_path):
     mock_response = MagicMock()
     mock_response.headers = {"content-length": "100"}
@@ -142,7 +142,7 @@ def test_download_update_success(mock_get, tmp_path):
     assert progress_values[-1] == 100
 
 
-@patch("app.backend.updater.requests.get")
+@patch("requests.get")
 def test_download_update_failure(mock_get, tmp_path):
     mock_get.side_effect = requests.exceptions.RequestException("Network error")
 
@@ -2,7 +2,7 @@ from unittest.mock import patch, MagicMock
 from app.backend.downloader import find_video_url
 from datetime import datetime
 
-@patch("app.backend.downloader.yt_dlp.YoutubeDL")
+@patch("yt_dlp.YoutubeDL")
 def test_find_video_url(mock_yt_dlp):
     # Setup mock
     mock_ydl_instance = MagicMock()
@@ -0,0 +1,155 @@
+import threading
+import pytest
+import yt_dlp
+from unittest.mock import patch, MagicMock
+
+from app.backend.downloader import find_video_url, download_video, open_download_session
+from app.backend.ytdlp_session import YtdlpSession, ParallelStreams
+
+
+def test_session_reuses_one_youtubedl_for_lookup_and_download(tmp_path):
+    with patch("yt_dlp.YoutubeDL") as mock_ydl_class:
+        ydl = mock_ydl_class.return_value.__enter__.return_value
+        ydl.params = {"quiet": False}
+        ydl.extract_info.side_effect = [
+            {"entries": [{"id": "abc", "title": "Serviciu 15.07.2024"}]},
+            {"title": "Serviciu 15.07.2024", "requested_downloads": [{"filepath": str(tmp_path / "Serviciu 15.07.2024.mp4")}]},
+        ]
+
+        with patch("app.backend.downloader.add_protected_video") as mock_protect:
+            with open_download_session(str(tmp_path), "720p") as session:
+                url, _ = find_video_url("http://example.com/channel", "15.07.2024", session=session)
+                error = download_video(url, str(tmp_path), "720p", protect=True, session=session)
+
+    assert error is None
+    assert mock_ydl_class.call_count == 1
+    assert mock_ydl_class.call_args.args[0]["format"] == 'bestvideo[height<=720]+bestaudio/best[height<=720]'
+    # Protection uses the info dict from the download instead of a second extraction
+    assert ydl.extract_info.call_count == 2
+    mock_protect.assert_called_once_with(tmp_path.name, "Serviciu 15.07.2024.mp4", "abc")
+    # Lookup-only options are restored once the listing has been read
+    assert ydl.params == {"quiet": False}
+
+
+def test_session_opens_lazily_and_closes_once():
+    with patch("yt_dlp.YoutubeDL") as mock_ydl_class:
+        session = YtdlpSession({"quiet": True})
+        mock_ydl_class.assert_not_called()
+
+        ydl = session.open()
+        assert session.open() is ydl
+        session.close()
+        session.close()
+
+    mock_ydl_class.assert_called_once_with({"quiet": True})
+    mock_ydl_class.return_value.__exit__.assert_called_once()
+
+
+def test_download_session_stops_when_its_task_is_cancelled():
+    with patch("yt_dlp.YoutubeDL") as mock_ydl_class:
+        session = YtdlpSession({"progress_hooks": []})
+        session.open()
+    on_progress = mock_ydl_class.call_args.args[0]["progress_hooks"][-1]
+
+    on_progress({"status": "downloading"})
+    session.task = MagicMock(cancel_requested=False)
+    on_progress({"status": "downloading"})
+    session.task.cancel_requested = True
+    with pytest.raises(yt_dlp.utils.DownloadCancelled):
+        on_progress({"status": "downloading"})
+
+
+class _FakeYoutubeDL:
+    """Mimics the order in which YoutubeDL.process_info fetches and merges formats."""
+
+    def __init__(self):
+        self.order = []
+        self._progress_hooks = []
+
+    def add_progress_hook(self, ph):
+        self._progress_hooks.append(ph)
+
+    def process_info(self, info):
+        for f in info["requested_formats"]:
+            self.dl(f"/videos/Title.f{f['format_id']}.{f['ext']}", dict(f))
+        return self.post_process("/videos/Title.mp4", info)
+
+    def dl(self, name, info, subtitle=False, test=False):
+        self.order.append(("dl", info["format_id"]))
+        return True, True
+
+    def post_process(self, filename, info):
+        self.order.append(("merge", filename))
+        return info
+
+
+def test_parallel_streams_download_concurrently_then_merge():
+    ydl = _FakeYoutubeDL()
+    barrier = threading.Barrier(2, timeout=5)
+    original_dl = ydl.dl
+
+    def blocking_dl(name, info, subtitle=False, test=False):
+        # Both streams must be in flight at once for the barrier to release
+        barrier.wait()
+        return original_dl(name, info)
+    ydl.dl = blocking_dl
+    progress = MagicMock()
+
+    info = {"requested_formats": [{"format_id": "137", "ext": "mp4"}, {"format_id": "140", "ext": "m4a"}]}
+    with ParallelStreams(ydl, progress):
+        ydl.process_info(info)
+
+    progress.expect.assert_called_once_with(info["requested_formats"])
+    assert sorted(ydl.order[:2]) == [("dl", "137"), ("dl", "140")]
+    assert ydl.order[2] == ("merge", "/videos/Title.mp4")
+    # Overrides are removed again; the instance's own dl is back
+    assert ydl.dl is blocking_dl
+    assert "post_process" not in vars(ydl)
+
+
+def test_parallel_streams_failed_stream_aborts_merge():
+    ydl = _FakeYoutubeDL()
+    ydl.dl = MagicMock(side_effect=[(True, True), Exception("HTTP Error 403")])
+
+    info = {"requested_formats": [{"format_id": "137", "ext": "mp4"}, {"format_id": "140", "ext": "m4a"}]}
+    with pytest.raises(yt_dlp.utils.DownloadError, match="HTTP Error 403"):
+        with ParallelStreams(ydl):
+            ydl.process_info(info)
+    assert ("merge", "/videos/Title.mp4") not in ydl.order
+
+
+def test_parallel_streams_reraises_cancellation_as_itself():
+    ydl = _FakeYoutubeDL()
+    ydl.dl = MagicMock(side_effect=[yt_dlp.utils.DownloadCancelled("Download cancelled"), (True, True)])
+
+    info = {"requested_formats": [{"format_id": "137", "ext": "mp4"}, {"format_id": "140", "ext": "m4a"}]}
+    with pytest.raises(yt_dlp.utils.DownloadCancelled):
+        with ParallelStreams(ydl):
+            ydl.process_info(info)
+    assert ydl._progress_hooks == []
+
+
+def test_parallel_streams_first_failure_stops_the_other_stream():
+    ydl = _FakeYoutubeDL()
+    progressed = threading.Event()
+    finished = []
+
+    def dl(name, info, subtitle=False, test=False):
+        if info["format_id"] == "140":
+            progressed.wait(5)
+            raise Exception("HTTP Error 403")
+        # A long transfer that reports progress the way yt-dlp's downloaders do
+        for _ in range(500):
+            for ph in list(ydl._progress_hooks):
+                ph({"status": "downloading"})
+            progressed.set()
+            threading.Event().wait(0.01)
+        finished.append(info["format_id"])
+        return True, True
+    ydl.dl = dl
+
+    info = {"requested_formats": [{"format_id": "137", "ext": "mp4"}, {"format_id": "140", "ext": "m4a"}]}
+    with pytest.raises(yt_dlp.utils.DownloadError, match="HTTP Error 403"):
+        with ParallelStreams(ydl):
+            ydl.process_info(info)
+    assert finished == []